@@ -0,0 +1,148 @@
+"""
+Time-of-day bandwidth limits shared by all download workers.
+
+A schedule is a comma-separated list of entries, each either
+``HH:MM-HH:MM=RATE`` (a daily window, which may wrap past midnight) or a
+bare ``RATE`` applying whenever no window matches.  ``RATE`` is in bytes
+per second with an optional binary ``K``/``M``/``G`` suffix, or
+``unlimited``.  For example ``01:00-06:00=unlimited,1M`` allows full speed
+at night and 1 MiB/s otherwise.  The first matching window wins; times
+are local.
+
+:class:`RateLimiter` paces the combined transfer rate of every worker to
+the limit in force at the moment each chunk arrives.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, time as dt_time
+
+logger = logging.getLogger(__name__)
+
+_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+_RATE_RE = re.compile(r"(\d+(?:\.\d+)?)([KMG]?)(?:I?B)?(?:/S)?")
+_WINDOW_RE = re.compile(r"(\d{1,2}:\d{2})-(\d{1,2}:\d{2})=(.+)")
+
+
+def parse_rate(text: str) -> float | None:
+    """
+    Parse a rate such as ``512K`` or ``1.5M`` into bytes per second.
+
+    ``unlimited`` returns ``None``.  Raises :class:`ValueError` for
+    anything else, including zero.
+    """
+    value = text.strip().upper()
+    if value == "UNLIMITED":
+        return None
+    match = _RATE_RE.fullmatch(value)
+    if not match or float(match.group(1)) <= 0:
+        msg = f"invalid rate {text!r} (expected e.g. 512K, 1M or unlimited)"
+        raise ValueError(msg)
+    return float(match.group(1)) * _UNITS[match.group(2)]
+
+
+def _parse_clock(text: str) -> dt_time:
+    try:
+        hours, minutes = (int(part) for part in text.split(":"))
+        return dt_time(hours, minutes)
+    except ValueError:
+        msg = f"invalid time of day {text!r} (expected HH:MM)"
+        raise ValueError(msg) from None
+
+
+def format_rate(rate: float | None) -> str:
+    """Render a rate for log messages."""
+    return "unlimited" if rate is None else f"{rate / 1024**2:.1f} MiB/s"
+
+
+@dataclass(frozen=True)
+class BandwidthWindow:
+    """A daily ``[start, end)`` interval with its rate limit."""
+
+    start: dt_time
+    end: dt_time
+    rate: float | None
+
+    def contains(self, moment: dt_time) -> bool:
+        """Return whether *moment* falls inside the window."""
+        if self.start <= self.end:
+            return self.start <= moment < self.end
+        return moment >= self.start or moment < self.end
+
+
+@dataclass(frozen=True)
+class BandwidthSchedule:
+    """Rate limits by time of day; ``None`` means unlimited."""
+
+    windows: tuple[BandwidthWindow, ...] = ()
+    default: float | None = None
+
+    @classmethod
+    def parse(cls, spec: str) -> BandwidthSchedule:
+        """Parse a schedule (see the module docstring); raise :class:`ValueError` if invalid."""
+        windows: list[BandwidthWindow] = []
+        default: float | None = None
+        for entry in (part.strip() for part in spec.split(",")):
+            if match := _WINDOW_RE.fullmatch(entry):
+                start, end, rate = match.groups()
+                windows.append(BandwidthWindow(_parse_clock(start), _parse_clock(end), parse_rate(rate)))
+            else:
+                default = parse_rate(entry)
+        return cls(tuple(windows), default)
+
+    def rate_at(self, moment: dt_time) -> float | None:
+        """Return the limit in force at *moment*."""
+        for window in self.windows:
+            if window.contains(moment):
+                return window.rate
+        return self.default
+
+
+class RateLimiter:
+    """
+    Pace the combined throughput of all callers to *schedule*.
+
+    Each :meth:`consume` reserves the transfer time its bytes need at the
+    current rate after every earlier reservation, then sleeps until that
+    reservation ends.  Idle time counts towards the chunk just received
+    but is not banked beyond it, so a slow link is not slowed down further
+    and a fast one never bursts above the limit.
+    """
+
+    def __init__(self, schedule: BandwidthSchedule) -> None:
+        """Start pacing to *schedule*."""
+        self.schedule = schedule
+        self._next = 0.0
+        self._rate: float | None = None
+        self._lock = threading.Lock()
+
+    def consume(self, nbytes: int, stop: threading.Event | None = None) -> float:
+        """
+        Wait until *nbytes* more fit under the current limit.
+
+        Returns the seconds spent waiting.  The wait ends early if *stop*
+        is set.
+        """
+        rate = self.schedule.rate_at(datetime.now().time())  # noqa: DTZ005 - schedules use local time
+        with self._lock:
+            if rate != self._rate:
+                logger.info("Bandwidth limit now %s", format_rate(rate))
+                self._rate = rate
+            if rate is None:
+                return 0.0
+            now = time.monotonic()
+            cost = nbytes / rate
+            self._next = max(self._next, now - cost) + cost
+            delay = self._next - now
+        if delay <= 0:
+            return 0.0
+        if stop is not None:
+            stop.wait(delay)
+        else:
+            time.sleep(delay)
+        return delay
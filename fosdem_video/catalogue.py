@@ -0,0 +1,233 @@
+"""
+Binary snapshot cache of parsed FOSDEM schedule catalogues.
+
+Parsing a full-year Pentabarf schedule (XML decoding, HTML stripping of
+every abstract/description, episode numbering) is repeated on every run
+even though the schedule rarely changes.  This module keeps a per-year
+snapshot of the parsed :class:`~fosdem_video.models.Talk` list and its
+episode index in the cache directory, together with the HTTP validators
+(``ETag``/``Last-Modified``) and a SHA-256 of the XML it was built from:
+
+- the schedule is fetched with a conditional GET; ``304 Not Modified``
+  loads the snapshot without downloading or parsing anything;
+- a ``200`` whose body hashes to the snapshot's digest also reuses it;
+- anything else re-parses the XML and atomically replaces the snapshot.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from fosdem_video.discovery import parse_schedule_content, schedule_xml_url
+from fosdem_video.download import _build_episode_index, _build_session, episode_key
+from fosdem_video.models import HTTP_OK, Talk, temporary_sibling
+
+if TYPE_CHECKING:
+    import requests
+
+logger = logging.getLogger(__name__)
+
+HTTP_NOT_MODIFIED = 304
+
+# Schedules are small; fetch a few editions at once but stay polite.
+DEFAULT_SCHEDULE_WORKERS = 4
+
+# Bump whenever the snapshot layout or the Talk fields change.
+SNAPSHOT_VERSION = 2
+
+_TALK_FIELDS = tuple(f.name for f in fields(Talk))
+
+
+@dataclass(frozen=True)
+class Catalogue:
+    """A parsed schedule: every talk of an edition plus its episode index."""
+
+    talks: list[Talk]
+    episode_index: dict[str, tuple[int, int]]
+
+
+def default_cache_dir() -> Path:
+    """Return ``$XDG_CACHE_HOME/fosdem-video`` (``~/.cache`` by default)."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "fosdem-video"
+
+
+def snapshot_path(cache_dir: Path, year: int, fmt: str) -> Path:
+    """Return the snapshot file for an edition and video format."""
+    return cache_dir / f"schedule-{year}-{fmt}.pickle"
+
+
+def _read_snapshot(path: Path, year: int, fmt: str) -> dict[str, Any] | None:
+    """Load a snapshot, returning ``None`` if it is missing, stale or corrupt."""
+    try:
+        with path.open("rb") as f:
+            snapshot = pickle.load(f)  # noqa: S301 - our own cache file
+    except FileNotFoundError:
+        return None
+    except Exception:  # noqa: BLE001 - any corruption means "rebuild"
+        logger.warning("Ignoring unreadable schedule snapshot %s", path)
+        return None
+    if (
+        not isinstance(snapshot, dict)
+        or snapshot.get("version") != SNAPSHOT_VERSION
+        or snapshot.get("year") != year
+        or snapshot.get("fmt") != fmt
+    ):
+        return None
+    return snapshot
+
+
+def _write_snapshot(path: Path, snapshot: dict[str, Any]) -> None:
+    """Atomically replace the snapshot at *path*; failures are only logged."""
+    tmp = temporary_sibling(path)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp.open("wb") as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(path)
+        logger.debug("Wrote schedule snapshot %s", path)
+    except OSError:
+        logger.warning("Could not write schedule snapshot %s", path, exc_info=True)
+        tmp.unlink(missing_ok=True)
+
+
+def _catalogue_from_snapshot(snapshot: dict[str, Any]) -> Catalogue:
+    """Rebuild a :class:`Catalogue` from the plain rows stored on disk."""
+    talks = [Talk(*row) for row in snapshot["talks"]]
+    return Catalogue(talks=talks, episode_index=snapshot["episode_index"])
+
+
+def _snapshot_from_catalogue(catalogue: Catalogue) -> list[tuple[Any, ...]]:
+    """Flatten talks into tuples of field values (compact and fast to load)."""
+    return [tuple(getattr(talk, name) for name in _TALK_FIELDS) for talk in catalogue.talks]
+
+
+def build_catalogue(content: bytes, year: int, fmt: str = "mp4") -> Catalogue:
+    """Parse schedule XML *content* into a :class:`Catalogue`."""
+    talks = parse_schedule_content(content, year, fmt=fmt)
+    return Catalogue(talks=talks, episode_index=_build_episode_index(talks))
+
+
+def load_catalogue(
+    year: int,
+    fmt: str = "mp4",
+    *,
+    cache_dir: Path | None = None,
+    session: requests.Session | None = None,
+) -> Catalogue:
+    """
+    Return the full catalogue for *year*, reusing a cached snapshot if current.
+
+    When *cache_dir* is ``None`` the schedule is always fetched and parsed.
+    Raises :class:`RuntimeError` if the schedule cannot be fetched.
+    """
+    path = snapshot_path(cache_dir, year, fmt) if cache_dir is not None else None
+    snapshot = _read_snapshot(path, year, fmt) if path is not None else None
+
+    headers: dict[str, str] = {}
+    if snapshot is not None:
+        if snapshot.get("etag"):
+            headers["If-None-Match"] = snapshot["etag"]
+        if snapshot.get("last_modified"):
+            headers["If-Modified-Since"] = snapshot["last_modified"]
+
+    url = schedule_xml_url(year)
+    logger.info("Fetching schedule XML from %s", url)
+    _session = session or _build_session()
+    response = _session.get(url, headers=headers, timeout=30)
+
+    if snapshot is not None and response.status_code == HTTP_NOT_MODIFIED:
+        logger.info("Schedule for FOSDEM %s unchanged, using cached snapshot", year)
+        return _catalogue_from_snapshot(snapshot)
+    if response.status_code != HTTP_OK:
+        msg = f"Failed to fetch schedule XML for {year}: HTTP {response.status_code}"
+        raise RuntimeError(msg)
+
+    digest = hashlib.sha256(response.content).hexdigest()
+    etag = response.headers.get("ETag", "")
+    last_modified = response.headers.get("Last-Modified", "")
+    if snapshot is not None and snapshot.get("sha256") == digest:
+        logger.info("Schedule for FOSDEM %s unchanged, using cached snapshot", year)
+        catalogue = _catalogue_from_snapshot(snapshot)
+        if (snapshot.get("etag"), snapshot.get("last_modified")) == (etag, last_modified):
+            return catalogue
+    else:
+        catalogue = build_catalogue(response.content, year, fmt)
+
+    if path is not None:
+        _write_snapshot(
+            path,
+            {
+                "version": SNAPSHOT_VERSION,
+                "year": year,
+                "fmt": fmt,
+                "etag": etag,
+                "last_modified": last_modified,
+                "sha256": digest,
+                "talks": _snapshot_from_catalogue(catalogue),
+                "episode_index": catalogue.episode_index,
+            },
+        )
+    return catalogue
+
+
+def load_catalogues(
+    years: list[int],
+    fmt: str = "mp4",
+    *,
+    cache_dir: Path | None = None,
+    max_workers: int = DEFAULT_SCHEDULE_WORKERS,
+) -> dict[int, Catalogue]:
+    """
+    Load the catalogues for several editions concurrently over one session.
+
+    Years whose schedule cannot be fetched are logged and left out of the
+    result; if every year fails, the last error is re-raised.  The result
+    is ordered by year.
+    """
+    session = _build_session()
+
+    def load(year: int) -> Catalogue:
+        return load_catalogue(year, fmt, cache_dir=cache_dir, session=session)
+
+    catalogues: dict[int, Catalogue] = {}
+    last_error: Exception | None = None
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(years)))) as executor:
+        futures = {year: executor.submit(load, year) for year in sorted(years)}
+        for year, future in futures.items():
+            try:
+                catalogues[year] = future.result()
+            except Exception as exc:  # noqa: BLE001 - skip the year, keep the rest
+                logger.warning("Skipping FOSDEM %s: %s", year, exc)
+                last_error = exc
+    if not catalogues and last_error is not None:
+        raise last_error
+    return catalogues
+
+
+def merge_catalogues(catalogues: list[Catalogue]) -> Catalogue:
+    """
+    Combine per-year catalogues into one plan.
+
+    Each year keeps the episode numbering computed from its own schedule;
+    when more than one catalogue is merged the index keys are qualified
+    with :func:`~fosdem_video.download.episode_key`.
+    """
+    if len(catalogues) == 1:
+        return catalogues[0]
+    talks: list[Talk] = []
+    episode_index: dict[str, tuple[int, int]] = {}
+    for catalogue in catalogues:
+        talks.extend(catalogue.talks)
+        for talk in catalogue.talks:
+            ep_info = catalogue.episode_index.get(talk.id)
+            if ep_info is not None:
+                episode_index[episode_key(talk.year, talk.id)] = ep_info
+    return Catalogue(talks=talks, episode_index=episode_index)
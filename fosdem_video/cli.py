@@ -3,34 +3,189 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
 import logging
 import re
 from pathlib import Path
 from sys import stdout
+from typing import TYPE_CHECKING
 
-from fosdem_video.discovery import parse_ics_file, parse_schedule_xml
+from fosdem_video.catalogue import default_cache_dir, load_catalogues, merge_catalogues
+from fosdem_video.discovery import parse_ics_file
 from fosdem_video.download import (
     DEFAULT_DELAY,
+    DEFAULT_MIN_RATE,
+    DEFAULT_MOVE_WORKERS,
+    DEFAULT_NFO_WORKERS,
+    DEFAULT_RETRIES,
+    DEFAULT_RETRY_DELAY,
+    DEFAULT_STALL_WINDOW,
+    DEFAULT_SUBTITLE_WORKERS,
     DEFAULT_WORKERS,
+    RunInterruptedError,
     _build_episode_index,
+    _build_session,
     _build_track_season_map,
+    backfill_subtitles,
     create_dirs,
     download_fosdem_videos,
     is_downloaded,
+    plan_volumes,
     regenerate_nfos,
 )
 
+if TYPE_CHECKING:
+    from fosdem_video.bandwidth import BandwidthSchedule
+    from fosdem_video.journal import RunPlan
+    from fosdem_video.ledger import FailureLedger
+    from fosdem_video.models import Talk
+
 logger = logging.getLogger(__name__)
 
 
+def _parse_years(value: str) -> list[int]:
+    """
+    Parse a ``--year`` value into a sorted list of distinct years.
+
+    Accepts a single year (``2025``), an inclusive range (``2015-2026``),
+    or a comma-separated list of either (``2019,2021-2023``).
+    """
+    years: set[int] = set()
+    for part in value.split(","):
+        m = re.fullmatch(r"\s*(\d{4})(?:\s*-\s*(\d{4}))?\s*", part)
+        if not m:
+            msg = f"invalid year '{value}': expected YYYY, START-END or a comma-separated list"
+            raise argparse.ArgumentTypeError(msg)
+        start = int(m.group(1))
+        end = int(m.group(2)) if m.group(2) else start
+        if end < start:
+            msg = f"invalid year range '{part.strip()}': END must be >= START"
+            raise argparse.ArgumentTypeError(msg)
+        years.update(range(start, end + 1))
+    return sorted(years)
+
+
+def _parse_serve_address(value: str) -> tuple[str, int]:
+    """Parse ``--serve [HOST:]PORT``, reporting errors through argparse."""
+    # Imported lazily, like the server itself, to keep CLI start-up lean.
+    from fosdem_video.serve import parse_serve_address  # noqa: PLC0415
+
+    try:
+        return parse_serve_address(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
+def _parse_duration(value: str) -> float:
+    """Parse a duration such as ``90``, ``45m`` or ``6h`` into seconds."""
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smh]?)\s*", value)
+    if not m or float(m.group(1)) <= 0:
+        msg = f"invalid duration '{value}': expected e.g. 3600, 90m or 6h"
+        raise argparse.ArgumentTypeError(msg)
+    return float(m.group(1)) * {"": 1, "s": 1, "m": 60, "h": 3600}[m.group(2)]
+
+
+def _parse_bandwidth_schedule(value: str) -> BandwidthSchedule:
+    """Parse ``--bandwidth-schedule``, reporting errors through argparse."""
+    from fosdem_video.bandwidth import BandwidthSchedule  # noqa: PLC0415
+
+    try:
+        return BandwidthSchedule.parse(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
+def _parse_shard(value: str) -> tuple[int, int]:
+    """Parse ``--shard K/N``, reporting errors through argparse."""
+    from fosdem_video.shard import parse_shard  # noqa: PLC0415
+
+    try:
+        return parse_shard(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
+def _add_multi_node_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the ``--shard``, ``--mirror`` and ``--coordinate`` options to *parser*."""
+    from fosdem_video.lease import DEFAULT_LEASE_TTL  # noqa: PLC0415
+    from fosdem_video.sources import DEFAULT_HEDGE_PERCENTILE, DEFAULT_PROBE_INTERVAL  # noqa: PLC0415
+
+    parser.add_argument(
+        "--shard",
+        type=_parse_shard,
+        metavar="K/N",
+        help=(
+            "Only handle shard K of N (e.g. '2/3'). Talks are partitioned "
+            "deterministically by year and slug, so N nodes sharing one output "
+            "directory can split the work without coordinating"
+        ),
+    )
+    parser.add_argument(
+        "--shard-by-size",
+        action="store_true",
+        help=(
+            "Balance shards by video size (one HEAD request per talk) instead "
+            "of talk count (requires --shard)"
+        ),
+    )
+
+    parser.add_argument(
+        "--mirror",
+        action="append",
+        metavar="URL",
+        help=(
+            "Base URL serving the video.fosdem.org path scheme (e.g. a node "
+            "running --serve). May be given several times; downloads go to the "
+            "fastest healthy source and fail over to the others, with "
+            "video.fosdem.org always available as a fallback"
+        ),
+    )
+    parser.add_argument(
+        "--probe-interval",
+        type=float,
+        default=DEFAULT_PROBE_INTERVAL,
+        help="Seconds between latency/throughput probes of the --mirror sources (0 probes only at start-up)",
+    )
+    parser.add_argument(
+        "--hedge-percentile",
+        type=float,
+        default=DEFAULT_HEDGE_PERCENTILE,
+        help=(
+            "With --mirror, send a duplicate request to the next source when the "
+            "first byte is later than this percentile of recent requests (0 disables)"
+        ),
+    )
+    parser.add_argument(
+        "--coordinate",
+        action="store_true",
+        help=(
+            "Coordinate with other processes using the same --output through "
+            "lease files, so work is balanced dynamically and no talk is "
+            "downloaded twice"
+        ),
+    )
+    parser.add_argument(
+        "--lease-ttl",
+        type=float,
+        default=DEFAULT_LEASE_TTL,
+        help="Seconds without a heartbeat after which another process may take over a talk",
+    )
+
+
 def parse_arguments() -> argparse.Namespace:
     """Parse command-line arguments for the FOSDEM video downloader script."""
+    # Only the defaults are needed here: like requests and icalendar, the
+    # subsystems themselves are loaded by the code paths that use them
+    from fosdem_video.ledger import DEFAULT_FAILURE_COOLDOWN  # noqa: PLC0415
+    from fosdem_video.staging import DEFAULT_PUBLISH_ORDER, PUBLISH_ORDERS  # noqa: PLC0415
+    from fosdem_video.volumes import DEFAULT_PLACEMENT, PLACEMENTS  # noqa: PLC0415
+
     parser = argparse.ArgumentParser(
         description="Download FOSDEM videos from an ICS file or by year",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
     )
 
-    # Input mode: --ics or --year (mutually exclusive, one required)
+    # Input mode: --ics, --year, --serve or --resume-run (mutually exclusive, one required)
     input_group = parser.add_mutually_exclusive_group(required=True)
     input_group.add_argument(
         "--ics",
@@ -39,8 +194,31 @@ def parse_arguments() -> argparse.Namespace:
     )
     input_group.add_argument(
         "--year",
-        type=int,
-        help="FOSDEM edition year (e.g. 2025) to fetch talks from schedule XML",
+        dest="years",
+        type=_parse_years,
+        help=(
+            "FOSDEM edition year (e.g. 2025) to fetch talks from schedule XML. "
+            "Accepts ranges and comma-separated lists, e.g. '2015-2026' or "
+            "'2019,2021-2023', which are downloaded in one run"
+        ),
+    )
+    input_group.add_argument(
+        "--serve",
+        type=_parse_serve_address,
+        metavar="[HOST:]PORT",
+        help=(
+            "Serve the library in --output and any --volume over HTTP using the "
+            "video.fosdem.org path scheme, so other nodes can use it with --mirror. A bare "
+            "port binds localhost; use e.g. '0.0.0.0:8080' to serve the LAN"
+        ),
+    )
+    input_group.add_argument(
+        "--resume-run",
+        action="store_true",
+        help=(
+            "Continue this host's interrupted run journalled in --output, with "
+            "the same talks, layout and source ranking, skipping talks already done"
+        ),
     )
 
     # Filters (valid only with --year)
@@ -87,6 +265,31 @@ def parse_arguments() -> argparse.Namespace:
         default=Path("./fosdem_videos"),
         help="Root directory for downloaded files",
     )
+    parser.add_argument(
+        "--volume",
+        type=Path,
+        action="append",
+        metavar="PATH",
+        help=(
+            "Another library root, e.g. on a second disk (repeatable). New downloads are "
+            "spread over --output and the volumes by free space; --output keeps the run's "
+            "journal, ledger and leases"
+        ),
+    )
+    parser.add_argument(
+        "--placement",
+        choices=PLACEMENTS,
+        default=DEFAULT_PLACEMENT,
+        help="Keep each season on one volume, or place every talk on the volume with the most free space",
+    )
+    parser.add_argument(
+        "--check-space",
+        action="store_true",
+        help=(
+            "Fetch every video's size first (one HEAD request per talk) and stop before "
+            "downloading if they do not fit; implied by --volume"
+        ),
+    )
     parser.add_argument(
         "--jellyfin",
         action="store_true",
@@ -97,6 +300,20 @@ def parse_arguments() -> argparse.Namespace:
         ),
     )
 
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=default_cache_dir(),
+        help="Directory for parsed schedule snapshots (speeds up repeated --year runs)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always re-parse the schedule XML instead of using a cached snapshot",
+    )
+
+    _add_multi_node_arguments(parser)
+
     # General options
     parser.add_argument(
         "-w",
@@ -105,12 +322,112 @@ def parse_arguments() -> argparse.Namespace:
         default=DEFAULT_WORKERS,
         help="Number of concurrent downloads",
     )
+    parser.add_argument(
+        "--subtitle-workers",
+        type=int,
+        default=DEFAULT_SUBTITLE_WORKERS,
+        help="Threads fetching subtitles while videos download (independent of --workers)",
+    )
+    parser.add_argument(
+        "--nfo-workers",
+        type=int,
+        default=DEFAULT_NFO_WORKERS,
+        help="Threads writing episode NFOs once a video is downloaded (Jellyfin layout)",
+    )
     parser.add_argument(
         "--delay",
         type=float,
         default=DEFAULT_DELAY,
         help="Seconds to wait between downloads (per worker) to avoid overloading the server",
     )
+    parser.add_argument(
+        "--staging-dir",
+        type=Path,
+        metavar="PATH",
+        help=(
+            "Download into this scratch directory (e.g. a local SSD) and move finished "
+            "files into --output in the background"
+        ),
+    )
+    parser.add_argument(
+        "--move-workers",
+        type=int,
+        default=DEFAULT_MOVE_WORKERS,
+        help="Talks published into the library at once (moved from --staging-dir, if given)",
+    )
+    parser.add_argument(
+        "--publish-order",
+        choices=sorted(PUBLISH_ORDERS),
+        default=DEFAULT_PUBLISH_ORDER,
+        help="Which file of a finished talk appears in the library last: the video or its NFO",
+    )
+    parser.add_argument(
+        "--preallocate",
+        action="store_true",
+        help="Reserve each video's full size before writing it, to avoid fragmentation (Linux)",
+    )
+    parser.add_argument(
+        "--drop-cache",
+        action="store_true",
+        help="Flush written video regularly and drop it from the page cache, sparing other services' cache",
+    )
+    parser.add_argument(
+        "--min-rate",
+        type=float,
+        default=DEFAULT_MIN_RATE / 1024,
+        metavar="KIB_PER_S",
+        help=(
+            "Abort a transfer averaging less than this many KiB/s over "
+            "--stall-window and retry it later, resuming from the partial file (0 disables)"
+        ),
+    )
+    parser.add_argument(
+        "--stall-window",
+        type=float,
+        default=DEFAULT_STALL_WINDOW,
+        help="Seconds over which --min-rate is measured",
+    )
+    parser.add_argument(
+        "--bandwidth-schedule",
+        type=_parse_bandwidth_schedule,
+        metavar="SPEC",
+        help=(
+            "Limit the combined download rate by local time of day, e.g. "
+            "'01:00-06:00=unlimited,1M' for full speed at night and 1 MiB/s "
+            "otherwise. Entries are HH:MM-HH:MM=RATE or a bare default RATE; "
+            "rates take K/M/G suffixes"
+        ),
+    )
+    parser.add_argument(
+        "--max-runtime",
+        type=_parse_duration,
+        metavar="DURATION",
+        help=(
+            "Stop downloading after this long (seconds, or e.g. 90m, 6h), "
+            "keeping partial files so a later run or --resume-run continues"
+        ),
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=DEFAULT_RETRIES,
+        help="Extra rounds over failed talks at the end of the run",
+    )
+    parser.add_argument(
+        "--retry-delay",
+        type=float,
+        default=DEFAULT_RETRY_DELAY,
+        help="Seconds before the first end-of-run retry round (doubled per round)",
+    )
+    parser.add_argument(
+        "--failure-cooldown",
+        type=float,
+        default=DEFAULT_FAILURE_COOLDOWN,
+        help=(
+            "Seconds before a talk that failed in an earlier run is tried "
+            "again (doubled per consecutive failure)"
+        ),
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -125,6 +442,14 @@ def parse_arguments() -> argparse.Namespace:
             "and --year)"
         ),
     )
+    parser.add_argument(
+        "--backfill-subtitles",
+        action="store_true",
+        help=(
+            "Also fetch subtitles published since their videos were downloaded; "
+            "subtitles still missing are rechecked after a cooldown"
+        ),
+    )
     parser.add_argument(
         "--log-level",
         default="INFO",
@@ -154,19 +479,84 @@ def _validate_tracks_format(
         parser.error(f"invalid --tracks range '{tracks}': END must be >= START")
 
 
+def _validate_multi_node_args(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+) -> None:
+    """Validate ``--shard`` / ``--coordinate`` related options."""
+    if args.shard_by_size and not args.shard:
+        parser.error("--shard-by-size requires --shard")
+    if args.lease_ttl <= 0:
+        parser.error("--lease-ttl must be positive")
+
+
+def _validate_transfer_args(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+) -> None:
+    """Validate source selection, transfer watchdog and retry options."""
+    if args.probe_interval < 0:
+        parser.error("--probe-interval must not be negative")
+    if not 0 <= args.hedge_percentile < 100:  # noqa: PLR2004
+        parser.error("--hedge-percentile must be between 0 and 100")
+    if args.min_rate < 0:
+        parser.error("--min-rate must not be negative")
+    if args.stall_window <= 0:
+        parser.error("--stall-window must be positive")
+    if args.retries < 0:
+        parser.error("--retries must not be negative")
+    if args.retry_delay < 0:
+        parser.error("--retry-delay must not be negative")
+    if args.failure_cooldown < 0:
+        parser.error("--failure-cooldown must not be negative")
+    if min(args.subtitle_workers, args.nfo_workers, args.move_workers) < 1:
+        parser.error("--subtitle-workers, --nfo-workers and --move-workers must be at least 1")
+
+
+def _validate_output_args(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+) -> None:
+    """Check the ``--volume`` roots and collect all library roots in ``args.roots``."""
+    args.roots = [args.output, *(args.volume or [])]
+    for volume in args.volume or []:
+        if not volume.is_dir():
+            parser.error(f"--volume directory not found: {volume}")
+    if len({root.resolve() for root in args.roots}) < len(args.roots):
+        parser.error("--volume must differ from --output and from each other")
+
+
+def _validate_resume_args(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+) -> None:
+    """Check that --resume-run has a journalled run to continue."""
+    if not args.resume_run:
+        return
+    from fosdem_video.journal import find_journal  # noqa: PLC0415
+
+    if find_journal(args.output) is None:
+        parser.error(f"no run of this host to resume in {args.output}")
+
+
 def _validate_args(
     parser: argparse.ArgumentParser,
     args: argparse.Namespace,
 ) -> None:
     """Validate cross-argument constraints after parsing."""
+    # ``args.year`` is kept for single-edition runs; ``args.years`` always
+    # holds the full list (empty in ICS mode).
+    args.years = args.years or []
+    args.year = args.years[0] if len(args.years) == 1 else None
+
     # --track, --tracks, and --talk require --year
-    if args.track and not args.year:
+    if args.track and not args.years:
         parser.error("--track requires --year")
-    if args.tracks and not args.year:
+    if args.tracks and not args.years:
         parser.error("--tracks requires --year")
     if args.track and args.tracks:
         parser.error("--track and --tracks are mutually exclusive")
-    if args.talk and not args.year:
+    if args.talk and not args.years:
         parser.error("--talk requires --year")
     if args.tracks:
         _validate_tracks_format(parser, args.tracks)
@@ -174,12 +564,43 @@ def _validate_args(
     # --regenerate-nfo requires --jellyfin and --year
     if args.regenerate_nfo and not args.jellyfin:
         parser.error("--regenerate-nfo requires --jellyfin")
-    if args.regenerate_nfo and not args.year:
+    if args.regenerate_nfo and not args.years:
         parser.error("--regenerate-nfo requires --year")
 
+    _validate_output_args(parser, args)
+    _validate_multi_node_args(parser, args)
+    _validate_transfer_args(parser, args)
+
     # ICS file must exist when provided
     if args.ics and not args.ics.exists():
         parser.error(f"ICS file not found: {args.ics}")
+    _validate_resume_args(parser, args)
+
+
+def _filter_talks(all_talks: list[Talk], args: argparse.Namespace) -> list[Talk]:
+    """Apply the ``--track`` / ``--tracks`` / ``--talk`` filters to one edition."""
+    talks = all_talks
+    if args.track:
+        talks = [t for t in all_talks if t.track.lower() == args.track.lower()]
+    if args.tracks:
+        m = re.fullmatch(r"(\d+)-(last|\d+)", args.tracks)
+        start = int(m.group(1))  # type: ignore[union-attr]
+        track_season_map = _build_track_season_map(all_talks)
+        if not track_season_map:
+            return []
+        end = max(track_season_map.values()) if m.group(2) == "last" else int(m.group(2))  # type: ignore[union-attr]
+        selected_tracks = {name for name, num in track_season_map.items() if start <= num <= end}
+        # Log the resolved track names so the user knows what was selected
+        for name in sorted(selected_tracks, key=lambda n: track_season_map[n]):
+            logger.info(
+                "Track %d: %s",
+                track_season_map[name],
+                name,
+            )
+        talks = [t for t in all_talks if t.track in selected_tracks]
+    if args.talk:
+        talks = [t for t in talks if t.id == args.talk]
+    return talks
 
 
 def main() -> None:
@@ -191,6 +612,17 @@ def main() -> None:
         datefmt="%Y-%m-%dT%H:%M:%S",
     )
 
+    if args.serve:
+        from fosdem_video.serve import serve_library  # noqa: PLC0415
+
+        host, port = args.serve
+        serve_library(args.roots, host, port)
+        return
+
+    if args.resume_run:
+        _resume_run(args)
+        return
+
     fmt: str = args.format
 
     # Discover talks from the selected input mode
@@ -198,64 +630,77 @@ def main() -> None:
         logger.info("Parsing ICS file %s", args.ics)
         all_talks = parse_ics_file(args.ics, fmt=fmt)
         talks = all_talks
+        catalogue = None
     else:
-        logger.info("Fetching schedule for FOSDEM %s", args.year)
+        logger.info("Fetching schedule for FOSDEM %s", ", ".join(map(str, args.years)))
         # Always fetch ALL talks first so that the episode index reflects
         # the full schedule.  Season numbers are derived from the
         # alphabetical position of each track across the entire conference,
-        # not just the downloaded subset.
-        all_talks = parse_schedule_xml(args.year, fmt=fmt)
-        talks = all_talks
+        # not just the downloaded subset.  Several editions are fetched
+        # concurrently and merged into a single download plan.
+        catalogues = load_catalogues(
+            args.years,
+            fmt=fmt,
+            cache_dir=None if args.no_cache else args.cache_dir,
+        )
+        catalogue = merge_catalogues(list(catalogues.values()))
+        all_talks = catalogue.talks
 
-        # Apply --track / --tracks / --talk filters *after* building the full list.
-        if args.track:
-            talks = [t for t in all_talks if t.track.lower() == args.track.lower()]
-        if args.tracks:
-            m = re.fullmatch(r"(\d+)-(last|\d+)", args.tracks)
-            start = int(m.group(1))  # type: ignore[union-attr]
-            track_season_map = _build_track_season_map(all_talks)
-            end = max(track_season_map.values()) if m.group(2) == "last" else int(m.group(2))  # type: ignore[union-attr]
-            selected_tracks = {name for name, num in track_season_map.items() if start <= num <= end}
-            # Log the resolved track names so the user knows what was selected
-            for name in sorted(selected_tracks, key=lambda n: track_season_map[n]):
-                logger.info(
-                    "Track %d: %s",
-                    track_season_map[name],
-                    name,
-                )
-            talks = [t for t in all_talks if t.track in selected_tracks]
-        if args.talk:
-            talks = [t for t in talks if t.id == args.talk]
+        # Apply --track / --tracks / --talk filters *after* building the
+        # full list, per edition since track numbering is per edition.
+        talks = [
+            talk
+            for year_catalogue in catalogues.values()
+            for talk in _filter_talks(year_catalogue.talks, args)
+        ]
 
     logger.info("Found %s talks", len(talks))
 
+    # Keep only this node's share.  Sharding happens before the
+    # already-downloaded check so every node computes the same partition
+    # regardless of how far the others have got.
+    sizes = None
+    if args.shard:
+        from fosdem_video.shard import probe_sizes, shard_talks  # noqa: PLC0415
+
+        shard_index, shard_count = args.shard
+        sizes = probe_sizes(talks, _build_session()) if args.shard_by_size else None
+        talks = shard_talks(talks, shard_index, shard_count, sizes)
+
     # Build episode index from the FULL talk list so that season numbers
     # reflect each track's position in the complete schedule — not just
     # the filtered subset.  For ICS mode there is no unfiltered list, so
-    # we fall back to whatever was parsed.
-    episode_index = _build_episode_index(all_talks) if args.jellyfin else {}
+    # we fall back to whatever was parsed.  Year mode reuses the index
+    # stored alongside the schedule snapshot.
+    if not args.jellyfin:
+        episode_index = {}
+    elif catalogue is not None:
+        episode_index = catalogue.episode_index
+    else:
+        episode_index = _build_episode_index(all_talks)
 
-    # Regenerate NFOs and images for all talks (including already-downloaded)
-    if args.regenerate_nfo:
-        regenerate_nfos(
-            talks,
-            args.output,
-            fmt=fmt,
-            episode_index=episode_index,
-        )
+    _refresh_library(args, talks, fmt, episode_index)
 
-    # Filter already-downloaded talks
+    # Filter talks already downloaded to any of the volumes
     talks = [
         talk
         for talk in talks
-        if not is_downloaded(
-            args.output,
-            talk,
-            fmt,
-            jellyfin=args.jellyfin,
-            episode_index=episode_index,
+        if not any(
+            is_downloaded(
+                root,
+                talk,
+                fmt,
+                jellyfin=args.jellyfin,
+                episode_index=episode_index,
+            )
+            for root in args.roots
         )
     ]
+    # Earlier failures first; those still cooling down wait for a later run
+    from fosdem_video.ledger import FailureLedger, ledger_path  # noqa: PLC0415
+
+    ledger = FailureLedger(ledger_path(args.output), cooldown=args.failure_cooldown)
+    talks = ledger.schedule(talks)
     logger.info("Found %s videos to download", len(talks))
 
     if args.dry_run:
@@ -263,16 +708,229 @@ def main() -> None:
         stdout.write(f"List of talks videos: \n{urls}\n")
         return
 
-    create_dirs(args.output, talks, jellyfin=args.jellyfin, episode_index=episode_index)
-    results = download_fosdem_videos(
-        talks,
-        output_dir=args.output,
-        fmt=fmt,
-        num_workers=args.workers,
-        delay=args.delay,
-        no_vtt=args.no_vtt,
-        jellyfin=args.jellyfin,
-        episode_index=episode_index,
+    _download(args, talks, fmt, episode_index, ledger, sizes=sizes)
+
+
+def _refresh_library(
+    args: argparse.Namespace,
+    talks: list[Talk],
+    fmt: str,
+    episode_index: dict[str, tuple[int, int]],
+) -> None:
+    """Run ``--regenerate-nfo`` and ``--backfill-subtitles`` on every volume."""
+    # Regenerate NFOs and images for all talks (including already-downloaded).
+    # With several volumes each only gets the talks whose video it holds:
+    # folders on the others would tie every season to every volume, and the
+    # talks still to download get theirs on the volume they are placed on.
+    if args.regenerate_nfo:
+        for root in args.roots:
+            held = talks
+            if len(args.roots) > 1:
+                held = [
+                    talk
+                    for talk in talks
+                    if is_downloaded(root, talk, fmt, jellyfin=True, episode_index=episode_index)
+                ]
+            regenerate_nfos(
+                held,
+                root,
+                fmt=fmt,
+                episode_index=episode_index,
+            )
+
+    # Fetch subtitles that appeared after their videos were downloaded
+    if args.backfill_subtitles:
+        from fosdem_video.ledger import (  # noqa: PLC0415
+            DEFAULT_SUBTITLE_COOLDOWN,
+            FailureLedger,
+            subtitle_cache_path,
+        )
+        from fosdem_video.sources import SourcePool  # noqa: PLC0415
+
+        cache = FailureLedger(subtitle_cache_path(args.output), cooldown=DEFAULT_SUBTITLE_COOLDOWN)
+        for root in args.roots:
+            backfill_subtitles(
+                talks,
+                root,
+                fmt,
+                jellyfin=args.jellyfin,
+                episode_index=episode_index,
+                sources=SourcePool(args.mirror),
+                workers=args.subtitle_workers,
+                bandwidth=args.bandwidth_schedule,
+                cache=cache,
+                dry_run=args.dry_run,
+            )
+
+
+def _resume_run(args: argparse.Namespace) -> None:
+    """Download what is left of this host's last run journalled in ``--output``."""
+    from fosdem_video.journal import find_journal, load_run  # noqa: PLC0415
+    from fosdem_video.ledger import FailureLedger, ledger_path  # noqa: PLC0415
+
+    path = find_journal(args.output)
+    if path is None:
+        msg = f"No run of this host to resume in {args.output}"
+        raise SystemExit(msg)
+    plan = load_run(path)
+    talks = plan.pending()
+    logger.info(
+        "Resuming run: %d of %d planned talks left%s",
+        len(talks),
+        len(plan.talks),
+        " (it had finished)" if plan.finished else "",
     )
+    if not talks:
+        return
+    ledger = FailureLedger(ledger_path(args.output), cooldown=args.failure_cooldown)
+    _download(args, talks, plan.fmt, plan.episode_index, ledger, resumed=plan)
+
+
+def _place_talks(  # noqa: PLR0913
+    args: argparse.Namespace,
+    talks: list[Talk],
+    fmt: str,
+    *,
+    jellyfin: bool,
+    episode_index: dict[str, tuple[int, int]],
+    sizes: dict[str, int] | None,
+) -> tuple[dict[str, Path], dict[str, int]]:
+    """
+    Choose each talk's volume and check that the run fits, if needed.
+
+    Returns the root and video size of each talk by ``talk.url``, or empty
+    mappings (everything in ``--output``) without ``--volume`` or
+    ``--check-space``.
+    The video sizes are probed unless *sizes* (from ``--shard-by-size``)
+    already has them.  Exits if the videos do not fit into the free space.
+    """
+    if len(args.roots) == 1 and not args.check_space:
+        return {}, {}
+    from fosdem_video.shard import probe_sizes  # noqa: PLC0415
+    from fosdem_video.volumes import InsufficientSpaceError, format_size  # noqa: PLC0415
+
+    if sizes is None:
+        sizes = probe_sizes(talks, _build_session())
+    else:
+        sizes = {talk.url: sizes[talk.url] for talk in talks if talk.url in sizes}
+    logger.info("Planned %d videos of %s", len(talks), format_size(sum(sizes.values())))
+    try:
+        roots = plan_volumes(
+            talks,
+            args.roots,
+            fmt,
+            sizes,
+            jellyfin=jellyfin,
+            episode_index=episode_index,
+            policy=args.placement,
+        )
+    except InsufficientSpaceError as exc:
+        msg = f"Not enough space for this run: {exc.strerror}"
+        raise SystemExit(msg) from None
+    return roots, sizes
+
+
+def _download(  # noqa: PLR0913
+    args: argparse.Namespace,
+    talks: list[Talk],
+    fmt: str,
+    episode_index: dict[str, tuple[int, int]],
+    ledger: FailureLedger,
+    *,
+    resumed: RunPlan | None = None,
+    sizes: dict[str, int] | None = None,
+) -> None:
+    """
+    Download *talks*, journalling the run so ``--resume-run`` can continue it.
+
+    A *resumed* run appends to its journal and reuses its layout, volume
+    placement and source measurements instead of planning and probing again; a new one
+    clears this host's journals of finished runs first.  *sizes* are the
+    video sizes already probed for ``--shard-by-size``, if any.
+    """
+    from fosdem_video.journal import RunJournal, journal_path, prune_journals  # noqa: PLC0415
+    from fosdem_video.lease import LeaseQueue, lease_dir  # noqa: PLC0415
+    from fosdem_video.sources import SourcePool  # noqa: PLC0415
+    from fosdem_video.writer import WritePolicy  # noqa: PLC0415
+
+    jellyfin = resumed.jellyfin if resumed else args.jellyfin
+    if resumed:
+        roots, sizes = resumed.roots, resumed.sizes
+    else:
+        roots, sizes = _place_talks(
+            args, talks, fmt, jellyfin=jellyfin, episode_index=episode_index, sizes=sizes
+        )
+    # A resumed run may have placed talks on volumes not given this time
+    libraries = list(dict.fromkeys([*args.roots, *roots.values()]))
+    for root in libraries:
+        placed = [talk for talk in talks if roots.get(talk.url, args.output) == root]
+        create_dirs(root, placed, jellyfin=jellyfin, episode_index=episode_index)
+    if resumed is None:
+        prune_journals(args.output)
+    with contextlib.ExitStack() as stack:
+        path = resumed.path if resumed else journal_path(args.output)
+        journal = stack.enter_context(RunJournal(path, resume=resumed is not None))
+        if resumed is None:
+            journal.write_plan(
+                talks,
+                fmt=fmt,
+                jellyfin=jellyfin,
+                episode_index=episode_index,
+                roots=roots,
+                sizes=sizes,
+            )
+        leases = (
+            stack.enter_context(LeaseQueue(lease_dir(args.output), ttl=args.lease_ttl))
+            if args.coordinate
+            else None
+        )
+        pool = SourcePool(
+            [row["base"] for row in resumed.sources] if resumed and resumed.sources else args.mirror,
+            session=_build_session(),
+            probe_url=talks[0].url if talks else None,
+            probe_interval=args.probe_interval,
+            hedge_percentile=args.hedge_percentile,
+        )
+        if resumed:
+            pool.restore(resumed.sources)
+        sources = stack.enter_context(pool)
+        if resumed is None:
+            journal.write_sources(sources.measurements())
+        try:
+            results = download_fosdem_videos(
+                talks,
+                output_dir=args.output,
+                fmt=fmt,
+                num_workers=args.workers,
+                delay=args.delay,
+                no_vtt=args.no_vtt,
+                jellyfin=jellyfin,
+                episode_index=episode_index,
+                leases=leases,
+                sources=sources,
+                min_rate=args.min_rate * 1024,
+                stall_window=args.stall_window,
+                retries=args.retries,
+                retry_delay=args.retry_delay,
+                ledger=ledger,
+                journal=journal,
+                bandwidth=args.bandwidth_schedule,
+                max_runtime=args.max_runtime,
+                subtitle_workers=args.subtitle_workers,
+                nfo_workers=args.nfo_workers,
+                write_policy=WritePolicy(preallocate=args.preallocate, drop_cache=args.drop_cache),
+                staging_dir=args.staging_dir,
+                move_workers=args.move_workers,
+                publish_order=args.publish_order,
+                roots=roots,
+                volumes=libraries,
+            )
+        except RunInterruptedError as exc:
+            # A deadline is the expected end of a time-boxed run: exit 0
+            if exc.signum is None:
+                logger.info("Stopped at --max-runtime; continue with --resume-run")
+                raise SystemExit(0) from None
+            logger.warning("Run stopped by %s; continue it with --resume-run", exc)
+            raise SystemExit(128 + exc.signum) from None
     successful = len([r for r in results if r])
     logger.info("Downloaded %s of %s talks", successful, len(talks))
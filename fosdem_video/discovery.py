@@ -2,16 +2,13 @@
 
 from __future__ import annotations
 
-import html
 import logging
-import re
 import xml.etree.ElementTree as ET
 from typing import TYPE_CHECKING
 
-from icalendar import Calendar
-
 from fosdem_video.models import (
     HTTP_OK,
+    UPSTREAM_BASE,
     Talk,
     get_path_elements,
     normalise_location,
@@ -32,6 +29,8 @@ def parse_ics_file(ics_path: Path, fmt: str = "mp4") -> list[Talk]:
         fmt: Video format extension (e.g. "mp4" or "av1.webm").
 
     """
+    from icalendar import Calendar  # noqa: PLC0415 - heavy, only needed for ICS mode
+
     if not ics_path.exists() or ics_path.stat().st_size == 0:
         msg = f"Invalid ICS file: {ics_path} (missing or empty)"
         raise ValueError(msg)
@@ -54,9 +53,7 @@ def parse_ics_file(ics_path: Path, fmt: str = "mp4") -> list[Talk]:
         year, talk_id = get_path_elements(url)
         location_normalised = normalise_location(str(location))
 
-        video_url = (
-            f"https://video.fosdem.org/{year}/{location_normalised}/{talk_id}.{fmt}"
-        )
+        video_url = f"{UPSTREAM_BASE}/{year}/{location_normalised}/{talk_id}.{fmt}"
 
         talks.append(Talk(video_url, year, talk_id, location_normalised))
 
@@ -69,41 +66,30 @@ def _el_text(parent: ET.Element, tag: str) -> str:
     return el.text.strip() if el is not None and el.text else ""
 
 
-def _strip_html(text: str) -> str:
-    """Remove HTML tags and decode entities from a string."""
-    unescaped = html.unescape(text)
-    return re.sub(r"<[^>]+>", "", unescaped).strip()
+def schedule_xml_url(year: int) -> str:
+    """Return the Pentabarf schedule XML URL for a FOSDEM edition."""
+    return f"https://fosdem.org/{year}/schedule/xml"
 
 
-def parse_schedule_xml(
+def parse_schedule_content(
+    content: bytes,
     year: int,
     track: str | None = None,
     talk_id: str | None = None,
     fmt: str = "mp4",
 ) -> list[Talk]:
     """
-    Fetch the FOSDEM Pentabarf schedule XML and build Talk objects.
+    Build Talk objects from already-fetched Pentabarf schedule XML.
 
     Args:
+        content: Raw schedule XML document.
         year: FOSDEM edition year (e.g. 2025).
         track: Optional track name filter (case-insensitive substring match).
         talk_id: Optional talk slug to select a single event.
         fmt: Video format extension (e.g. "mp4" or "av1.webm").
 
     """
-    from fosdem_video.download import (  # avoid circular import
-        _build_session,
-    )
-
-    url = f"https://fosdem.org/{year}/schedule/xml"
-    logger.info("Fetching schedule XML from %s", url)
-    session = _build_session()
-    response = session.get(url, timeout=30)
-    if response.status_code != HTTP_OK:
-        msg = f"Failed to fetch schedule XML for {year}: HTTP {response.status_code}"
-        raise RuntimeError(msg)
-
-    root = ET.fromstring(response.content)  # noqa: S314
+    root = ET.fromstring(content)  # noqa: S314
 
     talks: list[Talk] = []
     for day in root.iter("day"):
@@ -125,14 +111,12 @@ def parse_schedule_xml(
 
                 persons_el = event.find("persons")
                 persons = (
-                    [p.text.strip() for p in persons_el.iter("person") if p.text]
+                    tuple(p.text.strip() for p in persons_el.iter("person") if p.text)
                     if persons_el is not None
-                    else []
+                    else ()
                 )
 
-                video_url = (
-                    f"https://video.fosdem.org/{year}/{room_normalised}/{slug}.{fmt}"
-                )
+                video_url = f"{UPSTREAM_BASE}/{year}/{room_normalised}/{slug}.{fmt}"
                 talks.append(
                     Talk(
                         url=video_url,
@@ -148,13 +132,42 @@ def parse_schedule_xml(
                         event_url=_el_text(event, "url"),
                         language=_el_text(event, "language"),
                         event_type=_el_text(event, "type"),
-                        abstract=_strip_html(_el_text(event, "abstract")),
-                        description=_strip_html(
-                            _el_text(event, "description"),
-                        ),
+                        abstract_html=_el_text(event, "abstract"),
+                        description_html=_el_text(event, "description"),
                         feedback_url=_el_text(event, "feedback_url"),
                         persons=persons,
                     ),
                 )
 
     return talks
+
+
+def parse_schedule_xml(
+    year: int,
+    track: str | None = None,
+    talk_id: str | None = None,
+    fmt: str = "mp4",
+) -> list[Talk]:
+    """
+    Fetch the FOSDEM Pentabarf schedule XML and build Talk objects.
+
+    Args:
+        year: FOSDEM edition year (e.g. 2025).
+        track: Optional track name filter (case-insensitive substring match).
+        talk_id: Optional talk slug to select a single event.
+        fmt: Video format extension (e.g. "mp4" or "av1.webm").
+
+    """
+    from fosdem_video.download import (  # avoid circular import
+        _build_session,
+    )
+
+    url = schedule_xml_url(year)
+    logger.info("Fetching schedule XML from %s", url)
+    session = _build_session()
+    response = session.get(url, timeout=30)
+    if response.status_code != HTTP_OK:
+        msg = f"Failed to fetch schedule XML for {year}: HTTP {response.status_code}"
+        raise RuntimeError(msg)
+
+    return parse_schedule_content(response.content, year, track, talk_id, fmt)
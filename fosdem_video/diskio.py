@@ -0,0 +1,75 @@
+"""
+Allocation and page-cache hints for large video files.
+
+Archival runs write terabytes of video that are read rarely, if ever, by
+the machine writing them.  Written in 1 MiB appends, such files fragment
+on XFS/ext4, and every byte passes through the page cache, evicting the
+working set of anything else on the host (e.g. Jellyfin).
+
+:func:`preallocate` reserves a file's expected size in one extent
+*without* changing its visible size, so a ``.part`` file still tells how
+much was downloaded if the process is killed.  :func:`release_written`
+flushes a written region and drops it from the page cache.
+
+Both are best-effort hints: where the calls are unavailable (non-Linux
+platforms, filesystems without support) they do nothing, or fall back to
+``fdatasync``.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import os
+import sys
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# fallocate(2) mode: reserve blocks, leave st_size alone
+_FALLOC_FL_KEEP_SIZE = 0x01
+# sync_file_range(2): wait for earlier writeback, start ours, wait for it
+_SYNC_FILE_RANGE_WAIT_ALL = 0x01 | 0x02 | 0x04
+
+
+@functools.cache
+def _libc() -> Any | None:  # noqa: ANN401
+    """Return libc with ``fallocate``/``sync_file_range`` bound, or ``None``."""
+    if not sys.platform.startswith("linux"):
+        return None
+    # Only loaded when one of the options is used, to keep startup light
+    import ctypes  # noqa: PLC0415
+
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.fallocate.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64]
+        libc.sync_file_range.argtypes = [ctypes.c_int, ctypes.c_int64, ctypes.c_int64, ctypes.c_uint]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+def preallocate(fd: int, offset: int, length: int) -> bool:
+    """
+    Reserve *length* bytes from *offset* in the file open as *fd*.
+
+    The file's size is unchanged.  Returns whether the space was reserved.
+    """
+    libc = _libc()
+    if libc is None or length <= 0:
+        return False
+    if libc.fallocate(fd, _FALLOC_FL_KEEP_SIZE, offset, length) != 0:
+        import ctypes  # noqa: PLC0415
+
+        logger.debug("fallocate failed: %s", os.strerror(ctypes.get_errno()))
+        return False
+    return True
+
+
+def release_written(fd: int, offset: int, length: int) -> None:
+    """Write the region of *fd* back to disk, then drop it from the page cache."""
+    libc = _libc()
+    if libc is None or libc.sync_file_range(fd, offset, length, _SYNC_FILE_RANGE_WAIT_ALL) != 0:
+        getattr(os, "fdatasync", os.fsync)(fd)
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(fd, offset, length, os.POSIX_FADV_DONTNEED)
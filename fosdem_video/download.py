@@ -3,29 +3,43 @@
 from __future__ import annotations
 
 import contextlib
+import heapq
 import logging
+import os
 import re
+import signal
+import threading
 import time
-from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
 from typing import TYPE_CHECKING
 
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-
 if TYPE_CHECKING:
-    from pathlib import Path
+    from collections.abc import Callable, Iterator
+    from types import FrameType
+
+    import requests
+
+    from fosdem_video.bandwidth import BandwidthSchedule, RateLimiter
+    from fosdem_video.journal import RunJournal
+    from fosdem_video.lease import LeaseQueue
+    from fosdem_video.ledger import FailureLedger
+    from fosdem_video.sources import Source, SourcePool
+    from fosdem_video.writer import WritePolicy, WriteStats
 
 from fosdem_video.images import copy_season_images, copy_show_images, get_assets_dir
 from fosdem_video.models import (
     HTTP_NOT_FOUND,
     HTTP_OK,
+    HTTP_PARTIAL_CONTENT,
     Talk,
     display_name,
     sanitise_path_component,
+    temporary_sibling,
 )
 from fosdem_video.nfo import write_episode_nfo, write_season_nfo, write_tvshow_nfo
+from fosdem_video.writer import DEFAULT_METADATA_WORKERS, MetadataWriter
 
 logger = logging.getLogger(__name__)
 
@@ -36,90 +50,587 @@ DEFAULT_WORKERS = 2
 DEFAULT_DELAY: float = 1.0  # seconds between each download per worker
 USER_AGENT = "fosdem-video-downloader/1.0.0 (+https://github.com/gjed/fosdem-video-downloader)"
 
-# Retry strategy: back off on 429 (rate-limit) and server errors (500-503)
-_RETRY_STRATEGY = Retry(
-    total=3,
-    backoff_factor=2,  # 0s, 2s, 4s
-    status_forcelist=[429, 500, 502, 503],
-    allowed_methods=["GET"],
-    raise_on_status=False,
-)
+# A transfer averaging less than DEFAULT_MIN_RATE bytes/s over the last
+# DEFAULT_STALL_WINDOW seconds is aborted (its partial file is kept) and
+# the talk is requeued after DEFAULT_REQUEUE_DELAY * 2**n seconds, at most
+# DEFAULT_MAX_REQUEUES times.  ``timeout=30`` alone only bounds single
+# socket reads, so a trickling connection would otherwise hold a worker.
+DEFAULT_MIN_RATE = 32 * 1024
+DEFAULT_STALL_WINDOW: float = 60.0
+DEFAULT_MAX_REQUEUES = 3
+DEFAULT_REQUEUE_DELAY: float = 30.0
+
+# End-of-run retry rounds used by the CLI; the n-th comes after a pause of
+# DEFAULT_RETRY_DELAY * 2**n seconds.
+DEFAULT_RETRIES = 2
+DEFAULT_RETRY_DELAY: float = 60.0
+
+# Small enough that the watchdog gets to look at slow streams regularly.
+_CHUNK_SIZE = 256 * 1024
+
+# Threads of the stages around a transfer (see fosdem_video.pipeline)
+DEFAULT_SUBTITLE_WORKERS = 2
+DEFAULT_NFO_WORKERS = 1
+# Publishing mostly waits on the library's filesystem; a couple in flight
+# keep it busy without competing with Jellyfin for it.
+DEFAULT_MOVE_WORKERS = 2
+
+# How often the scheduler checks for a stop request while transfers run.
+_STOP_POLL_INTERVAL: float = 1.0
+
+
+class StalledTransferError(Exception):
+    """A transfer fell below the minimum rate; its partial file was kept."""
+
+
+class VideoNotFoundError(LookupError):
+    """No source has the video (every one answered 404)."""
+
+
+class DownloadInterruptedError(Exception):
+    """The run is stopping; the partial file was kept for a later resume."""
+
+
+class RunInterruptedError(Exception):
+    """A run was stopped by a signal or its deadline after saving its progress."""
+
+    def __init__(self, signum: int | None) -> None:
+        """Record which signal stopped the run (``None`` for the deadline)."""
+        self.signum = signum
+        super().__init__("max runtime" if signum is None else signal.Signals(signum).name)
+
+
+@contextlib.contextmanager
+def _graceful_stop(max_runtime: float | None = None) -> Iterator[threading.Event]:
+    """
+    Turn SIGINT/SIGTERM, or *max_runtime* seconds elapsing, into a graceful stop.
+
+    Yields an event that is set by the first signal or at the deadline;
+    the run is expected to stop scheduling work and let in-flight
+    transfers save their partial files.  A second signal aborts
+    immediately (:class:`KeyboardInterrupt`).  After a graceful stop,
+    leaving the block raises :class:`RunInterruptedError`.  Outside the
+    main thread, where handlers cannot be installed, only the deadline
+    applies.
+    """
+    stop = threading.Event()
+    reasons: list[int | None] = []
+
+    def handle(signum: int, _frame: FrameType | None) -> None:
+        if reasons:
+            raise KeyboardInterrupt
+        reasons.append(signum)
+        logger.warning(
+            "Received %s: saving partial downloads and stopping (repeat to abort)",
+            signal.Signals(signum).name,
+        )
+        stop.set()
+
+    def expire() -> None:
+        if not stop.is_set():
+            reasons.append(None)
+            logger.info("Reached the maximum runtime: saving partial downloads and stopping")
+            stop.set()
+
+    timer = threading.Timer(max_runtime, expire) if max_runtime is not None else None
+    previous = {}
+    if threading.current_thread() is threading.main_thread():
+        previous = {signum: signal.signal(signum, handle) for signum in (signal.SIGINT, signal.SIGTERM)}
+    if timer is not None:
+        timer.daemon = True
+        timer.start()
+    try:
+        yield stop
+    finally:
+        if timer is not None:
+            timer.cancel()
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+    if reasons:
+        raise RunInterruptedError(reasons[0])
+
+
+class TransferWatchdog:
+    """
+    Detect transfers slower than *min_rate* bytes/s over a sliding window.
+
+    Call :meth:`update` with the running byte count after every chunk; it
+    raises :class:`StalledTransferError` once a full *window* has elapsed
+    and the rate over the most recent *window* seconds is below *min_rate*.
+    """
+
+    def __init__(self, min_rate: float = DEFAULT_MIN_RATE, window: float = DEFAULT_STALL_WINDOW) -> None:
+        """Start watching now."""
+        self.min_rate = min_rate
+        self.window = window
+        self._started = time.monotonic()
+        self._excluded = 0.0
+        self._samples: deque[tuple[float, int]] = deque([(self._started, 0)])
+
+    def exclude(self, seconds: float) -> None:
+        """Leave *seconds* (e.g. spent throttled on purpose) out of the rate."""
+        self._excluded += seconds
+
+    def update(self, total: int) -> None:
+        """Record that *total* bytes have arrived so far."""
+        now = time.monotonic() - self._excluded
+        samples = self._samples
+        samples.append((now, total))
+        # Keep the newest sample that is at least a window old as the baseline
+        while len(samples) > 1 and samples[1][0] <= now - self.window:
+            samples.popleft()
+        if now - self._started < self.window:
+            return
+        since, baseline = samples[0]
+        rate = (total - baseline) / max(now - since, 1e-9)
+        if rate < self.min_rate:
+            msg = f"{rate / 1024:.1f} KiB/s over the last {now - since:.0f}s"
+            raise StalledTransferError(msg)
+
+
+def partial_path(output_path: Path) -> Path:
+    """Return the ``.part`` file a download is written to before completion."""
+    return output_path.with_name(f"{output_path.name}.part")
+
+
+def _resume_headers(output_path: Path) -> dict[str, str]:
+    """Return a ``Range`` header continuing an existing partial download."""
+    try:
+        offset = partial_path(output_path).stat().st_size
+    except FileNotFoundError:
+        return {}
+    return {"Range": f"bytes={offset}-"} if offset else {}
 
 
 def _build_session() -> requests.Session:
-    """Create a :class:`requests.Session` with retry and a polite User-Agent."""
+    """
+    Create a :class:`requests.Session` with retry and a polite User-Agent.
+
+    ``requests`` (and urllib3) are imported here rather than at module
+    level so that code paths which never touch the network — ``--help``,
+    argument validation, path planning — start without loading them.
+    """
+    import requests  # noqa: PLC0415
+    from requests.adapters import HTTPAdapter  # noqa: PLC0415
+    from urllib3.util.retry import Retry  # noqa: PLC0415
+
+    # Retry strategy: back off on 429 (rate-limit) and server errors (500-503)
+    retry_strategy = Retry(
+        total=3,
+        backoff_factor=2,  # 0s, 2s, 4s
+        status_forcelist=[429, 500, 502, 503],
+        allowed_methods=["GET"],
+        raise_on_status=False,
+    )
     session = requests.Session()
     session.headers["User-Agent"] = USER_AGENT
-    adapter = HTTPAdapter(max_retries=_RETRY_STRATEGY)
+    adapter = HTTPAdapter(max_retries=retry_strategy)
     session.mount("https://", adapter)
     session.mount("http://", adapter)
     return session
 
 
-def download_video(
+def _raise_if_stopped(stop: threading.Event | None, output_path: Path) -> None:
+    """Raise :class:`DownloadInterruptedError` if the run is stopping."""
+    if stop is not None and stop.is_set():
+        raise DownloadInterruptedError(output_path.name)
+
+
+def _check_resume(response: requests.Response, part: Path) -> None:
+    """Raise :class:`ValueError` unless a 206 continues exactly where *part* ends."""
+    offset = part.stat().st_size
+    content_range = response.headers.get("content-range", "")
+    if not content_range.startswith(f"bytes {offset}-"):
+        msg = f"unexpected Content-Range {content_range!r} resuming at {offset}"
+        raise ValueError(msg)
+    logger.info("Resuming %s at %d bytes", part.name, offset)
+
+
+def _save_response(  # noqa: PLR0913
+    response: requests.Response,
+    output_path: Path,
+    watchdog: TransferWatchdog | None = None,
+    stop: threading.Event | None = None,
+    limiter: RateLimiter | None = None,
+    *,
+    disk: WriteStats | None = None,
+    policy: WritePolicy | None = None,
+    finished: Path | None = None,
+) -> int:
+    """
+    Stream *response*'s body into *output_path* and return the bytes written.
+
+    Data goes to :func:`partial_path` first and is renamed into place (or
+    to *finished*, if given) when complete.  A ``206`` response is
+    appended to the existing partial file.  The socket is read into
+    reusable buffers that a :class:`WriteBehind` thread writes out, so a
+    slow disk does not stall the connection; its waits are added to
+    *disk*, and *policy* decides on preallocation and page-cache eviction.
+    A body larger than the free space left on the disk raises
+    :class:`InsufficientSpaceError` before anything is written.  Each
+    chunk is paced by *limiter*, whose waits the watchdog ignores.  If
+    *watchdog* reports a stall, or *stop* is set between chunks
+    (:class:`DownloadInterruptedError`), the partial file is flushed and
+    kept for a later resume; any other failure removes it.  Exceptions are
+    re-raised.
+    """
+    # Only transfers need these; keep them off the CLI's import path
+    from fosdem_video.volumes import InsufficientSpaceError, ensure_room  # noqa: PLC0415
+    from fosdem_video.writer import WriteBehind  # noqa: PLC0415
+
+    total_size = int(response.headers.get("content-length", 0))
+    logger.debug("%s is %d MB", output_path.name, total_size)
+
+    part = partial_path(output_path)
+    written = 0
+    try:
+        if response.status_code == HTTP_PARTIAL_CONTENT:
+            _check_resume(response, part)
+        ensure_room(part, total_size)
+        # Read straight from urllib3, as iter_content would, minus the
+        # per-chunk allocation; it still decodes any content encoding
+        response.raw.decode_content = True
+        with (
+            part.open("ab" if response.status_code == HTTP_PARTIAL_CONTENT else "wb") as f,
+            WriteBehind(f, chunk_size=_CHUNK_SIZE, stats=disk, policy=policy, size_hint=total_size) as writer,
+        ):
+            while chunk := writer.fill(response.raw.readinto):
+                written += chunk
+                waited = limiter.consume(chunk, stop) if limiter is not None else 0.0
+                if watchdog is not None:
+                    watchdog.exclude(waited)
+                    watchdog.update(written)
+                _raise_if_stopped(stop, output_path)
+        part.replace(finished or output_path)
+    except StalledTransferError as exc:
+        logger.warning("Transfer of %s stalled (%s); keeping partial file", output_path.name, exc)
+        raise
+    except DownloadInterruptedError:
+        logger.info("Interrupted %s; keeping partial file", output_path.name)
+        raise
+    except InsufficientSpaceError:
+        raise
+    except Exception:
+        # If something happened mid download we should remove the incomplete file
+        part.unlink(missing_ok=True)
+        raise
+    finally:
+        response.close()
+    return written
+
+
+def _fetch_video(
+    url: str,
+    output_path: Path,
+    session: requests.Session,
+    *,
+    missing_ok: bool = False,
+    watchdog: TransferWatchdog | None = None,
+) -> int | None:
+    """
+    Stream *url* into *output_path* and return the number of bytes written.
+
+    Returns ``None`` on a 404 and raises on any other failure (see
+    :func:`_save_response` for what happens to the partial file).
+    """
+    response = session.get(url, headers=_resume_headers(output_path), stream=True, timeout=30)
+    if response.status_code == HTTP_NOT_FOUND:
+        logger.log(logging.DEBUG if missing_ok else logging.WARNING, "Video not found (404): %s", url)
+        return None
+    if response.status_code not in (HTTP_OK, HTTP_PARTIAL_CONTENT):
+        response.raise_for_status()
+    return _save_response(response, output_path, watchdog)
+
+
+def download_video(  # noqa: PLR0913
     url: str,
     output_path: Path,
     session: requests.Session | None = None,
+    *,
+    missing_ok: bool = False,
+    min_rate: float = DEFAULT_MIN_RATE,
+    stall_window: float = DEFAULT_STALL_WINDOW,
 ) -> bool:
-    """Download a video from a URL to the specified output path."""
+    """
+    Download a video from a URL to the specified output path.
+
+    With *missing_ok* a 404 is expected (e.g. a mirror that does not have
+    the file yet) and only logged at debug level.  A transfer slower than
+    *min_rate* bytes/s over *stall_window* seconds is abandoned, keeping
+    its partial file so the next attempt resumes (``min_rate=0`` disables
+    the check).
+    """
     _session = session or _build_session()
     try:
         logger.info("Starting download: %s", output_path.name)
-        response = _session.get(url, stream=True, timeout=30)
-        if response.status_code == HTTP_NOT_FOUND:
-            logger.warning("Video not found (404): %s", url)
+        watchdog = TransferWatchdog(min_rate, stall_window) if min_rate > 0 else None
+        if _fetch_video(url, output_path, _session, missing_ok=missing_ok, watchdog=watchdog) is None:
             return False
-        if response.status_code != HTTP_OK:
-            response.raise_for_status()
-
-        total_size = int(response.headers.get("content-length", 0))
-        logger.debug("%s is %d MB", output_path.name, total_size)
-        block_size = 1024 * 1024  # 1MB chunks
-
-        with output_path.open("wb") as f:
-            f.writelines(response.iter_content(block_size))
-
         logger.info("Downloaded %s", output_path.name)
     except Exception:
         logger.exception("Failed to download %s", url)
-        with contextlib.suppress(FileNotFoundError):
-            # If something happened mid download we should remove the incomplete file
-            output_path.unlink()
         return False
 
     return True
 
 
-def download_vtt(
+def _usable_response(
+    url: str,
+    source: Source,
+    source_url: str,
+    future: Future[requests.Response],
+    sources: SourcePool,
+) -> requests.Response | None:
+    """
+    Return the response of a finished request if it is a 200.
+
+    Anything else is closed and logged; errors (but not a 404) also take
+    the source out of rotation.
+    """
+    try:
+        response = future.result()
+    except Exception:
+        logger.exception("Failed to download %s", source_url)
+        sources.record_failure(source)
+        return None
+    if response.status_code in (HTTP_OK, HTTP_PARTIAL_CONTENT):
+        return response
+    response.close()
+    if response.status_code == HTTP_NOT_FOUND:
+        level = logging.DEBUG if source_url != url else logging.WARNING
+        logger.log(level, "Video not found (404): %s", source_url)
+    else:
+        logger.error("Failed to download %s: HTTP %d", source_url, response.status_code)
+        sources.record_failure(source)
+    return None
+
+
+def _is_not_found(future: Future[requests.Response]) -> bool:
+    """Return whether a finished request answered 404."""
+    return future.exception() is None and future.result().status_code == HTTP_NOT_FOUND
+
+
+def _abandon(
+    losers: list[Future[requests.Response]],
+    sources: SourcePool,
+    *,
+    hedge_won: bool,
+) -> None:
+    """
+    Close the responses of requests that lost a hedged race when they answer.
+
+    If the duplicate won, the time until the original finally answers is
+    counted as first-byte latency saved.
+    """
+    won_at = time.monotonic()
+    if hedge_won:
+        sources.record_hedge_won()
+
+    def discard(future: Future[requests.Response]) -> None:
+        with contextlib.suppress(Exception):
+            future.result().close()
+            if hedge_won:
+                sources.record_hedge_saved(time.monotonic() - won_at)
+
+    for loser in losers:
+        loser.add_done_callback(discard)
+
+
+def _open_stream(  # noqa: PLR0913
+    url: str,
+    routes: deque[tuple[Source, str]],
+    sources: SourcePool,
+    session: requests.Session,
+    headers: dict[str, str] | None = None,
+    *,
+    missing: list[str] | None = None,
+    request_pool: ThreadPoolExecutor | None = None,
+) -> tuple[Source, requests.Response, float] | None:
+    """
+    Return ``(source, response, started)`` for the first source answering 200.
+
+    Routes are consumed from the left: a 404 or an error moves on to the
+    next one, and URLs that answered 404 are appended to *missing*.  While
+    a single request is in flight and its first byte is later than
+    :meth:`SourcePool.hedge_delay`, a duplicate is sent to the next route
+    and whichever answers first wins; the loser's response is closed when
+    it arrives.  Requests run on *request_pool*, or on a pool of their own.
+    """
+    executor = request_pool or ThreadPoolExecutor(max_workers=2, thread_name_prefix="request")
+    pending: dict[Future[requests.Response], tuple[Source, str, float, bool]] = {}
+
+    def launch(*, hedge: bool = False) -> None:
+        source, source_url = routes.popleft()
+        started = time.monotonic()
+        future = executor.submit(session.get, source_url, headers=headers, stream=True, timeout=30)
+        # Every answer (losers included) feeds the first-byte percentile
+        future.add_done_callback(
+            lambda f: f.exception() is None and sources.record_ttfb(time.monotonic() - started)
+        )
+        pending[future] = (source, source_url, started, hedge)
+
+    try:
+        launch()
+        while pending:
+            delay = sources.hedge_delay() if len(pending) == 1 and routes else None
+            done, _ = wait(pending, timeout=delay, return_when=FIRST_COMPLETED)
+            if not done:
+                logger.debug("First byte of %s later than %.2fs, hedging", url, delay)
+                sources.record_hedge_fired()
+                launch(hedge=True)
+                continue
+            for future in done:
+                source, source_url, started, hedge = pending.pop(future)
+                response = _usable_response(url, source, source_url, future, sources)
+                if response is None:
+                    if missing is not None and _is_not_found(future):
+                        missing.append(source_url)
+                    continue
+                _abandon(list(pending), sources, hedge_won=hedge)
+                pending.clear()
+                return source, response, started
+            if not pending and routes:
+                launch()
+        return None
+    finally:
+        # Requests still in flight after an error are losers too.  Never
+        # wait for one: its callback cleans up when it answers
+        _abandon(list(pending), sources, hedge_won=False)
+        if request_pool is None:
+            executor.shutdown(wait=False)
+
+
+def download_from_sources(  # noqa: PLR0913
+    url: str,
+    output_path: Path,
+    sources: SourcePool,
+    session: requests.Session | None = None,
+    *,
+    min_rate: float = DEFAULT_MIN_RATE,
+    stall_window: float = DEFAULT_STALL_WINDOW,
+    stop: threading.Event | None = None,
+    limiter: RateLimiter | None = None,
+    disk: WriteStats | None = None,
+    policy: WritePolicy | None = None,
+    finished: Path | None = None,
+    request_pool: ThreadPoolExecutor | None = None,
+) -> bool:
+    """
+    Download the video at upstream *url* from the best available source.
+
+    Sources are tried in :meth:`SourcePool.routes` order.  A 404 moves on
+    to the next source; an error also takes the failing source out of
+    rotation for a while.  A stalled first byte is hedged against the next
+    source (see :func:`_open_stream`).  Completed transfers update the
+    source's throughput estimate.
+
+    A transfer slower than *min_rate* bytes/s over *stall_window* seconds
+    benches its source and raises :class:`StalledTransferError`, leaving
+    the partial file for the caller to resume later.  If every source
+    answers 404, :class:`VideoNotFoundError` is raised instead of
+    returning ``False``, so callers can tell "not published" from
+    "failed"; a video too large for the disk returns ``False`` at once.
+    Once *stop* is set, :class:`DownloadInterruptedError` is
+    raised before any new request or after the chunk being written.
+    *limiter* paces the transfer to a shared bandwidth limit, *disk*
+    collects how the transfer waited on the disk and *policy* sets how the
+    file is written (see :class:`WritePolicy`).  A complete download is
+    renamed to *finished* instead of *output_path*, if given.  The
+    requests run on *request_pool*, if given, rather than on a pool
+    created for this download.
+    """
+    from fosdem_video.volumes import InsufficientSpaceError  # noqa: PLC0415
+
+    _session = session or _build_session()
+    logger.info("Starting download: %s", output_path.name)
+    routes = deque(sources.routes(url))
+    total = len(routes)
+    missing: list[str] = []
+    while routes:
+        _raise_if_stopped(stop, output_path)
+        opened = _open_stream(
+            url,
+            routes,
+            sources,
+            _session,
+            _resume_headers(output_path),
+            missing=missing,
+            request_pool=request_pool,
+        )
+        if opened is None:
+            break
+        source, response, started = opened
+        watchdog = TransferWatchdog(min_rate, stall_window) if min_rate > 0 else None
+        try:
+            written = _save_response(
+                response, output_path, watchdog, stop, limiter, disk=disk, policy=policy, finished=finished
+            )
+        except DownloadInterruptedError:
+            raise
+        except StalledTransferError:
+            sources.record_failure(source)
+            raise
+        except InsufficientSpaceError as exc:
+            # No source can help with that
+            logger.error("Not downloading %s: %s", output_path.name, exc.strerror)  # noqa: TRY400 - no traceback needed
+            return False
+        except Exception:
+            logger.exception("Failed to download %s", response.url)
+            sources.record_failure(source)
+            continue
+        sources.record_success(source, written, time.monotonic() - started)
+        logger.info("Downloaded %s from %s", output_path.name, source.base)
+        return True
+    if len(missing) == total:
+        raise VideoNotFoundError(url)
+    return False
+
+
+def download_vtt(  # noqa: PLR0913
     video_url: str,
     output_path: Path,
     session: requests.Session | None = None,
+    *,
+    missing_ok: bool = False,
+    limiter: RateLimiter | None = None,
+    missing: list[str] | None = None,
 ) -> bool:
     """
     Download a VTT subtitle file corresponding to a video URL.
 
-    Replaces the video extension with .vtt. Logs a warning and returns False
-    if the subtitle is not found (404).
+    Replaces the video extension with .vtt. Logs a warning (debug level
+    with *missing_ok*) and returns False if the subtitle is not found (404);
+    the URL is then appended to *missing*, if given.  The body is paced by
+    *limiter*, if given, and written under a temporary name that is renamed
+    into place once complete.
     """
     _session = session or _build_session()
     # Strip the format extension and replace with .vtt
     vtt_url = re.sub(r"\.(mp4|av1\.webm)$", ".vtt", video_url)
     vtt_path = output_path.with_suffix(".vtt")
+    tmp = temporary_sibling(vtt_path)
     try:
         logger.debug("Downloading subtitle: %s", vtt_url)
         response = _session.get(vtt_url, stream=True, timeout=30)
         if response.status_code == HTTP_NOT_FOUND:
-            logger.warning("Subtitle not found (404): %s", vtt_url)
+            logger.log(
+                logging.DEBUG if missing_ok else logging.WARNING, "Subtitle not found (404): %s", vtt_url
+            )
+            if missing is not None:
+                missing.append(vtt_url)
             return False
         if response.status_code != HTTP_OK:
             response.raise_for_status()
-        with vtt_path.open("wb") as f:
-            f.writelines(response.iter_content(1024 * 1024))
+        with tmp.open("wb") as f:
+            for chunk in response.iter_content(1024 * 1024):
+                f.write(chunk)
+                if limiter is not None:
+                    limiter.consume(len(chunk))
+        tmp.replace(vtt_path)
         logger.debug("Downloaded subtitle %s", vtt_path.name)
     except Exception:
         logger.exception("Failed to download subtitle %s", vtt_url)
-        with contextlib.suppress(FileNotFoundError):
-            vtt_path.unlink()
+        tmp.unlink(missing_ok=True)
         return False
     return True
 
@@ -147,7 +658,7 @@ def get_output_path(
 
     """
     if jellyfin:
-        ep_info = (episode_index or {}).get(talk.id)
+        ep_info = lookup_episode(episode_index, talk)
         if ep_info:
             season_num, ep_num = ep_info
             season_folder = sanitise_path_component(talk.track)
@@ -185,12 +696,43 @@ def is_downloaded(
     return False
 
 
+def plan_volumes(  # noqa: PLR0913
+    talks: list[Talk],
+    roots: list[Path],
+    fmt: str,
+    sizes: dict[str, int],
+    *,
+    jellyfin: bool = False,
+    episode_index: dict[str, tuple[int, int]] | None = None,
+    policy: str | None = None,
+) -> dict[str, Path]:
+    """
+    Choose which of the library *roots* each talk is downloaded to.
+
+    Returns the root of each talk by ``talk.url``; *sizes* holds the known
+    video sizes under the same keys.  Seasons are the track folders of the
+    Jellyfin layout and the year folders otherwise; *policy* is one of
+    :data:`~fosdem_video.volumes.PLACEMENTS` (default ``season``).  Raises
+    :class:`InsufficientSpaceError` if the talks do not fit (see
+    :func:`~fosdem_video.volumes.plan_placement`).
+    """
+    from fosdem_video.volumes import DEFAULT_PLACEMENT, PlannedFile, plan_placement  # noqa: PLC0415
+
+    files = []
+    for talk in talks:
+        path = get_output_path(Path(), talk, fmt, jellyfin=jellyfin, episode_index=episode_index)
+        season = path.parent.parent if jellyfin else path.parent
+        files.append(PlannedFile(talk.url, path, season, sizes.get(talk.url, 0)))
+    return plan_placement(files, roots, policy=policy or DEFAULT_PLACEMENT)
+
+
 def create_dirs(
     output_dir: Path,
     talks: list[Talk],
     *,
     jellyfin: bool = False,
     episode_index: dict[str, tuple[int, int]] | None = None,
+    metadata_workers: int = DEFAULT_METADATA_WORKERS,
 ) -> None:
     """
     Create output directories for each talk.
@@ -199,45 +741,52 @@ def create_dirs(
     also writes ``tvshow.nfo`` in the show root and ``season.nfo`` in each
     track directory so that Jellyfin recognises the folder hierarchy as a
     TV series.
+
+    Directory creation is batched and the NFO/image writes are fanned out
+    over a :class:`MetadataWriter` pool of *metadata_workers* threads.
     """
     has_metadata = jellyfin and any(t.title for t in talks)
     show_dir_written: set[str] = set()
     season_dirs_written: set[str] = set()
 
-    for talk in talks:
-        folder = get_output_path(
+    folders = [
+        get_output_path(
             output_dir,
             talk,
             "mp4",
             jellyfin=jellyfin,
             episode_index=episode_index,
         ).parent
-        folder.mkdir(parents=True, exist_ok=True)
+        for talk in talks
+    ]
+
+    with MetadataWriter(metadata_workers) as writer:
+        writer.make_dirs(folders)
 
         if not has_metadata:
-            continue
+            return
 
-        # Write tvshow.nfo once per show root
-        show_dir = folder.parent.parent  # …/Fosdem (<year>)/
-        show_key = str(show_dir)
-        if show_key not in show_dir_written:
-            write_tvshow_nfo(show_dir, talk.year)
-            assets_dir = get_assets_dir()
-            copy_show_images(assets_dir, show_dir, talk.year)
-            show_dir_written.add(show_key)
-
-        # Write season.nfo once per track directory — use the season
-        # number from the episode_index (derived from the full schedule)
-        # so it remains correct even when downloading a subset of tracks.
-        season_dir = folder.parent  # …/Fosdem (<year>)/<track>/
-        season_key = str(season_dir)
-        if season_key not in season_dirs_written and talk.track:
-            ep_info = (episode_index or {}).get(talk.id)
-            season_num = ep_info[0] if ep_info else 0
-            write_season_nfo(season_dir, talk.year, talk.track, season_num)
-            assets_dir = get_assets_dir()
-            copy_season_images(assets_dir, season_dir, talk.year, talk.track)
-            season_dirs_written.add(season_key)
+        assets_dir = get_assets_dir()
+        for talk, folder in zip(talks, folders, strict=True):
+            # Write tvshow.nfo once per show root
+            show_dir = folder.parent.parent  # …/Fosdem (<year>)/
+            show_key = str(show_dir)
+            if show_key not in show_dir_written:
+                writer.submit(write_tvshow_nfo, show_dir, talk.year)
+                writer.submit(copy_show_images, assets_dir, show_dir, talk.year)
+                show_dir_written.add(show_key)
+
+            # Write season.nfo once per track directory — use the season
+            # number from the episode_index (derived from the full schedule)
+            # so it remains correct even when downloading a subset of tracks.
+            season_dir = folder.parent  # …/Fosdem (<year>)/<track>/
+            season_key = str(season_dir)
+            if season_key not in season_dirs_written and talk.track:
+                ep_info = lookup_episode(episode_index, talk)
+                season_num = ep_info[0] if ep_info else 0
+                writer.submit(write_season_nfo, season_dir, talk.year, talk.track, season_num)
+                writer.submit(copy_season_images, assets_dir, season_dir, talk.year, talk.track)
+                season_dirs_written.add(season_key)
 
 
 def _build_track_season_map(talks: list[Talk]) -> dict[str, int]:
@@ -255,6 +804,31 @@ def _build_track_season_map(talks: list[Talk]) -> dict[str, int]:
     return {name: i for i, name in enumerate(sorted(track_names), start=1)}
 
 
+def episode_key(year: str, talk_id: str) -> str:
+    """
+    Return the year-qualified episode index key for a talk.
+
+    Slugs are only unique within one edition, so indexes that span
+    several years key their entries by ``<year>/<slug>``.
+    """
+    return f"{year}/{talk_id}"
+
+
+def lookup_episode(
+    episode_index: dict[str, tuple[int, int]] | None,
+    talk: Talk,
+) -> tuple[int, int] | None:
+    """
+    Return ``(season_number, episode_number)`` for *talk*, if indexed.
+
+    Checks the year-qualified key first (multi-year indexes), then the
+    bare slug (single-year indexes).
+    """
+    if not episode_index:
+        return None
+    return episode_index.get(episode_key(talk.year, talk.id)) or episode_index.get(talk.id)
+
+
 def _build_episode_index(
     talks: list[Talk],
 ) -> dict[str, tuple[int, int]]:
@@ -265,8 +839,18 @@ def _build_episode_index(
     Within each track, talks are sorted by ``(date, start)`` and assigned
     a 1-based episode number reflecting their schedule order.
 
-    Returns a dict keyed by ``talk.id``.
+    Returns a dict keyed by ``talk.id``.  When *talks* span several years
+    each year is numbered independently and keys are qualified with
+    :func:`episode_key`; use :func:`lookup_episode` to read either form.
     """
+    years = sorted({talk.year for talk in talks})
+    if len(years) > 1:
+        merged: dict[str, tuple[int, int]] = {}
+        for year in years:
+            year_index = _build_episode_index([t for t in talks if t.year == year])
+            merged.update({episode_key(year, k): v for k, v in year_index.items()})
+        return merged
+
     by_track: dict[str, list[Talk]] = defaultdict(list)
     for talk in talks:
         if talk.track:
@@ -290,6 +874,7 @@ def regenerate_nfos(
     fmt: str = "mp4",
     *,
     episode_index: dict[str, tuple[int, int]] | None = None,
+    metadata_workers: int = DEFAULT_METADATA_WORKERS,
 ) -> int:
     """
     Regenerate all NFO sidecar files for existing videos.
@@ -297,13 +882,30 @@ def regenerate_nfos(
     Writes ``tvshow.nfo``, ``season.nfo`` for every track, and per-episode
     NFOs for each talk whose video file already exists on disk.  Returns the
     number of episode NFOs written.
+
+    Like :func:`create_dirs`, the writes are fanned out over a
+    :class:`MetadataWriter` pool of *metadata_workers* threads.
     """
     if episode_index is None:
         episode_index = _build_episode_index(talks)
+    index = episode_index
 
-    show_dir_written: set[str] = set()
-    season_dirs_written: set[str] = set()
-    count = 0
+    def write_if_downloaded(talk: Talk, file_path: Path) -> bool:
+        # Write episode NFO only when the video file exists
+        if not file_path.exists():
+            return False
+        season_num, ep_num = lookup_episode(index, talk) or (0, 0)
+        write_episode_nfo(
+            talk,
+            file_path,
+            season_number=season_num,
+            episode_number=ep_num,
+        )
+        return True
+
+    show_dirs: dict[str, tuple[Path, Talk]] = {}
+    season_dirs: dict[str, tuple[Path, Talk]] = {}
+    episodes: list[tuple[Talk, Path]] = []
 
     for talk in talks:
         if not talk.title:
@@ -314,47 +916,155 @@ def regenerate_nfos(
             talk,
             fmt,
             jellyfin=True,
-            episode_index=episode_index,
+            episode_index=index,
         )
+        episodes.append((talk, file_path))
 
         # Write tvshow.nfo once per show root
         show_dir = file_path.parent.parent.parent
-        show_key = str(show_dir)
-        if show_key not in show_dir_written:
-            show_dir.mkdir(parents=True, exist_ok=True)
-            write_tvshow_nfo(show_dir, talk.year)
-            assets_dir = get_assets_dir()
-            copy_show_images(assets_dir, show_dir, talk.year)
-            show_dir_written.add(show_key)
-
-        # Write season.nfo once per track directory — use the season
-        # number from the episode_index (derived from the full schedule).
-        season_dir = file_path.parent.parent
-        season_key = str(season_dir)
-        if season_key not in season_dirs_written and talk.track:
-            season_dir.mkdir(parents=True, exist_ok=True)
-            ep_info = episode_index.get(talk.id)
+        show_dirs.setdefault(str(show_dir), (show_dir, talk))
+
+        # Write season.nfo once per track directory
+        if talk.track:
+            season_dir = file_path.parent.parent
+            season_dirs.setdefault(str(season_dir), (season_dir, talk))
+
+    with MetadataWriter(metadata_workers) as writer:
+        writer.make_dirs(
+            [path for path, _ in show_dirs.values()] + [path for path, _ in season_dirs.values()],
+        )
+
+        assets_dir = get_assets_dir()
+        for show_dir, talk in show_dirs.values():
+            writer.submit(write_tvshow_nfo, show_dir, talk.year)
+            writer.submit(copy_show_images, assets_dir, show_dir, talk.year)
+
+        # Use the season number from the episode_index (derived from the
+        # full schedule) so it stays correct for filtered runs.
+        for season_dir, talk in season_dirs.values():
+            ep_info = lookup_episode(index, talk)
             season_num = ep_info[0] if ep_info else 0
-            write_season_nfo(season_dir, talk.year, talk.track, season_num)
-            assets_dir = get_assets_dir()
-            copy_season_images(assets_dir, season_dir, talk.year, talk.track)
-            season_dirs_written.add(season_key)
+            writer.submit(write_season_nfo, season_dir, talk.year, talk.track, season_num)
+            writer.submit(copy_season_images, assets_dir, season_dir, talk.year, talk.track)
 
-        # Write episode NFO only when the video file exists
-        if file_path.exists():
-            season_num, ep_num = episode_index.get(talk.id, (0, 0))
-            write_episode_nfo(
-                talk,
-                file_path,
-                season_number=season_num,
-                episode_number=ep_num,
-            )
-            count += 1
+        episode_results = [
+            writer.submit(write_if_downloaded, talk, file_path) for talk, file_path in episodes
+        ]
+        count = sum(1 for future in episode_results if future.result())
 
     logger.info("Regenerated %d episode NFOs", count)
     return count
 
 
+def backfill_subtitles(  # noqa: PLR0913
+    talks: list[Talk],
+    output_dir: Path,
+    fmt: str = "mp4",
+    *,
+    jellyfin: bool = False,
+    episode_index: dict[str, tuple[int, int]] | None = None,
+    sources: SourcePool | None = None,
+    workers: int = DEFAULT_SUBTITLE_WORKERS,
+    bandwidth: BandwidthSchedule | None = None,
+    cache: FailureLedger | None = None,
+    dry_run: bool = False,
+) -> int:
+    """
+    Fetch subtitles published after their videos were downloaded.
+
+    The output tree is scanned once for videos of *talks* with no ``.vtt``
+    next to them; their subtitles are fetched by *workers* threads sharing
+    the *bandwidth* limits.  A talk that every source answers with 404 is
+    recorded in *cache* and not asked for again until its cooldown ends,
+    which keeps daily runs cheap.  Returns the number of subtitles fetched.
+    With *dry_run* the subtitles due are only logged: nothing is fetched
+    and *cache* is left alone.
+    """
+    if episode_index is None:
+        episode_index = _build_episode_index(talks) if jellyfin else {}
+    wanted = _videos_without_subtitles(talks, output_dir, fmt, jellyfin=jellyfin, episode_index=episode_index)
+    due = [talk for talk, _ in wanted.values()]
+    if cache is not None:
+        due = cache.schedule(due)
+    logger.info("Found %d videos without subtitles to check", len(due))
+    if dry_run:
+        for talk in due:
+            logger.info("Would fetch subtitles for %s", talk.url)
+        return 0
+
+    from fosdem_video.bandwidth import RateLimiter  # noqa: PLC0415
+    from fosdem_video.pipeline import Stage  # noqa: PLC0415
+    from fosdem_video.sources import SourcePool  # noqa: PLC0415
+
+    session = _build_session()
+    pool = sources or SourcePool()
+    limiter = RateLimiter(bandwidth) if bandwidth is not None else None
+    fetched: list[Talk] = []
+
+    def fetch(talk: Talk) -> None:
+        found = _backfill_vtt(talk, wanted[id(talk)][1], pool, session, limiter)
+        if found is not None and cache is not None:
+            cache.record(talk, success=found)
+        if found:
+            fetched.append(talk)
+
+    with Stage("backfill", fetch, workers=workers) as lane:
+        for talk in due:
+            lane.put(talk)
+    if cache is not None:
+        cache.save()
+    logger.info("Backfilled %d of %d missing subtitles", len(fetched), len(due))
+    return len(fetched)
+
+
+def _videos_without_subtitles(
+    talks: list[Talk],
+    output_dir: Path,
+    fmt: str,
+    *,
+    jellyfin: bool,
+    episode_index: dict[str, tuple[int, int]],
+) -> dict[int, tuple[Talk, Path]]:
+    """Return ``(talk, video path)`` by ``id`` for the downloaded *talks* lacking a ``.vtt``."""
+    files = _library_files(output_dir)
+    wanted: dict[int, tuple[Talk, Path]] = {}
+    for talk in talks:
+        path = get_output_path(output_dir, talk, fmt, jellyfin=jellyfin, episode_index=episode_index)
+        if path in files and path.with_suffix(".vtt") not in files:
+            wanted[id(talk)] = (talk, path)
+    return wanted
+
+
+def _library_files(output_dir: Path) -> set[Path]:
+    """Return every file under *output_dir*, in a single walk of the tree."""
+    return {Path(root) / name for root, _, names in os.walk(output_dir) for name in names}
+
+
+def _backfill_vtt(
+    talk: Talk,
+    file_path: Path,
+    pool: SourcePool,
+    session: requests.Session,
+    limiter: RateLimiter | None,
+) -> bool | None:
+    """
+    Fetch *talk*'s subtitles from the first source that has them.
+
+    Returns ``False`` if every source answered 404, and ``None`` if any
+    failed otherwise (so the talk is not cached as missing).
+    """
+    routes = pool.routes(talk.url)
+    missing: list[str] = []
+    if any(
+        download_vtt(url, file_path, session=session, missing_ok=True, limiter=limiter, missing=missing)
+        for _, url in routes
+    ):
+        return True
+    if len(missing) < len(routes):
+        return None
+    return False
+
+
 def download_fosdem_videos(  # noqa: PLR0913
     talks: list[Talk],
     output_dir: Path,
@@ -365,41 +1075,525 @@ def download_fosdem_videos(  # noqa: PLR0913
     no_vtt: bool = False,
     jellyfin: bool = False,
     episode_index: dict[str, tuple[int, int]] | None = None,
+    leases: LeaseQueue | None = None,
+    sources: SourcePool | None = None,
+    min_rate: float = DEFAULT_MIN_RATE,
+    stall_window: float = DEFAULT_STALL_WINDOW,
+    max_requeues: int = DEFAULT_MAX_REQUEUES,
+    requeue_delay: float = DEFAULT_REQUEUE_DELAY,
+    retries: int = 0,
+    retry_delay: float = DEFAULT_RETRY_DELAY,
+    ledger: FailureLedger | None = None,
+    journal: RunJournal | None = None,
+    bandwidth: BandwidthSchedule | None = None,
+    max_runtime: float | None = None,
+    subtitle_workers: int = DEFAULT_SUBTITLE_WORKERS,
+    nfo_workers: int = DEFAULT_NFO_WORKERS,
+    write_policy: WritePolicy | None = None,
+    staging_dir: Path | None = None,
+    move_workers: int = DEFAULT_MOVE_WORKERS,
+    publish_order: str | None = None,
+    roots: dict[str, Path] | None = None,
+    volumes: list[Path] | None = None,
 ) -> list[bool]:
     """
     Download FOSDEM videos (and optionally subtitles) concurrently.
 
     A *delay* (in seconds) is inserted after each download to avoid
     hammering the FOSDEM video server — which is run by volunteers.
+
+    With *leases*, each talk is claimed before it is fetched, and held
+    until it is published, so several processes sharing *output_dir* never
+    download the same talk; talks held by another process are skipped
+    (reported as ``False``).
+
+    *sources* routes each download to the best healthy mirror (e.g. another
+    node running ``fosdem-video --serve``), failing over to the others and
+    to ``video.fosdem.org``; by default everything comes from upstream.
+
+    A transfer slower than *min_rate* bytes/s over *stall_window* seconds
+    is aborted and its talk put back on the queue, to resume from the
+    partial file after an exponential backoff starting at
+    *requeue_delay* seconds; after *max_requeues* stalls it counts as
+    failed.
+
+    Failed talks can be retried at the end of the run, up to *retries* more
+    rounds with exponentially growing pauses starting at *retry_delay*
+    seconds; talks that no source has (404 everywhere) are not retried.
+    The final outcome of every attempted talk is recorded in *ledger*, if
+    given, so the next run can pick up where this one failed.
+
+    Each talk's progress (``started``, then ``done``, ``failed`` or
+    ``missing``) is appended to *journal* as it happens.  SIGINT or
+    SIGTERM stops scheduling new talks, lets in-flight transfers flush
+    their partial files, saves the ledger and raises
+    :class:`RunInterruptedError`; talks that had not finished are neither
+    retried nor recorded in the ledger.
+
+    Video transfers share the time-of-day limits of *bandwidth*.  After
+    *max_runtime* seconds the run stops the same way as on a signal, so a
+    later run (or ``--resume-run``) continues from the partial files.
+
+    The *num_workers* download slots only transfer videos.  Subtitles are
+    fetched by *subtitle_workers* separate threads while the video is
+    transferring, and episode NFOs are written afterwards by *nfo_workers*
+    threads (see :mod:`fosdem_video.pipeline`); a talk is ``done`` once
+    both are handled, and all stages are drained before this returns.
+
+    *write_policy* can preallocate each video and keep finished regions
+    out of the page cache (see :mod:`fosdem_video.diskio`).
+
+    Each talk's video, subtitles and NFO are completed under hidden
+    names, then published together by *move_workers* threads with atomic
+    renames in *publish_order* (by default the video last) and one
+    directory sync (see :mod:`fosdem_video.staging`).  With *staging_dir*
+    they are completed there and publishing moves them into *output_dir*.
+    A talk only counts as downloaded once it is published.
+
+    *roots* maps ``talk.url`` to the library root the talk goes to when the
+    library spans several volumes (see :func:`plan_volumes`); other talks
+    go to *output_dir*.  With *leases*, a talk another process has finished
+    on any of the *volumes* (by default *output_dir* and the roots in
+    *roots*) since the run was planned is not fetched again.
     """
     if episode_index is None:
         episode_index = _build_episode_index(talks) if jellyfin else {}
 
+    # Loaded here rather than at module level to keep the CLI's startup light
+    from fosdem_video.bandwidth import RateLimiter  # noqa: PLC0415
+    from fosdem_video.sources import SourcePool  # noqa: PLC0415
+    from fosdem_video.staging import DEFAULT_PUBLISH_ORDER, pending_path, staging_path  # noqa: PLC0415
+    from fosdem_video.writer import WriteStats  # noqa: PLC0415
+
     session = _build_session()
+    pool = sources or SourcePool()
+    limiter = RateLimiter(bandwidth) if bandwidth is not None else None
+    disk = WriteStats()
+    # Talks left to another process, and talks no source has (yet): neither
+    # is worth retrying within this run
+    skipped: set[int] = set()
+    missing: set[int] = set()
+    libraries = volumes or list(dict.fromkeys([output_dir, *(roots or {}).values()]))
+    # Talks in the library by the time the stages are drained
+    published: set[int] = set()
 
     def process_video(talk: Talk) -> bool:
-        file_path = get_output_path(
-            output_dir,
+        root = roots.get(talk.url, output_dir) if roots else output_dir
+        target = get_output_path(
+            root,
             talk,
             fmt,
             jellyfin=jellyfin,
             episode_index=episode_index,
         )
-        success = download_video(talk.url, file_path, session=session)
-        if success and not no_vtt:
-            download_vtt(talk.url, file_path, session=session)
-        if success and jellyfin and talk.title:
-            season_num, ep_num = episode_index.get(talk.id, (0, 0))
-            write_episode_nfo(
+        if leases is not None and not leases.claim(talk):
+            logger.info("Skipping %s: claimed by another process", talk.id)
+            skipped.add(id(talk))
+            return False
+        if leases is not None and any((library / target.relative_to(root)).exists() for library in libraries):
+            # Finished by another process since this run was planned
+            leases.release(talk)
+            published.add(id(talk))
+            return True
+        file_path = staging_path(target, root, staging_dir)
+        pending = pending_path(file_path)
+        subtitles = fetch_subtitles(talk, pending)
+        success = False
+        try:
+            success = _transfer_talk(
                 talk,
                 file_path,
-                season_number=season_num,
-                episode_number=ep_num,
+                pool,
+                session,
+                min_rate=min_rate,
+                stall_window=stall_window,
+                stop=stop,
+                limiter=limiter,
+                journal=journal,
+                missing=missing,
+                disk=disk,
+                policy=write_policy,
+                pending=pending,
+                request_pool=request_pool,
+            )
+        finally:
+            # A transferred talk keeps its lease until it is published
+            if leases is not None and not success:
+                leases.release(talk)
+            # Metadata follows once both the video and its subtitles are in;
+            # subtitles of a video that did not arrive are dropped
+            subtitles.add_done_callback(
+                lambda _done: (
+                    post((talk, pending, target)) if success else _discard_orphan_vtt(file_path, pending)
+                )
             )
         # Be polite: pause between downloads to avoid overloading the server
         if delay > 0:
             time.sleep(delay)
         return success
 
+    def run(batch: list[Talk]) -> list[bool | None]:
+        return _run_with_requeue(
+            batch,
+            process_video,
+            num_workers,
+            max_requeues=max_requeues,
+            requeue_delay=requeue_delay,
+            stop=stop,
+        )
+
+    with _graceful_stop(max_runtime) as stop:
+        with contextlib.ExitStack() as stages:
+            # One pool for the requests of every transfer, hedged duplicates
+            # included; losers still waiting for an answer are not waited for
+            request_pool = ThreadPoolExecutor(
+                max_workers=2 * max(1, num_workers), thread_name_prefix="request"
+            )
+            stages.callback(request_pool.shutdown, wait=False)
+            # Entered last stage first, so each outlives the ones feeding it
+            post = _publish_stage(
+                stages,
+                journal,
+                order=publish_order or DEFAULT_PUBLISH_ORDER,
+                workers=move_workers,
+                leases=leases,
+                published=published,
+            )
+            post = _metadata_stage(
+                stages,
+                episode_index=episode_index if jellyfin else None,
+                workers=nfo_workers,
+                then=post,
+            )
+            fetch_subtitles = _subtitle_lane(
+                stages, pool, session, no_vtt=no_vtt, workers=subtitle_workers, limiter=limiter
+            )
+            results = _retry_failed(
+                talks,
+                run(talks),
+                run,
+                exclude=skipped | missing,
+                retries=retries,
+                retry_delay=retry_delay,
+                stop=stop,
+            )
+        outcomes = _settle_results(talks, results, published=published, ledger=ledger, skipped=skipped)
+        pool.log_hedging()
+        disk.log()
+    return outcomes
+
+
+def _settle_results(
+    talks: list[Talk],
+    results: list[bool | None],
+    *,
+    published: set[int],
+    ledger: FailureLedger | None,
+    skipped: set[int],
+) -> list[bool]:
+    """
+    Return whether each talk made it into the library.
+
+    A successful transfer only counts once its talk is in *published* (by
+    ``id``).  The outcomes are recorded in *ledger*, if given, except for
+    talks in *skipped* and talks without an outcome.
+    """
+    settled = [ok and id(talk) in published for talk, ok in zip(talks, results, strict=True)]
+    if ledger is not None:
+        ledger.record_results(talks, settled, exclude=skipped)
+        ledger.save()
+    return [ok is True for ok in settled]
+
+
+def _note(journal: RunJournal | None, talk: Talk, state: str) -> None:
+    """Append a talk state change to *journal*, if there is one."""
+    if journal is not None:
+        journal.record(talk, state)
+
+
+def _transfer_talk(  # noqa: PLR0913
+    talk: Talk,
+    file_path: Path,
+    pool: SourcePool,
+    session: requests.Session,
+    *,
+    min_rate: float,
+    stall_window: float,
+    stop: threading.Event | None,
+    limiter: RateLimiter | None,
+    journal: RunJournal | None,
+    missing: set[int],
+    disk: WriteStats,
+    policy: WritePolicy | None,
+    pending: Path,
+    request_pool: ThreadPoolExecutor,
+) -> bool:
+    """
+    Download one talk's video, journalling its progress.
+
+    A talk no source has is added to *missing* (by ``id``).  Success is
+    only journalled as ``started``: the talk becomes ``done`` once the
+    later stages have handled it.  The complete video is renamed to
+    *pending*; one already there (left unpublished by an earlier run) is
+    not fetched again.
+    """
+    _note(journal, talk, "started")
+    if pending.exists():
+        return True
+    try:
+        success = download_from_sources(
+            talk.url,
+            file_path,
+            pool,
+            session=session,
+            min_rate=min_rate,
+            stall_window=stall_window,
+            stop=stop,
+            limiter=limiter,
+            disk=disk,
+            policy=policy,
+            finished=pending,
+            request_pool=request_pool,
+        )
+    except VideoNotFoundError:
+        _note(journal, talk, "missing")
+        missing.add(id(talk))
+        return False
+    if not success:
+        _note(journal, talk, "failed")
+    return success
+
+
+def _publish_stage(  # noqa: PLR0913
+    stack: contextlib.ExitStack,
+    journal: RunJournal | None,
+    *,
+    order: str,
+    workers: int,
+    leases: LeaseQueue | None,
+    published: set[int],
+) -> Callable[[tuple[Talk, Path, Path]], None]:
+    """
+    Start the stage publishing finished talks; return its entry point.
+
+    Items are ``(talk, pending video, library path)``.  A published talk
+    is marked ``done`` in *journal* and added to *published* (by ``id``);
+    one that fails to publish stays unfinished, its pending files kept
+    for the next run.  Either way the talk's lease in *leases* is released
+    only then, so no other process fetches it while it waits to publish.
+    """
+    from fosdem_video.pipeline import Stage  # noqa: PLC0415
+    from fosdem_video.staging import publish  # noqa: PLC0415
+
+    def publish_talk(item: tuple[Talk, Path, Path]) -> None:
+        talk, pending, target = item
+        try:
+            publish(pending, target, order)
+        finally:
+            if leases is not None:
+                leases.release(talk)
+        published.add(id(talk))
+        _note(journal, talk, "done")
+
+    return stack.enter_context(Stage("publish", publish_talk, workers=workers)).put
+
+
+def _metadata_stage(
+    stack: contextlib.ExitStack,
+    *,
+    episode_index: dict[str, tuple[int, int]] | None,
+    workers: int,
+    then: Callable[[tuple[Talk, Path, Path]], None],
+) -> Callable[[tuple[Talk, Path, Path]], None]:
+    """
+    Start the stage writing episode NFOs, if needed; return its entry point.
+
+    For Jellyfin layouts (*episode_index* given) the NFO is written next to
+    the pending video on its own threads before the talk goes on to
+    *then*; otherwise this returns *then* itself.
+    """
+    if episode_index is None:
+        return then
+    from fosdem_video.pipeline import Stage  # noqa: PLC0415
+
+    nfo = Stage(
+        "metadata",
+        lambda item: _write_talk_nfo(item[0], item[1], episode_index),
+        workers=workers,
+        then=then,
+    )
+    return stack.enter_context(nfo).put
+
+
+def _subtitle_lane(  # noqa: PLR0913
+    stack: contextlib.ExitStack,
+    pool: SourcePool,
+    session: requests.Session,
+    *,
+    no_vtt: bool,
+    workers: int,
+    limiter: RateLimiter | None,
+) -> Callable[[Talk, Path], Future[None]]:
+    """
+    Start the subtitle stage on *stack*; return a function queueing a talk.
+
+    Subtitles are tiny, so they are fetched on their own threads while the
+    video is still transferring instead of adding a round trip after it.
+    The returned future resolves once the talk's VTT has been fetched or
+    found missing (immediately with *no_vtt*).
+    """
+    from fosdem_video.pipeline import Stage  # noqa: PLC0415
+
+    lane = None
+    if not no_vtt:
+        lane = Stage(
+            "subtitle",
+            lambda job: _fetch_talk_vtt(job[0], job[1], pool, session, limiter),
+            workers=workers,
+            then=lambda job: job[2].set_result(None),
+        )
+        stack.enter_context(lane)
+
+    def fetch(talk: Talk, file_path: Path) -> Future[None]:
+        done: Future[None] = Future()
+        if lane is None:
+            done.set_result(None)
+        else:
+            lane.put((talk, file_path, done))
+        return done
+
+    return fetch
+
+
+def _discard_orphan_vtt(file_path: Path, pending: Path) -> None:
+    """
+    Remove the subtitles fetched for a video that did not arrive.
+
+    They are kept while a partial video remains, for the transfer to
+    resume (after a stall or an interruption).
+    """
+    if not partial_path(file_path).exists():
+        pending.with_suffix(".vtt").unlink(missing_ok=True)
+
+
+def _fetch_talk_vtt(
+    talk: Talk,
+    file_path: Path,
+    pool: SourcePool,
+    session: requests.Session,
+    limiter: RateLimiter | None = None,
+) -> bool:
+    """
+    Download *talk*'s subtitles from the first source that has them.
+
+    Subtitles already on disk (e.g. fetched before the video was requeued)
+    are kept.
+    """
+    if file_path.with_suffix(".vtt").exists():
+        return True
+    return any(
+        download_vtt(url, file_path, session=session, missing_ok=url != talk.url, limiter=limiter)
+        for _, url in pool.routes(talk.url)
+    )
+
+
+def _write_talk_nfo(talk: Talk, file_path: Path, episode_index: dict[str, tuple[int, int]]) -> None:
+    """Write the episode NFO next to *talk*'s video, if the talk has a title."""
+    if not talk.title:
+        return
+    season_num, ep_num = lookup_episode(episode_index, talk) or (0, 0)
+    write_episode_nfo(
+        talk,
+        file_path,
+        season_number=season_num,
+        episode_number=ep_num,
+    )
+
+
+def _retry_failed(  # noqa: PLR0913
+    talks: list[Talk],
+    results: list[bool | None],
+    run: Callable[[list[Talk]], list[bool | None]],
+    *,
+    exclude: set[int],
+    retries: int,
+    retry_delay: float,
+    stop: threading.Event,
+) -> list[bool | None]:
+    """
+    Give failed *talks* up to *retries* more rounds through *run*.
+
+    Rounds are separated by pauses doubling from *retry_delay* seconds;
+    talks whose ``id()`` is in *exclude*, and unfinished talks (``None``),
+    are left as they are.  Setting *stop* ends the retries.
+    """
+    for attempt in range(retries):
+        failed = [i for i, ok in enumerate(results) if ok is False and id(talks[i]) not in exclude]
+        if not failed or stop.is_set():
+            break
+        pause = retry_delay * 2**attempt
+        logger.info(
+            "Retrying %d failed talks in %.0fs (round %d of %d)", len(failed), pause, attempt + 1, retries
+        )
+        if stop.wait(pause):
+            break
+        for i, ok in zip(failed, run([talks[i] for i in failed]), strict=True):
+            results[i] = ok
+    return results
+
+
+def _run_with_requeue(  # noqa: PLR0913
+    talks: list[Talk],
+    process: Callable[[Talk], bool],
+    num_workers: int,
+    *,
+    max_requeues: int,
+    requeue_delay: float,
+    stop: threading.Event | None = None,
+) -> list[bool | None]:
+    """
+    Run *process* over *talks* on *num_workers* threads, in order.
+
+    A talk whose transfer stalls (:class:`StalledTransferError`) goes back
+    to the end of the queue once ``requeue_delay * 2**n`` seconds have
+    passed, at most *max_requeues* times; it does not hold a worker while
+    it waits.  Once *stop* is set, queued and requeued talks are dropped
+    and running ones are left to wind down.  Returns one result per talk,
+    in input order; ``None`` marks a talk that did not finish.
+    """
+    results: list[bool | None] = [None] * len(talks)
+    waiting: list[tuple[float, int, int]] = []  # (ready_at, index, requeues)
     with ThreadPoolExecutor(max_workers=num_workers) as executor:
-        return list(executor.map(process_video, talks))
+        pending = {executor.submit(process, talk): (i, 0) for i, talk in enumerate(talks)}
+        while pending or waiting:
+            if stop is not None and stop.is_set():
+                _drop_queued(pending, waiting)
+            timeout = max(0.0, waiting[0][0] - time.monotonic()) if waiting else None
+            if stop is not None:
+                timeout = min(timeout, _STOP_POLL_INTERVAL) if timeout is not None else _STOP_POLL_INTERVAL
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                i, requeues = pending.pop(future)
+                try:
+                    results[i] = future.result()
+                except DownloadInterruptedError:
+                    continue
+                except StalledTransferError:
+                    if requeues >= max_requeues:
+                        logger.warning("Giving up on %s after %d stalled attempts", talks[i].id, requeues + 1)
+                        results[i] = False
+                        continue
+                    backoff = requeue_delay * 2**requeues
+                    logger.info("Requeueing %s in %.0fs", talks[i].id, backoff)
+                    heapq.heappush(waiting, (time.monotonic() + backoff, i, requeues + 1))
+            while waiting and waiting[0][0] <= time.monotonic():
+                _, i, requeues = heapq.heappop(waiting)
+                pending[executor.submit(process, talks[i])] = (i, requeues)
+    return results
+
+
+def _drop_queued(pending: dict[Future[bool], tuple[int, int]], waiting: list[tuple[float, int, int]]) -> None:
+    """Cancel *pending* work that has not started and forget *waiting* requeues."""
+    waiting.clear()
+    for future in [future for future in pending if future.cancel()]:
+        del pending[future]
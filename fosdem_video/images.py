@@ -2,11 +2,22 @@
 
 from __future__ import annotations
 
+import errno
 import logging
+import os
 import shutil
+import sys
+import threading
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from fosdem_video.models import slugify
+from fosdem_video.models import slugify, temporary_sibling
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+if sys.platform != "win32":
+    import fcntl
 
 logger = logging.getLogger(__name__)
 
@@ -30,10 +41,88 @@ _SEASON_IMAGE_TYPES: list[tuple[str, str]] = [
     ("poster", "poster"),
 ]
 
+# ``FICLONE`` ioctl request number from <linux/fs.h>: share extents with
+# another file on copy-on-write filesystems (btrfs, XFS with reflink=1).
+_FICLONE = 0x40049409
+
 # Location of the bundled assets directory (sibling of fosdem_video/).
 _ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets"
 
 
+# In-memory index of each assets directory, built on first use.  Maps
+# ``(prefix, image_type)`` to the matching files in resolution order.
+_AssetIndex = dict[tuple[str, str], list[Path]]
+_asset_indexes: dict[Path, _AssetIndex] = {}
+_asset_index_lock = threading.Lock()
+
+
+def _parse_asset_name(name: str) -> tuple[str, str, int, str] | None:
+    """
+    Split an asset filename into ``(prefix, image_type, number, ext)``.
+
+    ``fosdem-2026-backdrop-2.jpg`` becomes ``("fosdem-2026", "backdrop", 2,
+    "jpg")``; un-numbered files get number ``0``.  Returns ``None`` for
+    names that do not follow the ``<prefix>-<type>[-<n>].<ext>`` scheme.
+    """
+    stem, dot, ext = name.rpartition(".")
+    if not dot or ext not in _EXTENSIONS:
+        return None
+    parts = stem.split("-")
+    num = 0
+    if parts[-1][:1].isdigit():
+        try:
+            num = int(parts[-1])
+        except ValueError:
+            return None
+        parts = parts[:-1]
+    if len(parts) < 2:  # noqa: PLR2004
+        return None
+    return "-".join(parts[:-1]), parts[-1], num, ext
+
+
+def _build_asset_index(assets_dir: Path) -> _AssetIndex:
+    """Scan *assets_dir* once and group its files by ``(prefix, image_type)``."""
+    entries: dict[tuple[str, str], list[tuple[int, int, str, Path]]] = {}
+    try:
+        with os.scandir(assets_dir) as it:
+            for entry in it:
+                parsed = _parse_asset_name(entry.name)
+                if parsed is None or not entry.is_file():
+                    continue
+                prefix, image_type, num, ext = parsed
+                entries.setdefault((prefix, image_type), []).append(
+                    (num, _EXTENSIONS.index(ext), entry.name, assets_dir / entry.name),
+                )
+    except OSError:
+        logger.debug("Cannot scan assets directory %s", assets_dir)
+        return {}
+    # Un-numbered first, then numbered variants; ties follow extension order.
+    return {key: [path for *_, path in sorted(found)] for key, found in entries.items()}
+
+
+def _get_asset_index(assets_dir: Path) -> _AssetIndex:
+    """Return the cached index for *assets_dir*, building it on first use."""
+    with _asset_index_lock:
+        index = _asset_indexes.get(assets_dir)
+        if index is None:
+            index = _asset_indexes[assets_dir] = _build_asset_index(assets_dir)
+        return index
+
+
+def invalidate_asset_index(assets_dir: Path | None = None) -> None:
+    """
+    Drop the cached asset index for *assets_dir* (or for every directory).
+
+    Long-running processes should call this after adding, removing or
+    renaming artwork so the next lookup rescans the directory.
+    """
+    with _asset_index_lock:
+        if assets_dir is None:
+            _asset_indexes.clear()
+        else:
+            _asset_indexes.pop(assets_dir, None)
+
+
 def _find_assets(
     assets_dir: Path,
     prefix: str,
@@ -44,35 +133,12 @@ def _find_assets(
 
     Looks for ``<prefix>-<image_type>.<ext>`` and numbered variants
     ``<prefix>-<image_type>-<n>.<ext>`` across all supported extensions.
+    Lookups are served from the in-memory index of *assets_dir*.
 
     Returns a list of paths sorted so the un-numbered file comes first,
     followed by numbered variants in ascending order.
     """
-    matches: list[tuple[int, Path]] = []
-    for ext in _EXTENSIONS:
-        # Un-numbered variant
-        candidate = assets_dir / f"{prefix}-{image_type}.{ext}"
-        if candidate.is_file():
-            matches.append((0, candidate))
-        # Numbered variants: <prefix>-<type>-2.ext, <prefix>-<type>-3.ext, …
-        for numbered in assets_dir.glob(f"{prefix}-{image_type}-[0-9]*.{ext}"):
-            # Extract the number suffix
-            stem = numbered.stem  # e.g. "fosdem-backdrop-2"
-            suffix_part = stem.rsplit("-", 1)[-1]
-            try:
-                num = int(suffix_part)
-            except ValueError:
-                continue
-            matches.append((num, numbered))
-    # Deduplicate by path and sort by number
-    seen: set[Path] = set()
-    unique: list[tuple[int, Path]] = []
-    for num, path in matches:
-        if path not in seen:
-            seen.add(path)
-            unique.append((num, path))
-    unique.sort(key=lambda t: t[0])
-    return [p for _, p in unique]
+    return list(_get_asset_index(assets_dir).get((prefix, image_type), []))
 
 
 def resolve_assets(
@@ -116,17 +182,89 @@ def resolve_assets(
     return _find_assets(assets_dir, "fosdem", image_type)
 
 
+def _is_up_to_date(src_stat: os.stat_result, dest: Path) -> bool:
+    """Return True when *dest* already matches *src_stat* in size and mtime."""
+    try:
+        dest_stat = dest.stat()
+    except OSError:
+        return False
+    return dest_stat.st_size == src_stat.st_size and dest_stat.st_mtime_ns == src_stat.st_mtime_ns
+
+
+def _reflink(src: Path, dest: Path) -> None:
+    """Clone *src* into *dest* sharing extents (``FICLONE``), or raise OSError."""
+    if sys.platform == "win32":
+        raise OSError(errno.EOPNOTSUPP, "reflink not supported on this platform")
+    with src.open("rb") as fsrc, dest.open("wb") as fdst:
+        fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+    shutil.copystat(src, dest)
+
+
+def _hardlink(src: Path, dest: Path) -> None:
+    """Hard-link *dest* to *src*, or raise OSError (e.g. across filesystems)."""
+    os.link(src, dest)
+
+
+def _copy(src: Path, dest: Path) -> None:
+    """Copy *src* to *dest*, preserving metadata."""
+    shutil.copy2(src, dest)
+
+
+# Placement strategies in order of preference: share extents, share the
+# inode, and only then duplicate the bytes.
+_PLACEMENT_STRATEGIES: list[tuple[str, Callable[[Path, Path], None]]] = [
+    ("reflink", _reflink),
+    ("hardlink", _hardlink),
+    ("copy", _copy),
+]
+
+
+def _place_image(src: Path, dest: Path) -> str:
+    """
+    Materialise *src* at *dest* using the cheapest strategy that works.
+
+    Each strategy writes to a hidden temporary name next to *dest* which
+    is then renamed over it, so an existing image is never left
+    half-written.  Returns the name of the strategy used; the last
+    strategy's error propagates if every strategy fails.
+    """
+    tmp = temporary_sibling(dest)
+    *fallible, (last_name, last_place) = _PLACEMENT_STRATEGIES
+    try:
+        for name, place in fallible:
+            tmp.unlink(missing_ok=True)
+            try:
+                place(src, tmp)
+            except OSError:
+                continue
+            tmp.replace(dest)
+            return name
+        tmp.unlink(missing_ok=True)
+        last_place(src, tmp)
+        tmp.replace(dest)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return last_name
+
+
 def _copy_image(src: Path, dest: Path) -> bool:
     """
-    Copy *src* to *dest*, preserving metadata.
+    Place *src* at *dest*, skipping the work when *dest* is already current.
 
-    Creates the parent directory if it does not exist.  Returns ``True``
-    on success, ``False`` on failure (logged, never raises).
+    A destination with the same size and mtime as *src* is left alone, so
+    re-runs perform no image I/O.  Otherwise the image is reflinked,
+    hard-linked or copied (in that order of preference), preserving the
+    source mtime.  Creates the parent directory if it does not exist.
+    Returns ``True`` on success, ``False`` on failure (logged, never raises).
     """
     try:
+        src_stat = src.stat()
+        if _is_up_to_date(src_stat, dest):
+            logger.debug("Image %s is up to date", dest)
+            return True
         dest.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(src, dest)
-        logger.debug("Copied image %s -> %s", src.name, dest)
+        method = _place_image(src, dest)
+        logger.debug("Placed image %s -> %s (%s)", src.name, dest, method)
     except Exception:
         logger.exception("Failed to copy image %s -> %s", src.name, dest)
         return False
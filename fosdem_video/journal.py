@@ -0,0 +1,260 @@
+"""
+Append-only journal of a download run, for ``--resume-run``.
+
+Each process keeps its own journal, ``<output>/.runs/<host>-<pid>.jsonl``,
+so runs of several hosts (or processes) sharing an output root never
+write to the same file.  It holds one JSON object per line:
+
+- ``plan``: the talks to fetch, their episode index, the path layout and
+  the volume and size chosen for each talk, written once the run has been
+  planned;
+- ``sources``: the measured source ranking, once probing is done;
+- ``talk``: one line per state change of a talk (``started``, ``done``,
+  ``failed``, ``missing``), written by the download workers as it happens;
+- ``resumed``, ``finished`` or ``stopped`` as the run starts again or ends.
+
+Every line is flushed as soon as it is written, so the journal survives
+the process being killed.  :func:`load_run` reads it back: resuming
+downloads the planned talks that are not ``done`` or ``missing`` yet,
+with the recorded source ranking and volume placement, without
+discovering, probing or planning again.
+:func:`find_journal` picks the run to resume: this host's latest run
+that did not finish.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Self
+
+from fosdem_video.download import episode_key
+from fosdem_video.models import Talk, sanitise_path_component
+
+if TYPE_CHECKING:
+    from types import TracebackType
+    from typing import TextIO
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the plan layout or the Talk fields change.
+JOURNAL_VERSION = 2
+
+# Talks in these states are not downloaded again when a run is resumed.
+FINAL_STATES = frozenset({"done", "missing"})
+
+_TALK_FIELDS = tuple(f.name for f in fields(Talk))
+
+
+def _host() -> str:
+    return sanitise_path_component(socket.gethostname())
+
+
+def journal_path(output_dir: Path) -> Path:
+    """Return the journal of a run by this process inside an output root."""
+    return output_dir / ".runs" / f"{_host()}-{os.getpid()}.jsonl"
+
+
+def _host_journals(output_dir: Path) -> list[Path]:
+    """Return this host's journals inside an output root, newest first."""
+    journals = [
+        path for path in (output_dir / ".runs").glob("*.jsonl") if path.stem.rpartition("-")[0] == _host()
+    ]
+    return sorted(journals, key=lambda path: path.stat().st_mtime, reverse=True)
+
+
+def find_journal(output_dir: Path) -> Path | None:
+    """
+    Return the journal ``--resume-run`` continues, if any.
+
+    That is this host's latest run that did not finish, else its latest
+    run.  Journals without a usable plan are passed over.
+    """
+    usable = []
+    for path in _host_journals(output_dir):
+        try:
+            finished = load_run(path).finished
+        except ValueError:
+            continue
+        if not finished:
+            return path
+        usable.append(path)
+    return usable[0] if usable else None
+
+
+def prune_journals(output_dir: Path) -> None:
+    """Remove this host's journals of finished runs, which nothing resumes."""
+    for path in _host_journals(output_dir):
+        try:
+            finished = load_run(path).finished
+        except ValueError:
+            continue
+        if finished:
+            path.unlink(missing_ok=True)
+
+
+@dataclass(frozen=True)
+class RunPlan:
+    """
+    A journalled run (at *path*): its plan and how far it got.
+
+    *roots* and *sizes* are the volume and video size chosen for each talk
+    by ``talk.url``; both are empty if the run did not plan placement.
+    """
+
+    path: Path
+    talks: list[Talk]
+    fmt: str
+    jellyfin: bool
+    episode_index: dict[str, tuple[int, int]]
+    roots: dict[str, Path]
+    sizes: dict[str, int]
+    sources: list[dict[str, Any]]
+    states: dict[str, str]
+    finished: bool
+
+    def pending(self) -> list[Talk]:
+        """Return the planned talks that still need downloading, in plan order."""
+        return [
+            talk
+            for talk in self.talks
+            if self.states.get(episode_key(talk.year, talk.id)) not in FINAL_STATES
+        ]
+
+
+class RunJournal:
+    """
+    Writer for the journal at *path*; use as a context manager.
+
+    A new journal replaces any earlier one at *path*; with *resume* the
+    existing journal is appended to instead.  Leaving the block records whether the
+    run ``finished`` or was ``stopped`` by an exception.
+    """
+
+    def __init__(self, path: Path, *, resume: bool = False) -> None:
+        """Prepare to write to *path*; nothing is opened until entered."""
+        self.path = path
+        self.resume = resume
+        self._lock = threading.Lock()
+        self._file: TextIO | None = None
+
+    def __enter__(self) -> Self:
+        """Open the journal for appending (truncating it unless resuming)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("a" if self.resume else "w", encoding="utf-8")
+        if self.resume:
+            self._write({"event": "resumed"})
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Record how the run ended and close the file."""
+        self._write({"event": "finished" if exc_type is None else "stopped"})
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def write_plan(  # noqa: PLR0913
+        self,
+        talks: list[Talk],
+        *,
+        fmt: str,
+        jellyfin: bool,
+        episode_index: dict[str, tuple[int, int]],
+        roots: dict[str, Path] | None = None,
+        sizes: dict[str, int] | None = None,
+    ) -> None:
+        """
+        Record the talks this run will fetch and how their paths are laid out.
+
+        *roots* and *sizes* are the placement chosen for each talk by
+        ``talk.url``, if the run planned one.
+        """
+        self._write(
+            {
+                "event": "plan",
+                "version": JOURNAL_VERSION,
+                "fmt": fmt,
+                "jellyfin": jellyfin,
+                "episode_index": episode_index,
+                "roots": {url: str(root) for url, root in (roots or {}).items()},
+                "sizes": sizes or {},
+                "talks": [[getattr(talk, name) for name in _TALK_FIELDS] for talk in talks],
+            },
+        )
+
+    def write_sources(self, measurements: list[dict[str, Any]]) -> None:
+        """Record the source ranking (see :meth:`SourcePool.measurements`)."""
+        self._write({"event": "sources", "sources": measurements})
+
+    def record(self, talk: Talk, state: str) -> None:
+        """Record that *talk* entered *state*."""
+        self._write({"event": "talk", "talk": episode_key(talk.year, talk.id), "state": state})
+
+    def _write(self, entry: dict[str, Any]) -> None:
+        entry["time"] = round(time.time(), 3)
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            self._file.flush()
+
+
+def load_run(path: Path) -> RunPlan:
+    """
+    Read back the journal at *path*.
+
+    Raises :class:`ValueError` if there is no journal or it holds no
+    usable plan.  A torn last line (the process was killed mid-write) is
+    ignored.
+    """
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        msg = f"no run journal at {path}"
+        raise ValueError(msg) from None
+    plan: dict[str, Any] | None = None
+    sources: list[dict[str, Any]] = []
+    states: dict[str, str] = {}
+    finished = False
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            logger.debug("Ignoring unreadable journal line: %r", line)
+            continue
+        event = entry.get("event")
+        if event == "plan":
+            plan = entry
+        elif event == "sources":
+            sources = entry["sources"]
+        elif event == "talk":
+            states[entry["talk"]] = entry["state"]
+        elif event in {"resumed", "finished", "stopped"}:
+            finished = event == "finished"
+    if plan is None or plan.get("version") != JOURNAL_VERSION:
+        msg = f"run journal {path} has no usable plan"
+        raise ValueError(msg)
+    return RunPlan(
+        path=path,
+        talks=[Talk(*row) for row in plan["talks"]],
+        fmt=plan["fmt"],
+        jellyfin=plan["jellyfin"],
+        episode_index={key: tuple(value) for key, value in plan["episode_index"].items()},
+        roots={url: Path(root) for url, root in plan["roots"].items()},
+        sizes=plan["sizes"],
+        sources=sources,
+        states=states,
+        finished=finished,
+    )
@@ -0,0 +1,189 @@
+"""
+Lease files for cooperating downloader processes on a shared filesystem.
+
+Several ``fosdem-video --coordinate`` processes pointed at the same output
+root balance work dynamically: before downloading a talk a worker claims
+it by creating ``<output>/.leases/<year>-<slug>.lease`` with ``O_EXCL``
+(atomic on local filesystems and NFSv3+).  While the download runs a
+heartbeat thread refreshes the lease's mtime; a lease whose mtime is
+older than the TTL belongs to a crashed node and may be reclaimed.
+Leases are removed when the talk finishes (successfully or not), and the
+finished video on disk is what stops other nodes from fetching it again.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import TYPE_CHECKING, Self
+
+from fosdem_video.models import sanitise_path_component
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from types import TracebackType
+
+    from fosdem_video.models import Talk
+
+logger = logging.getLogger(__name__)
+
+# A lease not refreshed for this long is considered abandoned.
+DEFAULT_LEASE_TTL: float = 300.0
+
+
+def lease_dir(output_dir: Path) -> Path:
+    """Return the lease directory inside an output root."""
+    return output_dir / ".leases"
+
+
+class LeaseQueue:
+    """
+    Claim talks through lease files so no talk is downloaded twice.
+
+    Use as a context manager: entering starts the heartbeat thread,
+    leaving stops it and releases any leases still held.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        ttl: float = DEFAULT_LEASE_TTL,
+        owner: str | None = None,
+    ) -> None:
+        """Create a queue storing leases in *directory*."""
+        self.directory = directory
+        self.ttl = ttl
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._held: set[Path] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> Self:
+        """Create the lease directory and start heartbeating."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._heartbeat_loop, name="lease-heartbeat", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Stop heartbeating and release every lease still held."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        with self._lock:
+            held, self._held = self._held, set()
+        for path in held:
+            self._remove_if_owned(path)
+
+    def _path(self, talk: Talk) -> Path:
+        return self.directory / f"{sanitise_path_component(f'{talk.year}-{talk.id}')}.lease"
+
+    def claim(self, talk: Talk) -> bool:
+        """
+        Try to take the lease for *talk*.
+
+        Returns ``True`` if this process now holds it, ``False`` if a live
+        lease belongs to another process.  Expired leases are reclaimed.
+        """
+        path = self._path(talk)
+        if self._create(path):
+            return True
+        if self._reclaim_if_expired(path):
+            return self._create(path)
+        return False
+
+    def release(self, talk: Talk) -> None:
+        """Give up the lease for *talk* (no-op if not held)."""
+        path = self._path(talk)
+        with self._lock:
+            if path not in self._held:
+                return
+            self._held.discard(path)
+        self._remove_if_owned(path)
+
+    def heartbeat(self) -> None:
+        """Refresh the mtime of every held lease, dropping any we have lost."""
+        with self._lock:
+            held = list(self._held)
+        for path in held:
+            if self._read_owner(path) != self.owner:
+                logger.warning("Lost lease %s to another process", path.name)
+                with self._lock:
+                    self._held.discard(path)
+                continue
+            with contextlib.suppress(FileNotFoundError):
+                os.utime(path)
+
+    def _heartbeat_loop(self) -> None:
+        while not self._stop.wait(self.ttl / 3):
+            try:
+                self.heartbeat()
+            except Exception:
+                logger.exception("Lease heartbeat failed")
+
+    def _create(self, path: Path) -> bool:
+        record = json.dumps({"owner": self.owner, "claimed": time.time()})
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(record)
+        with self._lock:
+            self._held.add(path)
+        logger.debug("Claimed lease %s", path.name)
+        return True
+
+    def _is_expired(self, path: Path) -> bool:
+        try:
+            return time.time() - path.stat().st_mtime > self.ttl
+        except FileNotFoundError:
+            return True
+
+    def _reclaim_if_expired(self, path: Path) -> bool:
+        """
+        Move an expired lease out of the way; return True if the slot is free.
+
+        The lease is renamed to a unique tombstone first so only one
+        reclaimer wins.  If the file we moved turns out to be fresh (another
+        node reclaimed and re-created it in between) it is put back.
+        """
+        if not self._is_expired(path):
+            return False
+        tombstone = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.stale")
+        try:
+            path.rename(tombstone)
+        except FileNotFoundError:
+            return True
+        if not self._is_expired(tombstone):
+            with contextlib.suppress(FileExistsError):
+                os.link(tombstone, path)
+            tombstone.unlink(missing_ok=True)
+            return False
+        logger.info("Reclaimed expired lease %s", path.name)
+        tombstone.unlink(missing_ok=True)
+        return True
+
+    def _read_owner(self, path: Path) -> str | None:
+        try:
+            return json.loads(path.read_text(encoding="utf-8")).get("owner")
+        except (OSError, ValueError):
+            return None
+
+    def _remove_if_owned(self, path: Path) -> None:
+        if self._read_owner(path) == self.owner:
+            path.unlink(missing_ok=True)
+            logger.debug("Released lease %s", path.name)
@@ -0,0 +1,163 @@
+"""
+Persistent record of talks that failed to download.
+
+Talks still failing after the end-of-run retries are written to
+``<output>/.failures.json`` with their failure count and the time of the
+last failure.  The next run over the same output directory tries them
+first, except talks still inside their cooldown (``cooldown * 2**(n-1)``
+after the *n*-th consecutive failure), which are skipped so a video that
+is not published yet does not cost a request on every run.  A success
+removes the talk from the ledger.
+
+``--backfill-subtitles`` keeps a second ledger of the same kind,
+``<output>/.missing-subtitles.json``, of talks whose subtitles no source
+has yet, with a much shorter cooldown.
+
+Only talks in the current selection are affected; entries for other
+talks are kept untouched.  Saving re-reads the file and applies this
+run's changes, so processes sharing an output directory do not drop each
+other's entries.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from fosdem_video.models import temporary_sibling
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from fosdem_video.models import Talk
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FAILURE_COOLDOWN: float = 3600.0
+# Subtitles often appear days after the video: recheck a missing one
+# within the day at first, backing off as it stays missing.
+DEFAULT_SUBTITLE_COOLDOWN: float = 6 * 3600.0
+_MAX_COOLDOWN: float = 7 * 24 * 3600.0
+
+
+def ledger_path(output_dir: Path) -> Path:
+    """Return the failure ledger inside an output root."""
+    return output_dir / ".failures.json"
+
+
+def subtitle_cache_path(output_dir: Path) -> Path:
+    """Return the ledger of talks without published subtitles inside an output root."""
+    return output_dir / ".missing-subtitles.json"
+
+
+def _key(talk: Talk) -> str:
+    return f"{talk.year}/{talk.id}"
+
+
+def _read(path: Path) -> dict[str, dict[str, Any]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError):
+        logger.warning("Ignoring unreadable failure ledger %s", path)
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+class FailureLedger:
+    """Failure counts per talk, loaded from and saved to *path*."""
+
+    def __init__(self, path: Path, cooldown: float = DEFAULT_FAILURE_COOLDOWN) -> None:
+        """Load the ledger at *path* (missing or corrupt files start empty)."""
+        self.path = path
+        self.cooldown = cooldown
+        self.entries = _read(path)
+        self._changed: dict[str, dict[str, Any] | None] = {}
+        self._lock = threading.Lock()
+
+    def retry_at(self, talk: Talk) -> float:
+        """Return the epoch time after which *talk* may be tried again."""
+        entry = self.entries.get(_key(talk))
+        if entry is None:
+            return 0.0
+        backoff = min(self.cooldown * 2 ** (entry["failures"] - 1), _MAX_COOLDOWN)
+        return entry["last_failure"] + backoff
+
+    def schedule(self, talks: list[Talk]) -> list[Talk]:
+        """
+        Order *talks* for this run: earlier failures first, then the rest.
+
+        Talks whose cooldown has not elapsed are left out.
+        """
+        now = time.time()
+        failed: list[Talk] = []
+        fresh: list[Talk] = []
+        cooling = 0
+        for talk in talks:
+            if _key(talk) not in self.entries:
+                fresh.append(talk)
+            elif self.retry_at(talk) <= now:
+                failed.append(talk)
+            else:
+                cooling += 1
+        if failed:
+            logger.info("Retrying %d talks that failed in earlier runs first", len(failed))
+        if cooling:
+            logger.info("Skipping %d recently failed talks until their cooldown ends", cooling)
+        return failed + fresh
+
+    def record(self, talk: Talk, *, success: bool) -> None:
+        """Record the outcome of this run's attempts at *talk*."""
+        key = _key(talk)
+        with self._lock:
+            if success:
+                if key in self.entries:
+                    del self.entries[key]
+                    self._changed[key] = None
+                return
+            previous = self.entries.get(key, {})
+            entry = {
+                "url": talk.url,
+                "failures": previous.get("failures", 0) + 1,
+                "last_failure": time.time(),
+            }
+            self.entries[key] = entry
+            self._changed[key] = entry
+
+    def record_results(self, talks: list[Talk], results: list[bool | None], *, exclude: set[int]) -> None:
+        """
+        Record each talk's outcome.
+
+        Talks whose ``id()`` is in *exclude*, and talks without an outcome
+        (``None``, e.g. an interrupted run), are left alone.
+        """
+        for talk, ok in zip(talks, results, strict=True):
+            if ok is not None and id(talk) not in exclude:
+                self.record(talk, success=ok)
+
+    def save(self) -> None:
+        """Merge this run's changes into the file on disk, atomically."""
+        with self._lock:
+            changed, self._changed = self._changed, {}
+        if not changed:
+            return
+        entries = _read(self.path)
+        for key, entry in changed.items():
+            if entry is None:
+                entries.pop(key, None)
+            else:
+                entries[key] = entry
+        tmp = temporary_sibling(self.path)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(entries, indent=1, sort_keys=True), encoding="utf-8")
+            tmp.replace(self.path)
+        except OSError:
+            logger.warning("Could not write failure ledger %s", self.path, exc_info=True)
+            tmp.unlink(missing_ok=True)
+        if failures := sum(1 for entry in changed.values() if entry is not None):
+            logger.info("Recorded %d failed talks in %s", failures, self.path)
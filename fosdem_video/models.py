@@ -2,17 +2,63 @@
 
 from __future__ import annotations
 
+import functools
+import html
 import re
-from dataclasses import dataclass, field
+import sys
+import uuid
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
 from urllib.parse import urlparse
 
+if TYPE_CHECKING:
+    from pathlib import Path
+
 HTTP_OK = 200
+HTTP_PARTIAL_CONTENT = 206
 HTTP_NOT_FOUND = 404
 
+# Where FOSDEM publishes recordings; ``Talk.url`` always points here.
+UPSTREAM_BASE = "https://video.fosdem.org"
+
+
+# Bounded so a large catalogue does not keep every rendered text alive.
+@functools.lru_cache(maxsize=1024)
+def strip_html(text: str) -> str:
+    """Remove HTML tags and decode entities from a string (memoised)."""
+    unescaped = html.unescape(text)
+    return re.sub(r"<[^>]+>", "", unescaped).strip()
+
 
-@dataclass(frozen=True)
+# Fields whose values repeat across thousands of talks (one track, room or
+# date is shared by dozens of events); interning makes every talk point at
+# the same string object instead of holding its own copy.
+_INTERNED_FIELDS = (
+    "year",
+    "location",
+    "track",
+    "date",
+    "start",
+    "duration",
+    "room",
+    "language",
+    "event_type",
+)
+
+
+@dataclass(frozen=True, slots=True)
 class Talk:
-    """Represent a FOSDEM talk video with optional metadata."""
+    """
+    Represent a FOSDEM talk video with optional metadata.
+
+    Instances are slotted (no per-instance ``__dict__``), repeated strings
+    such as track and room names are interned, and ``persons`` is stored
+    as a tuple, which keeps multi-year catalogues compact and makes talks
+    hashable.  ``abstract_html`` and ``description_html`` hold the
+    schedule's raw HTML; :attr:`abstract` and :attr:`description` render
+    it as plain text when read, so the conversion only happens for talks
+    whose text is used (e.g. for an NFO), and only once per text.
+    """
 
     url: str
     year: str
@@ -29,10 +75,26 @@ class Talk:
     event_url: str = ""
     language: str = ""
     event_type: str = ""
-    abstract: str = ""
-    description: str = ""
+    abstract_html: str = ""
+    description_html: str = ""
     feedback_url: str = ""
-    persons: list[str] = field(default_factory=list)
+    persons: tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        """Intern repeated strings and freeze ``persons`` into a tuple."""
+        for name in _INTERNED_FIELDS:
+            object.__setattr__(self, name, sys.intern(getattr(self, name)))
+        object.__setattr__(self, "persons", tuple(sys.intern(p) for p in self.persons))
+
+    @property
+    def abstract(self) -> str:
+        """Return the abstract as plain text."""
+        return strip_html(self.abstract_html)
+
+    @property
+    def description(self) -> str:
+        """Return the description as plain text."""
+        return strip_html(self.description_html)
 
 
 def get_path_elements(url: str) -> tuple[str, str]:
@@ -70,6 +132,16 @@ def sanitise_path_component(name: str) -> str:
     return cleaned.strip("- ")
 
 
+def temporary_sibling(path: Path) -> Path:
+    """
+    Return a unique hidden temporary path next to *path*.
+
+    Used for write-then-rename updates.  The random component keeps the
+    name unique across threads, processes and hosts sharing one library.
+    """
+    return path.with_name(f".{path.name}.{uuid.uuid4().hex[:12]}.tmp")
+
+
 def slugify(text: str) -> str:
     """
     Convert a free-form string into a URL/filesystem-safe slug.
@@ -24,6 +24,8 @@ import logging
 from typing import TYPE_CHECKING
 from xml.etree.ElementTree import Element, SubElement, tostring
 
+from fosdem_video.models import temporary_sibling
+
 if TYPE_CHECKING:
     from pathlib import Path
 
@@ -61,12 +63,8 @@ def _duration_to_minutes(duration: str) -> int:
 
 def _build_episode_plot(talk: Talk) -> str:
     """Build the ``<plot>`` text for an episode NFO."""
-    sections: list[str] = []
-
-    if talk.abstract:
-        sections.append(talk.abstract)
-    if talk.description:
-        sections.append(talk.description)
+    # Tested once rendered: markup alone (e.g. "<p> </p>") is no text
+    sections = [text for text in (talk.abstract, talk.description) if text]
 
     # Collapse metadata that doesn't map cleanly to NFO tags
     meta_lines: list[str] = []
@@ -86,16 +84,25 @@ def _build_episode_plot(talk: Talk) -> str:
 
 
 def _write_xml(path: Path, root: Element) -> bool:
-    """Serialise *root* to *path* with an XML declaration."""
+    """
+    Serialise *root* to *path* with an XML declaration.
+
+    The file is written under a temporary name and renamed into place, so
+    several processes (e.g. sharded nodes sharing a library) can write the
+    same ``tvshow.nfo``/``season.nfo`` without readers seeing a torn file.
+    """
+    tmp = temporary_sibling(path)
     try:
         xml_content = tostring(root, encoding="unicode", xml_declaration=False)
-        path.write_text(
+        tmp.write_text(
             f'<?xml version="1.0" encoding="UTF-8"?>\n{xml_content}\n',
             encoding="utf-8",
         )
+        tmp.replace(path)
         logger.debug("Wrote NFO sidecar %s", path.name)
     except Exception:
         logger.exception("Failed to write NFO %s", path)
+        tmp.unlink(missing_ok=True)
         return False
     return True
 
@@ -0,0 +1,138 @@
+"""
+Post-download stages running on their own threads.
+
+A video transfer holds one of the few download slots for minutes, while
+fetching its subtitles or writing its NFO takes a fraction of a second.
+Rather than doing all of it in the download slot, each finished video is
+handed to a :class:`Stage`: a bounded queue drained by a small pool of
+dedicated workers, which hands every item on to the next stage when done.
+A full queue makes the producer wait (backpressure) instead of buffering
+without limit.
+
+Each stage keeps :class:`StageStats` (items, failures, peak queue depth,
+busy time) and logs them when it is closed; :attr:`Stage.depth` gives the
+current queue depth.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Self
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from types import TracebackType
+
+logger = logging.getLogger(__name__)
+
+# Items are a (talk, path) pair each, so this bounds memory, not throughput.
+DEFAULT_STAGE_CAPACITY = 64
+
+_CLOSE = object()
+
+
+@dataclass
+class StageStats:
+    """Counters describing one stage's work."""
+
+    processed: int = 0
+    failed: int = 0
+    peak_depth: int = 0
+    busy: float = 0.0  # seconds spent handling items, summed over workers
+
+
+class Stage[T]:
+    """
+    A named pool of *workers* threads applying *handle* to queued items.
+
+    After *handle* returns (or raises, which is logged and counted) the
+    item is passed to *then*, typically the next stage's :meth:`put`.  Use
+    as a context manager: leaving the block lets the workers drain the
+    queue, then stops them.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handle: Callable[[T], object],
+        *,
+        workers: int,
+        capacity: int = DEFAULT_STAGE_CAPACITY,
+        then: Callable[[T], None] | None = None,
+    ) -> None:
+        """Create the stage; its threads start when it is entered."""
+        self.name = name
+        self.handle = handle
+        self.then = then
+        self.stats = StageStats()
+        self._queue: queue.Queue[object] = queue.Queue(maxsize=max(1, capacity))
+        self._threads = [
+            threading.Thread(target=self._work, name=f"{name}-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> Self:
+        """Start the worker threads."""
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Drain the queue, stop the workers and log the stage's stats."""
+        if exc_type is not None and not issubclass(exc_type, Exception):
+            # Forced quit (e.g. a second Ctrl-C): leave the daemon threads be
+            return
+        for _ in self._threads:
+            self._queue.put(_CLOSE)
+        for thread in self._threads:
+            thread.join()
+        stats = self.stats
+        if stats.processed:
+            logger.info(
+                "Stage %s: %d items (%d failed), peak queue depth %d/%d, busy %.1fs",
+                self.name,
+                stats.processed,
+                stats.failed,
+                stats.peak_depth,
+                self._queue.maxsize,
+                stats.busy,
+            )
+
+    @property
+    def depth(self) -> int:
+        """Return the number of items waiting in the queue."""
+        return self._queue.qsize()
+
+    def put(self, item: T) -> None:
+        """Queue *item*, waiting while the queue is full."""
+        if self._queue.full():
+            logger.debug("Stage %s queue is full (%d); waiting", self.name, self._queue.maxsize)
+        self._queue.put(item)
+        with self._lock:
+            self.stats.peak_depth = max(self.stats.peak_depth, self._queue.qsize())
+
+    def _work(self) -> None:
+        while (item := self._queue.get()) is not _CLOSE:
+            started = time.monotonic()
+            failed = False
+            try:
+                self.handle(item)  # type: ignore[arg-type]
+            except Exception:
+                logger.exception("Stage %s failed", self.name)
+                failed = True
+            with self._lock:
+                self.stats.processed += 1
+                self.stats.failed += failed
+                self.stats.busy += time.monotonic() - started
+            if self.then is not None:
+                self.then(item)  # type: ignore[arg-type]
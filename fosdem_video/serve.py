@@ -0,0 +1,307 @@
+"""
+Serve an already-downloaded library over HTTP for other downloaders.
+
+One node fetches from ``video.fosdem.org``; the others point ``--mirror``
+at it and pull over the LAN.  Files are exposed under the same path
+scheme as upstream, ``/{year}/{room}/{slug}.{fmt}`` (the room is accepted
+but ignored since slugs are unique within an edition), so a mirror URL is
+just the upstream URL with a different base.
+
+Both output layouts are understood:
+
+- flat: ``<root>/<year>/<slug>.<fmt>``;
+- Jellyfin: ``<root>/Fosdem (<year>)/<track>/<name>/<name>.<fmt>``, where
+  the slug is read from the episode NFO's ``<uniqueid>`` (or is the folder
+  name itself when the library was built without an episode index).
+
+Responses honour single ``Range`` requests and are sent with
+:meth:`socket.socket.sendfile`, i.e. ``sendfile(2)`` zero-copy where the
+platform supports it.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import re
+import threading
+import time
+from email.utils import formatdate
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+from xml.etree.ElementTree import ParseError, parse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SERVE_HOST = "127.0.0.1"
+DEFAULT_SERVE_PORT = 8080
+
+# A miss triggers a rescan (new downloads appear), but at most this often.
+RESCAN_INTERVAL: float = 30.0
+
+# Longest first so "talk.av1.webm" is not split as "talk.av1" + "webm".
+_EXTENSIONS = ("av1.webm", "mp4", "vtt")
+_CONTENT_TYPES = {"av1.webm": "video/webm", "mp4": "video/mp4", "vtt": "text/vtt"}
+_SHOW_DIR_RE = re.compile(r"Fosdem \((\d{4})\)")
+_REQUEST_PATH_RE = re.compile(r"/(\d{4})/(?:[^/]+/)?([^/]+)")
+_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)")
+
+type LibraryKey = tuple[str, str, str]  # (year, slug, fmt)
+type NfoCache = dict[Path, tuple[int, str | None]]  # path -> (mtime_ns, slug)
+
+
+def parse_serve_address(value: str) -> tuple[str, int]:
+    """
+    Parse ``[HOST:]PORT`` into ``(host, port)``.
+
+    A bare port binds :data:`DEFAULT_SERVE_HOST`.  Raises
+    :class:`ValueError` for malformed values.
+    """
+    host, sep, port = value.rpartition(":")
+    if not sep:
+        host = DEFAULT_SERVE_HOST
+    if not port.isdigit() or not 0 <= int(port) <= 65535:  # noqa: PLR2004
+        msg = f"invalid address '{value}': expected [HOST:]PORT, e.g. '0.0.0.0:8080'"
+        raise ValueError(msg)
+    return host.strip("[]") or DEFAULT_SERVE_HOST, int(port)
+
+
+def _split_name(name: str) -> tuple[str, str] | None:
+    """Split ``<stem>.<fmt>`` for the served extensions, else ``None``."""
+    for ext in _EXTENSIONS:
+        if name.endswith(f".{ext}") and len(name) > len(ext) + 1:
+            return name[: -len(ext) - 1], ext
+    return None
+
+
+def _nfo_slug(nfo_path: Path) -> str | None:
+    """Return the FOSDEM ``<uniqueid>`` of an episode NFO, if readable."""
+    try:
+        root = parse(nfo_path).getroot()  # noqa: S314 - files we wrote ourselves
+    except (OSError, ParseError):
+        return None
+    for uniqueid in root.iter("uniqueid"):
+        if uniqueid.get("type") == "fosdem" and uniqueid.text:
+            return uniqueid.text.strip()
+    return None
+
+
+def _cached_nfo_slug(nfo_path: Path, cache: NfoCache) -> str | None:
+    """Return :func:`_nfo_slug` of *nfo_path*, parsing it only if new or modified."""
+    try:
+        mtime = nfo_path.stat().st_mtime_ns
+    except OSError:
+        cache.pop(nfo_path, None)
+        return None
+    cached = cache.get(nfo_path)
+    if cached is None or cached[0] != mtime:
+        cached = cache[nfo_path] = (mtime, _nfo_slug(nfo_path))
+    return cached[1]
+
+
+def scan_library(root: Path, nfo_cache: NfoCache | None = None) -> dict[LibraryKey, Path]:
+    """
+    Map ``(year, slug, fmt)`` to the file holding it for every video/subtitle.
+
+    Hidden directories (``.leases``, temporary files) are skipped.  Slugs
+    read from episode NFOs are kept in *nfo_cache*, if given, so a rescan
+    only parses the NFOs written or changed since; entries for NFOs that
+    are gone are dropped.
+    """
+    cache: NfoCache = {} if nfo_cache is None else nfo_cache
+    seen: set[Path] = set()
+    index: dict[LibraryKey, Path] = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        parts = Path(dirpath).relative_to(root).parts
+        if len(parts) == 1 and parts[0].isdigit():
+            year, episode_dir = parts[0], None
+        elif len(parts) > 1 and (m := _SHOW_DIR_RE.fullmatch(parts[0])):
+            year, episode_dir = m.group(1), Path(dirpath)
+        else:
+            continue
+        for filename in filenames:
+            split = _split_name(filename)
+            if split is None or filename.startswith("."):
+                continue
+            stem, ext = split
+            slug = stem
+            if episode_dir is not None:
+                nfo = episode_dir / f"{stem}.nfo"
+                seen.add(nfo)
+                slug = _cached_nfo_slug(nfo, cache) or stem
+            index[year, slug, ext] = Path(dirpath) / filename
+    for gone in cache.keys() - seen:
+        del cache[gone]
+    return index
+
+
+class Library:
+    """
+    A thread-safe, lazily refreshed index of the files under *roots*.
+
+    A library spread over several volumes (``--output`` and each
+    ``--volume``) is served as one; a file found on more than one root is
+    served from the first.
+    """
+
+    def __init__(self, *roots: Path, rescan_interval: float = RESCAN_INTERVAL) -> None:
+        """Index *roots* immediately."""
+        self.roots = roots
+        self.rescan_interval = rescan_interval
+        self._lock = threading.Lock()
+        self._index: dict[LibraryKey, Path] = {}
+        self._scanned_at = float("-inf")
+        self._nfo_caches: dict[Path, NfoCache] = {root: {} for root in roots}
+        self._scan_lock = threading.Lock()
+        self.rescan()
+
+    def rescan(self) -> None:
+        """Rebuild the index from disk, reusing the NFOs parsed by earlier scans."""
+        index: dict[LibraryKey, Path] = {}
+        with self._scan_lock:
+            for root in reversed(self.roots):
+                index.update(scan_library(root, self._nfo_caches[root]))
+        with self._lock:
+            self._index = index
+            self._scanned_at = time.monotonic()
+        logger.info("Serving %d files from %s", len(index), ", ".join(str(root) for root in self.roots))
+
+    def lookup(self, year: str, slug: str, fmt: str) -> Path | None:
+        """Return the file for ``(year, slug, fmt)``, rescanning once on a miss."""
+        with self._lock:
+            path = self._index.get((year, slug, fmt))
+            stale = time.monotonic() - self._scanned_at >= self.rescan_interval
+        if path is None and stale:
+            self.rescan()
+            with self._lock:
+                path = self._index.get((year, slug, fmt))
+        return path
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """
+    Resolve a single ``bytes=`` range against *size*.
+
+    Returns ``(start, end)`` inclusive, or ``None`` if the range cannot be
+    satisfied.  Raises :class:`ValueError` for headers this server does not
+    support (malformed or multi-range), which are answered in full.
+    """
+    m = _RANGE_RE.fullmatch(header.strip())
+    if not m or m.group(1) == m.group(2) == "":
+        msg = f"unsupported Range header: {header!r}"
+        raise ValueError(msg)
+    first, last = m.group(1), m.group(2)
+    if first == "":
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            return None
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return None
+    return start, end
+
+
+class LibraryRequestHandler(BaseHTTPRequestHandler):
+    """Answer ``GET``/``HEAD`` for ``/{year}/{room}/{slug}.{fmt}``."""
+
+    server: LibraryServer
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        """Send the requested file (or a byte range of it)."""
+        self._respond(send_body=True)
+
+    def do_HEAD(self) -> None:
+        """Send headers only."""
+        self._respond(send_body=False)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        """Route access logs through :mod:`logging` instead of stderr."""
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _resolve(self) -> tuple[Path, str] | None:
+        """Map the request path to ``(file, fmt)``."""
+        m = _REQUEST_PATH_RE.fullmatch(unquote(urlsplit(self.path).path))
+        split = _split_name(m.group(2)) if m else None
+        if m is None or split is None:
+            return None
+        slug, ext = split
+        path = self.server.library.lookup(m.group(1), slug, ext)
+        return (path, ext) if path is not None else None
+
+    def _respond(self, *, send_body: bool) -> None:
+        resolved = self._resolve()
+        try:
+            f = resolved[0].open("rb") if resolved is not None else None
+        except OSError:
+            f = None
+        if f is None or resolved is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        with f:
+            stat = os.fstat(f.fileno())
+            size = stat.st_size
+            start, end = 0, size - 1
+            status = HTTPStatus.OK
+            if range_header := self.headers.get("Range"):
+                try:
+                    byte_range = parse_range(range_header, size)
+                except ValueError:
+                    byte_range = (start, end)
+                if byte_range is None:
+                    self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                    self.send_header("Content-Range", f"bytes */{size}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if byte_range != (0, size - 1):
+                    start, end = byte_range
+                    status = HTTPStatus.PARTIAL_CONTENT
+
+            length = end - start + 1
+            self.send_response(status)
+            self.send_header("Content-Type", _CONTENT_TYPES[resolved[1]])
+            self.send_header("Content-Length", str(length))
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("Last-Modified", formatdate(stat.st_mtime, usegmt=True))
+            if status == HTTPStatus.PARTIAL_CONTENT:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            self.end_headers()
+            if not send_body or length <= 0:
+                return
+            # Headers go through the buffered wfile; flush them before
+            # handing the socket to sendfile(2).
+            self.wfile.flush()
+            with contextlib.suppress(BrokenPipeError, ConnectionResetError):
+                self.connection.sendfile(f, offset=start, count=length)
+
+
+class LibraryServer(ThreadingHTTPServer):
+    """A threading HTTP server bound to a :class:`Library`."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], library: Library) -> None:
+        """Bind *address* and serve files from *library*."""
+        super().__init__(address, LibraryRequestHandler)
+        self.library = library
+
+
+def serve_library(
+    roots: list[Path],
+    host: str = DEFAULT_SERVE_HOST,
+    port: int = DEFAULT_SERVE_PORT,
+) -> None:
+    """Serve the library spread over *roots* until interrupted."""
+    with LibraryServer((host, port), Library(*roots)) as server:
+        bound_host, bound_port = server.server_address[:2]
+        logger.info("Serving library on http://%s:%s/", bound_host, bound_port)
+        with contextlib.suppress(KeyboardInterrupt):
+            server.serve_forever()
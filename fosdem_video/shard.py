@@ -0,0 +1,138 @@
+"""
+Deterministic partitioning of the talk list across cooperating nodes.
+
+Every node runs with the same selection and ``--shard K/N`` and keeps only
+the talks assigned to shard *K*; no coordination is needed because the
+assignment depends only on the talks themselves:
+
+- by default a talk goes to ``stable_hash(year/slug) mod N``;
+- with sizes (``Content-Length`` from HEAD requests) the talks, in hash
+  order, are cut into buckets of *N*; each bucket deals one talk to each
+  shard by size, largest first, in alternating directions, which balances
+  bytes rather than talk counts.  Buckets with a talk of unknown size
+  keep the hashed assignment.
+
+Sizes are probed by every node on its own, so they may differ between
+nodes (a HEAD request failing on one of them, say).  Because the hash
+decides the buckets, such a difference only reshuffles the talks of one
+bucket instead of the whole plan.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from fosdem_video.models import HTTP_OK
+
+if TYPE_CHECKING:
+    import requests
+
+    from fosdem_video.models import Talk
+
+logger = logging.getLogger(__name__)
+
+# HEAD requests are cheap, but keep the probe polite.
+DEFAULT_PROBE_WORKERS = 4
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """
+    Parse a ``K/N`` shard specification into ``(index, count)``.
+
+    *K* is 1-based.  Raises :class:`ValueError` for malformed values or
+    when *K* is not between 1 and *N*.
+    """
+    m = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", value)
+    if not m:
+        msg = f"invalid shard '{value}': expected K/N, e.g. '1/3'"
+        raise ValueError(msg)
+    index, count = int(m.group(1)), int(m.group(2))
+    if not 1 <= index <= count:
+        msg = f"invalid shard '{value}': K must be between 1 and N"
+        raise ValueError(msg)
+    return index, count
+
+
+def stable_hash(talk: Talk) -> int:
+    """Return a process-independent hash of the talk's ``year/slug``."""
+    digest = hashlib.sha256(f"{talk.year}/{talk.id}".encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def assign_shards(
+    talks: list[Talk],
+    count: int,
+    sizes: dict[str, int] | None = None,
+) -> list[int]:
+    """
+    Return the 0-based shard number of each talk in *talks*.
+
+    With *sizes* (keyed by ``talk.url``) talks are balanced by bytes within
+    buckets of *count* talks in :func:`stable_hash` order; buckets with a
+    talk missing from *sizes* are assigned by the hash alone.
+    """
+    hashes = [stable_hash(talk) for talk in talks]
+    shards = [h % count for h in hashes]
+    if not sizes:
+        return shards
+
+    order = sorted(range(len(talks)), key=lambda i: (hashes[i], i))
+    for start in range(0, len(order), count):
+        bucket = order[start : start + count]
+        if any(sizes.get(talks[i].url, 0) <= 0 for i in bucket):
+            continue
+        bucket.sort(key=lambda i: (-sizes[talks[i].url], hashes[i]))
+        if (start // count) % 2:
+            # Odd buckets deal from the other end, so no shard always gets the largest
+            bucket.reverse()
+        for shard, i in enumerate(bucket):
+            shards[i] = shard
+    return shards
+
+
+def shard_talks(
+    talks: list[Talk],
+    index: int,
+    count: int,
+    sizes: dict[str, int] | None = None,
+) -> list[Talk]:
+    """Return the talks belonging to 1-based shard *index* of *count*."""
+    if count <= 1:
+        return talks
+    shards = assign_shards(talks, count, sizes)
+    selected = [talk for talk, shard in zip(talks, shards, strict=True) if shard == index - 1]
+    logger.info("Shard %d/%d: %d of %d talks", index, count, len(selected), len(talks))
+    return selected
+
+
+def probe_sizes(
+    talks: list[Talk],
+    session: requests.Session,
+    max_workers: int = DEFAULT_PROBE_WORKERS,
+) -> dict[str, int]:
+    """
+    Fetch ``Content-Length`` for each talk's video with HEAD requests.
+
+    Talks whose size cannot be determined are left out of the result.
+    """
+
+    def head(talk: Talk) -> tuple[str, int]:
+        try:
+            response = session.head(talk.url, allow_redirects=True, timeout=30)
+        except Exception:  # noqa: BLE001 - unknown size just means "hash it"
+            logger.debug("Could not probe size of %s", talk.url)
+            return talk.url, 0
+        if response.status_code != HTTP_OK:
+            return talk.url, 0
+        try:
+            return talk.url, int(response.headers.get("content-length", 0))
+        except ValueError:
+            logger.debug("Ignoring invalid Content-Length for %s", talk.url)
+            return talk.url, 0
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        return {url: size for url, size in executor.map(head, talks) if size > 0}
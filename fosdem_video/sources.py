@@ -0,0 +1,320 @@
+"""
+Alternative sources (mirrors, LAN caches) for FOSDEM video files.
+
+Every source serves the upstream path scheme, ``/{year}/{room}/{slug}.{fmt}``,
+so a talk's URL on any source is its ``Talk.url`` with a different base.
+``Talk.url`` itself always points at upstream; sources only change where
+the bytes come from.
+
+A :class:`SourcePool` ranks the configured bases by measured latency and
+throughput:
+
+- at start-up, and every ``probe_interval`` seconds while the pool is
+  open, each source is probed with a small ``Range`` request;
+- completed downloads feed their throughput back into the ranking;
+- a source that errors is taken out of rotation for a cooldown that
+  doubles with each consecutive failure, and comes back after a
+  successful probe or download.  A 404 is a miss, not a failure.
+
+The pool also tracks time-to-first-byte across all requests so that a
+request whose first byte is later than the running
+``hedge_percentile`` can be hedged with a duplicate to the next source
+(see :func:`fosdem_video.download.download_from_sources`).
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Self
+from urllib.parse import urlsplit
+
+from fosdem_video.models import HTTP_NOT_FOUND, UPSTREAM_BASE
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    import requests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROBE_INTERVAL: float = 300.0
+
+# Size of the ranged GET used to estimate throughput.
+PROBE_BYTES = 256 * 1024
+
+# Sources are ranked by the estimated time to fetch a file of this size.
+_REFERENCE_BYTES = 64 * 1024 * 1024
+
+# First cooldown after a failure; doubled per consecutive failure.
+FAILURE_COOLDOWN: float = 30.0
+_MAX_COOLDOWN: float = 600.0
+
+# Weight of the newest sample in the moving averages.
+_EWMA_WEIGHT = 0.3
+
+# Hedge a request once its first byte is later than this percentile of
+# recent time-to-first-byte samples.  0 disables hedging.
+DEFAULT_HEDGE_PERCENTILE: float = 95.0
+_TTFB_WINDOW = 200
+_HEDGE_MIN_SAMPLES = 20
+_HEDGE_MIN_DELAY: float = 0.5
+
+
+def rewrite_base(url: str, base: str) -> str:
+    """
+    Point *url* at *base*, keeping its ``/{year}/{room}/{slug}.{fmt}`` path.
+
+    *base* may carry a path prefix (``http://cache.lan:8080/fosdem``).
+    """
+    path = urlsplit(url).path
+    return f"{base.rstrip('/')}{path}"
+
+
+def _ewma(current: float | None, sample: float) -> float:
+    return sample if current is None else (1 - _EWMA_WEIGHT) * current + _EWMA_WEIGHT * sample
+
+
+@dataclass
+class Source:
+    """Health and performance estimates for one base URL."""
+
+    base: str
+    latency: float | None = None  # seconds to response headers
+    throughput: float | None = None  # bytes per second
+    failures: int = 0
+    down_until: float = 0.0
+
+    def is_healthy(self, now: float) -> bool:
+        """Return whether the source is outside its failure cooldown."""
+        return now >= self.down_until
+
+    def score(self, assumed_throughput: float | None = None) -> float:
+        """
+        Estimated seconds to fetch a typical recording (lower is better).
+
+        A source whose throughput has not been measured yet is scored with
+        *assumed_throughput* (the best seen elsewhere), and unknown latency
+        counts as zero, so new sources are tried optimistically.
+        """
+        throughput = self.throughput or assumed_throughput
+        transfer = _REFERENCE_BYTES / throughput if throughput else 0.0
+        return (self.latency or 0.0) + transfer
+
+
+@dataclass
+class HedgeStats:
+    """Counters describing how often hedging fired and what it saved."""
+
+    fired: int = 0  # duplicate requests issued
+    won: int = 0  # duplicates that answered before the original
+    saved: float = 0.0  # seconds of first-byte latency avoided when they won
+
+
+class SourcePool:
+    """
+    Route downloads to the best healthy source among *bases*.
+
+    *bases* are tried in the given order until measurements exist;
+    upstream is always included (last, unless listed explicitly) so a
+    download never has nowhere to go.  Use as a context manager to probe
+    periodically in the background; without it the pool only learns from
+    :meth:`probe` calls and download outcomes.
+    """
+
+    def __init__(
+        self,
+        bases: list[str] | None = None,
+        *,
+        session: requests.Session | None = None,
+        probe_url: str | None = None,
+        probe_interval: float = DEFAULT_PROBE_INTERVAL,
+        hedge_percentile: float = DEFAULT_HEDGE_PERCENTILE,
+    ) -> None:
+        """Create a pool over *bases*, probing *probe_url* when asked to."""
+        normalised = [base.rstrip("/") for base in bases or []]
+        if UPSTREAM_BASE not in normalised:
+            normalised.append(UPSTREAM_BASE)
+        self.sources = [Source(base) for base in dict.fromkeys(normalised)]
+        self.session = session
+        self.probe_url = probe_url
+        self.probe_interval = probe_interval
+        self.hedge_percentile = hedge_percentile
+        self.hedging = HedgeStats()
+        self._ttfb: deque[float] = deque(maxlen=_TTFB_WINDOW)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> Self:
+        """
+        Probe once, then keep probing every ``probe_interval`` seconds.
+
+        The first probe is skipped when every source already has a latency
+        estimate (see :meth:`restore`).
+        """
+        if len(self.sources) > 1 and self.probe_url and self.session is not None:
+            if any(source.latency is None for source in self.sources):
+                self.probe()
+            if self.probe_interval > 0:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._probe_loop, name="source-probe", daemon=True)
+                self._thread.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Stop background probing."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def routes(self, url: str) -> list[tuple[Source, str]]:
+        """
+        Return ``(source, url)`` pairs to try for *url*, best first.
+
+        Healthy sources come first, ordered by score (configured order
+        breaks ties); sources in cooldown follow, soonest-available first,
+        as a last resort.
+        """
+        now = time.monotonic()
+        with self._lock:
+            order = {id(source): i for i, source in enumerate(self.sources)}
+            best = max((s.throughput for s in self.sources if s.throughput), default=None)
+            healthy = sorted(
+                (s for s in self.sources if s.is_healthy(now)),
+                key=lambda s: (s.score(best), order[id(s)]),
+            )
+            down = sorted((s for s in self.sources if not s.is_healthy(now)), key=lambda s: s.down_until)
+        return [(source, rewrite_base(url, source.base)) for source in healthy + down]
+
+    def measurements(self) -> list[dict[str, Any]]:
+        """Return each source's base and estimates, for :meth:`restore`."""
+        with self._lock:
+            return [{"base": s.base, "latency": s.latency, "throughput": s.throughput} for s in self.sources]
+
+    def restore(self, measurements: list[dict[str, Any]]) -> None:
+        """Reuse estimates from :meth:`measurements` for sources with the same base."""
+        known = {row["base"]: row for row in measurements}
+        with self._lock:
+            for source in self.sources:
+                if row := known.get(source.base):
+                    source.latency = row["latency"]
+                    source.throughput = row["throughput"]
+
+    def record_success(self, source: Source, nbytes: int, elapsed: float) -> None:
+        """Fold a completed transfer into *source*'s throughput estimate."""
+        with self._lock:
+            source.failures = 0
+            source.down_until = 0.0
+            if nbytes > 0 and elapsed > 0:
+                source.throughput = _ewma(source.throughput, nbytes / elapsed)
+
+    def record_failure(self, source: Source) -> None:
+        """Take *source* out of rotation for an escalating cooldown."""
+        with self._lock:
+            source.failures += 1
+            cooldown = min(FAILURE_COOLDOWN * 2 ** (source.failures - 1), _MAX_COOLDOWN)
+            source.down_until = time.monotonic() + cooldown
+        logger.warning("Source %s failed; avoiding it for %.0fs", source.base, cooldown)
+
+    def record_ttfb(self, seconds: float) -> None:
+        """Add a time-to-first-byte sample to the running window."""
+        with self._lock:
+            self._ttfb.append(seconds)
+
+    def hedge_delay(self) -> float | None:
+        """
+        Return how long to wait for a first byte before hedging.
+
+        ``None`` means "do not hedge": hedging is disabled, or too few
+        samples have been seen to know what a slow first byte looks like.
+        """
+        if self.hedge_percentile <= 0:
+            return None
+        with self._lock:
+            samples = sorted(self._ttfb)
+        if len(samples) < _HEDGE_MIN_SAMPLES:
+            return None
+        rank = math.ceil(self.hedge_percentile / 100 * len(samples)) - 1
+        return max(samples[min(max(rank, 0), len(samples) - 1)], _HEDGE_MIN_DELAY)
+
+    def record_hedge_fired(self) -> None:
+        """Count a duplicate request issued for a slow first byte."""
+        with self._lock:
+            self.hedging.fired += 1
+
+    def record_hedge_won(self) -> None:
+        """Count a duplicate that answered before the original request."""
+        with self._lock:
+            self.hedging.won += 1
+
+    def record_hedge_saved(self, seconds: float) -> None:
+        """Add the first-byte latency a winning duplicate avoided."""
+        with self._lock:
+            self.hedging.saved += seconds
+
+    def log_hedging(self) -> None:
+        """Log the hedging counters, if hedging ever fired."""
+        stats = self.hedging
+        if stats.fired:
+            logger.info(
+                "Hedged %d slow requests; %d duplicates answered first, saving %.1fs of first-byte latency",
+                stats.fired,
+                stats.won,
+                stats.saved,
+            )
+
+    def probe(self) -> None:
+        """Measure every source once with a ranged GET of ``probe_url``."""
+        if self.probe_url is None or self.session is None:
+            return
+        for source in self.sources:
+            self._probe_source(self.session, source, rewrite_base(self.probe_url, source.base))
+        logger.debug(
+            "Source ranking: %s",
+            ", ".join(f"{s.base} ({s.score():.2f}s)" for s, _ in self.routes(self.probe_url)),
+        )
+
+    def _probe_source(self, session: requests.Session, source: Source, url: str) -> None:
+        headers = {"Range": f"bytes=0-{PROBE_BYTES - 1}"}
+        started = time.monotonic()
+        try:
+            with session.get(url, headers=headers, stream=True, timeout=10) as response:
+                latency = time.monotonic() - started
+                if response.status_code == HTTP_NOT_FOUND:
+                    # Reachable but without this file: latency is still useful
+                    with self._lock:
+                        source.latency = _ewma(source.latency, latency)
+                    return
+                response.raise_for_status()
+                nbytes = 0
+                # Stop at PROBE_BYTES even if the server ignored the Range
+                for chunk in response.iter_content(64 * 1024):
+                    nbytes += len(chunk)
+                    if nbytes >= PROBE_BYTES:
+                        break
+        except Exception:  # any probe error marks the source down
+            logger.debug("Probe of %s failed", url, exc_info=True)
+            self.record_failure(source)
+            return
+        elapsed = time.monotonic() - started
+        with self._lock:
+            source.latency = _ewma(source.latency, latency)
+        self.record_success(source, nbytes, elapsed - latency)
+
+    def _probe_loop(self) -> None:
+        while not self._stop.wait(self.probe_interval):
+            try:
+                self.probe()
+            except Exception:
+                logger.exception("Source probe failed")
@@ -0,0 +1,126 @@
+"""
+Where downloads are written, and how they are published into the library.
+
+A talk's files are first completed under hidden *pending* names
+(:func:`pending_path`): the video is renamed there from its ``.part``
+file, and the subtitles and NFO are written next to it.  Once all of
+them are done they are published together, in a fixed order (by
+default the video last, so a scanner that sees it also finds its
+sidecars; or the NFO last), followed by a single fsync of the library
+directory.  Media scanners such as Jellyfin's therefore never see a
+partial file.
+
+With ``--staging-dir`` the same happens in a scratch directory (ideally a
+local SSD) mirroring the library layout, and publishing moves the files
+into the library: a rename when both share a filesystem, otherwise a
+bulk copy to a hidden temporary name followed by a rename.  Transfers
+therefore run at network speed however slow the library is to write.
+"""
+
+from __future__ import annotations
+
+import errno
+import logging
+import os
+import shutil
+from typing import TYPE_CHECKING
+
+from fosdem_video.models import temporary_sibling
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# The suffixes published for a talk, in order; ``None`` is the video.
+PUBLISH_ORDERS: dict[str, tuple[str | None, ...]] = {
+    "video-last": (".vtt", ".nfo", None),
+    "nfo-last": (None, ".vtt", ".nfo"),
+}
+DEFAULT_PUBLISH_ORDER = "video-last"
+
+
+def pending_path(path: Path) -> Path:
+    """
+    Return the hidden name *path* is completed under before publishing.
+
+    The prefix keeps the suffix, so ``pending_path(p).with_suffix(s)`` is
+    ``pending_path(p.with_suffix(s))``.
+    """
+    return path.with_name(f".pending.{path.name}")
+
+
+def staging_path(target: Path, output_dir: Path, staging_dir: Path | None) -> Path:
+    """
+    Return where the download for library path *target* is written.
+
+    Without *staging_dir* that is *target* itself; otherwise the same
+    relative path under *staging_dir*, whose parents are created.
+    """
+    if staging_dir is None:
+        return target
+    staged = staging_dir / target.relative_to(output_dir)
+    staged.parent.mkdir(parents=True, exist_ok=True)
+    return staged
+
+
+def move_into_library(staged: Path, target: Path) -> None:
+    """
+    Move *staged* to *target*, replacing it, once its data is on disk.
+
+    Renames when both are on the same filesystem; otherwise copies to a
+    temporary sibling of *target*, renames that into place and removes
+    *staged*.  The directory entry is not synced (see :func:`publish`).
+    """
+    _sync_file(staged)
+    try:
+        staged.replace(target)
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+    else:
+        return
+    tmp = temporary_sibling(target)
+    try:
+        shutil.copyfile(staged, tmp)
+        _sync_file(tmp)
+        tmp.replace(target)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    staged.unlink()
+
+
+def publish(pending: Path, target: Path, order: str = DEFAULT_PUBLISH_ORDER) -> None:
+    """
+    Publish the pending video *pending* and its sidecars as *target*.
+
+    Files are moved in :data:`PUBLISH_ORDERS` *order*; sidecars that were
+    not written (no subtitles, no NFO) are skipped.  The library directory
+    is synced once, after the last move.
+    """
+    for suffix in PUBLISH_ORDERS[order]:
+        source = pending if suffix is None else pending.with_suffix(suffix)
+        if suffix is None or source.exists():
+            move_into_library(source, target if suffix is None else target.with_suffix(suffix))
+    _sync_dir(target.parent)
+    logger.debug("Published %s", target.name)
+
+
+def _sync_file(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        getattr(os, "fdatasync", os.fsync)(fd)
+    finally:
+        os.close(fd)
+
+
+def _sync_dir(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:  # e.g. directories cannot be opened on Windows
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,174 @@
+"""
+Spreading the library over several volumes.
+
+``--output`` and each ``--volume`` are library roots, usually on different
+disks (Jellyfin merges them when all are folders of one library).  Before
+anything is downloaded, :func:`plan_placement` gives each talk a root
+from the sizes its HEAD request announced (``Content-Length``):
+
+- ``season`` keeps each season folder (a track of an edition, or a whole
+  edition outside the Jellyfin layout) on one volume: a season already on
+  a volume stays there, new ones go largest-first to the volume with the
+  most space left.  A season that fits on no single volume is split;
+- ``free-space`` puts each talk on the volume with the most space left,
+  which fills the disks evenly but scatters seasons.
+
+A talk with a finished, partial or pending file on some volume stays
+there, so an interrupted run resumes where it was.  The plan fails fast
+with :class:`InsufficientSpaceError` when it does not fit into the free
+space (less some headroom) instead of the run dying at 99% on ``ENOSPC``
+hours later; :func:`ensure_room` repeats the check for each transfer once
+its response's ``Content-Length`` is known.
+"""
+
+from __future__ import annotations
+
+import errno
+import logging
+import shutil
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from fosdem_video.staging import pending_path
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+PLACEMENTS = ("season", "free-space")
+DEFAULT_PLACEMENT = "season"
+# Left free on every volume, for NFOs, images and other users of the disk
+DEFAULT_HEADROOM = 1024**3
+
+
+class InsufficientSpaceError(OSError):
+    """Raised when planned downloads do not fit on the output volumes."""
+
+    def __init__(self, message: str) -> None:
+        """Create an ``ENOSPC`` error with *message*."""
+        super().__init__(errno.ENOSPC, message)
+
+
+@dataclass(frozen=True)
+class PlannedFile:
+    """A video to place: *path* and its *season* folder, relative to a root."""
+
+    key: str
+    path: Path
+    season: Path
+    size: int = 0  # bytes; 0 when unknown
+
+
+def format_size(size: float) -> str:
+    """Render a byte count for log messages."""
+    return f"{size / 1024**3:.1f} GiB"
+
+
+def free_space(root: Path) -> int:
+    """
+    Return the bytes available to this process on *root*'s filesystem.
+
+    A *root* that does not exist yet is measured at its nearest existing
+    parent.
+    """
+    existing = next((path for path in (root, *root.parents) if path.exists()), root)
+    return shutil.disk_usage(existing).free
+
+
+def ensure_room(path: Path, size: int) -> None:
+    """Raise :class:`InsufficientSpaceError` unless *size* bytes fit next to *path*."""
+    free = free_space(path.parent)
+    if size > free:
+        msg = f"{path.name} needs {format_size(size)} but {path.parent} has {format_size(free)} free"
+        raise InsufficientSpaceError(msg)
+
+
+def _started_on(root: Path, file: PlannedFile) -> bool:
+    target = root / file.path
+    return any(
+        candidate.exists()
+        for candidate in (target, target.with_name(f"{target.name}.part"), pending_path(target))
+    )
+
+
+class _Volumes:
+    """Space left on each root as units are assigned to them."""
+
+    def __init__(self, roots: list[Path], headroom: int) -> None:
+        self.roots = roots
+        self.left = {root: free_space(root) - headroom for root in roots}
+        self.free = dict(self.left)
+
+    def roomiest(self) -> Path:
+        return max(self.roots, key=lambda root: self.left[root])
+
+    def place(self, homes: list[Path], size: int) -> Path | None:
+        """Take *size* bytes on the first of *homes* with room, else (if none) the roomiest root."""
+        for root in homes or [self.roomiest()]:
+            if self.take(root, size):
+                return root
+        return None
+
+    def take(self, root: Path, size: int) -> bool:
+        if size > self.left[root]:
+            return False
+        self.left[root] -= size
+        return True
+
+    def error(self, needed: int) -> InsufficientSpaceError:
+        lines = [f"{root}: {format_size(max(0, self.free[root]))} usable" for root in self.roots]
+        msg = f"{format_size(needed)} of downloads do not fit ({'; '.join(lines)})"
+        return InsufficientSpaceError(msg)
+
+    def log(self) -> None:
+        for root in self.roots:
+            if planned := self.free[root] - self.left[root]:
+                logger.info(
+                    "Placing %s on %s (%s left)", format_size(planned), root, format_size(self.left[root])
+                )
+
+
+def plan_placement(
+    files: list[PlannedFile],
+    roots: list[Path],
+    *,
+    policy: str = DEFAULT_PLACEMENT,
+    headroom: int = DEFAULT_HEADROOM,
+) -> dict[str, Path]:
+    """
+    Return the root each of *files* is downloaded to, by :attr:`PlannedFile.key`.
+
+    Files of unknown size count as the average known size.  Raises
+    :class:`InsufficientSpaceError` if the plan does not fit into the free
+    space of *roots*, less *headroom* on each.
+    """
+    known = [file.size for file in files if file.size > 0]
+    guess = sum(known) // len(known) if known else 0
+    volumes = _Volumes(roots, headroom)
+    placement: dict[str, Path] = {}
+
+    units: dict[object, list[PlannedFile]] = {}
+    for file in files:
+        if started := next((root for root in roots if _started_on(root, file)), None):
+            placement[file.key] = started
+        else:
+            units.setdefault(file.season if policy == "season" else file.key, []).append(file)
+
+    def size_of(unit: list[PlannedFile]) -> int:
+        return sum(file.size or guess for file in unit)
+
+    for unit in sorted(units.values(), key=lambda unit: (-size_of(unit), unit[0].key)):
+        homes = [root for root in roots if (root / unit[0].season).is_dir()] if policy == "season" else []
+        if (root := volumes.place(homes, size_of(unit))) is not None:
+            placement.update(dict.fromkeys((file.key for file in unit), root))
+            continue
+        if len(unit) > 1:
+            logger.warning("No volume has room for the rest of %s; splitting it", unit[0].season)
+        for file in unit:
+            roomiest = volumes.roomiest()
+            if not volumes.take(roomiest, file.size or guess):
+                raise volumes.error(sum(size_of(unit) for unit in units.values()))
+            placement[file.key] = roomiest
+    volumes.log()
+    return placement
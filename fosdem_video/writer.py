@@ -0,0 +1,271 @@
+"""Background writers: a thread pool for metadata and write-behind for videos."""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, BinaryIO, Self
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from pathlib import Path
+    from types import TracebackType
+
+logger = logging.getLogger(__name__)
+
+# Metadata writes are tiny and latency-bound (one round trip per syscall on
+# network filesystems), so a handful of threads hides most of that latency.
+DEFAULT_METADATA_WORKERS = 8
+
+# Chunk buffers per video transfer: one being filled from the socket while
+# the others wait for, or are being written to, the disk.
+DEFAULT_WRITE_BUFFERS = 4
+# With --drop-cache, written video is flushed and evicted in regions this big.
+DEFAULT_DROP_CACHE_EVERY = 64 * 1024**2
+
+
+class MetadataWriter:
+    """
+    Fan out small filesystem writes over a bounded thread pool.
+
+    Directory creation is batched: shared parents are created once, then the
+    leaf directories are created concurrently.  NFO and image writes are
+    submitted as independent tasks; :meth:`wait` blocks until every submitted
+    task has finished and re-raises the first failure.
+
+    Callers stay responsible for deciding *what* to write (e.g. one
+    ``tvshow.nfo`` per show) — the writer only decides *when*.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_METADATA_WORKERS) -> None:
+        """Create a writer backed by at most *max_workers* threads."""
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers),
+            thread_name_prefix="metadata",
+        )
+        self._pending: list[Future[Any]] = []
+
+    def __enter__(self) -> Self:
+        """Return the writer for use as a context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Wait for outstanding work (unless unwinding) and shut the pool down."""
+        try:
+            if exc_type is None:
+                self.wait()
+        finally:
+            self._executor.shutdown(wait=True, cancel_futures=exc_type is not None)
+
+    def make_dirs(self, folders: Iterable[Path]) -> None:
+        """
+        Create every directory in *folders*, blocking until all exist.
+
+        Folders are deduplicated, then grouped by parent: each distinct
+        parent is created once (with ``parents=True``) before the leaves
+        are created concurrently without walking the hierarchy again.
+        """
+        leaves = set(folders)
+        parents = {folder.parent for folder in leaves} - leaves
+        self._run_all(lambda p: p.mkdir(parents=True, exist_ok=True), parents)
+        self._run_all(lambda p: p.mkdir(parents=True, exist_ok=True), leaves)
+
+    def submit[T](self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> Future[T]:  # noqa: ANN401
+        """Schedule ``fn(*args, **kwargs)`` and track it for :meth:`wait`."""
+        future = self._executor.submit(fn, *args, **kwargs)
+        self._pending.append(future)
+        return future
+
+    def wait(self) -> list[Any]:
+        """Wait for all submitted tasks and return their results in order."""
+        pending, self._pending = self._pending, []
+        return [future.result() for future in pending]
+
+    def _run_all(self, fn: Callable[[Path], object], paths: set[Path]) -> None:
+        """Apply *fn* to every path concurrently and wait for completion."""
+        if not paths:
+            return
+        futures = [self._executor.submit(fn, path) for path in sorted(paths)]
+        for future in futures:
+            future.result()
+        logger.debug("Created %d directories", len(futures))
+
+
+@dataclass
+class WriteStats:
+    """How often the two sides of write-behind transfers waited on each other."""
+
+    read_waits: int = 0  # socket reads that found every buffer still queued for disk
+    read_wait: float = 0.0
+    write_waits: int = 0  # disk writes that found no data from the socket yet
+    write_wait: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, other: WriteStats) -> None:
+        """Fold *other*'s counts into these."""
+        with self._lock:
+            self.read_waits += other.read_waits
+            self.read_wait += other.read_wait
+            self.write_waits += other.write_waits
+            self.write_wait += other.write_wait
+
+    def log(self) -> None:
+        """Log which side was the bottleneck."""
+        if self.read_waits or self.write_waits:
+            logger.info(
+                "Disk writes: network waited on disk %d times (%.1fs), disk on network %d times (%.1fs)",
+                self.read_waits,
+                self.read_wait,
+                self.write_waits,
+                self.write_wait,
+            )
+
+
+@dataclass(frozen=True)
+class WritePolicy:
+    """How video files are laid out on disk and kept in the page cache."""
+
+    preallocate: bool = False
+    drop_cache: bool = False
+    drop_cache_every: int = DEFAULT_DROP_CACHE_EVERY
+
+
+class WriteBehind:
+    """
+    Stream data into an open binary *file* from a dedicated writer thread.
+
+    :meth:`fill` reads the next chunk into one of *buffers* reusable
+    ``bytearray`` buffers of *chunk_size* bytes and queues it; the writer
+    thread writes queued chunks in order and returns the buffers to the
+    pool.  Socket reads therefore only wait for the disk once every buffer
+    is queued, and no chunk is allocated per read.
+
+    Leaving the context manager writes everything still queued (so partial
+    files stay complete up to the last chunk read), stops the thread and
+    re-raises a write error; the waits on either side are added to *stats*.
+
+    *policy* can reserve *size_hint* more bytes when entered, and have the
+    thread flush and evict what it wrote from the page cache as it goes
+    (see :mod:`fosdem_video.diskio`).
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        file: BinaryIO,
+        *,
+        chunk_size: int,
+        buffers: int = DEFAULT_WRITE_BUFFERS,
+        stats: WriteStats | None = None,
+        policy: WritePolicy | None = None,
+        size_hint: int = 0,
+    ) -> None:
+        """Allocate the buffers; the writer thread starts when entered."""
+        self.file = file
+        self.policy = policy or WritePolicy()
+        self.size_hint = size_hint
+        self.stats = WriteStats()
+        self._shared_stats = stats
+        self._free: queue.Queue[bytearray] = queue.Queue()
+        for _ in range(max(2, buffers)):
+            self._free.put(bytearray(chunk_size))
+        self._queued: queue.Queue[tuple[bytearray, int] | None] = queue.Queue()
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._work, name="disk-writer", daemon=True)
+        # Start and length of the written region not yet evicted
+        self._clean = 0
+        self._dirty = 0
+
+    def __enter__(self) -> Self:
+        """Reserve space if the policy asks for it and start the writer thread."""
+        if self.policy.preallocate or self.policy.drop_cache:
+            self._clean = self.file.tell()
+        if self.policy.preallocate:
+            from fosdem_video.diskio import preallocate  # noqa: PLC0415 - only with --preallocate
+
+            preallocate(self.file.fileno(), self._clean, self.size_hint)
+        self._thread.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Write what is queued, stop the thread and surface a write error."""
+        self._queued.put(None)
+        self._thread.join()
+        if self._shared_stats is not None:
+            self._shared_stats.add(self.stats)
+        if exc_type is None and self._error is not None:
+            raise self._error
+
+    def fill(self, read_into: Callable[[memoryview], int]) -> int:
+        """
+        Read the next chunk with *read_into* and queue it for writing.
+
+        Returns the number of bytes read; ``0`` means end of stream.
+        Raises the writer thread's error, if it has failed.
+        """
+        if self._error is not None:
+            raise self._error
+        buffer, waited = _get(self._free)
+        if waited is not None:
+            self.stats.read_waits += 1
+            self.stats.read_wait += waited
+        size = read_into(memoryview(buffer))
+        if not size:
+            self._free.put(buffer)
+            return 0
+        self._queued.put((buffer, size))
+        return size
+
+    def _work(self) -> None:
+        while True:
+            item, waited = _get(self._queued)
+            if waited is not None and item is not None:
+                self.stats.write_waits += 1
+                self.stats.write_wait += waited
+            buffer, size = item or (None, 0)
+            if self._error is None:
+                try:
+                    if buffer is not None:
+                        self.file.write(memoryview(buffer)[:size])
+                    self._drop_behind(size, final=buffer is None)
+                except BaseException as exc:  # noqa: BLE001 - re-raised by the reader
+                    self._error = exc
+            if buffer is None:
+                return
+            self._free.put(buffer)
+
+    def _drop_behind(self, size: int, *, final: bool) -> None:
+        """Evict written data in ``drop_cache_every`` regions, and the rest at the end."""
+        if not self.policy.drop_cache:
+            return
+        self._dirty += size
+        if self._dirty and (final or self._dirty >= self.policy.drop_cache_every):
+            from fosdem_video.diskio import release_written  # noqa: PLC0415 - only with --drop-cache
+
+            self.file.flush()
+            release_written(self.file.fileno(), self._clean, self._dirty)
+            self._clean += self._dirty
+            self._dirty = 0
+
+
+def _get[T](source: queue.Queue[T]) -> tuple[T, float | None]:
+    """Take the next item from *source*, with how long that blocked (``None`` if not at all)."""
+    try:
+        return source.get_nowait(), None
+    except queue.Empty:
+        started = time.monotonic()
+        item = source.get()
+        return item, time.monotonic() - started
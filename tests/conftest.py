@@ -114,6 +114,12 @@ SAMPLE_SCHEDULE_XML = """\
 """
 
 
+@pytest.fixture(autouse=True)
+def _isolated_cache_home(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep schedule snapshots written during tests out of the real cache."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg-cache"))
+
+
 @pytest.fixture
 def sample_ics_content() -> str:
     """Return sample ICS content with 2 events containing FOSDEM video URLs."""
@@ -177,8 +183,8 @@ def make_talk(
         event_url=event_url,
         language=language,
         event_type=event_type,
-        abstract=abstract,
-        description=description,
+        abstract_html=abstract,
+        description_html=description,
         feedback_url=feedback_url,
-        persons=persons if persons is not None else ["Speaker One"],
+        persons=tuple(persons) if persons is not None else ("Speaker One",),
     )
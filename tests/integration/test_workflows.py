@@ -190,6 +190,48 @@ class TestYearDownloadWorkflow:
         assert (output_dir / "2025" / "fosdem-2025-containers-security.mp4").exists()
         assert not (output_dir / "2025" / "fosdem-2025-welcome.mp4").exists()
 
+    @responses.activate
+    def test_multi_year_range_download(self, tmp_path: Path) -> None:
+        output_dir = tmp_path / "output"
+
+        for year in ("2024", "2025"):
+            responses.add(
+                responses.GET,
+                f"https://fosdem.org/{year}/schedule/xml",
+                body=SAMPLE_SCHEDULE_XML,
+                status=200,
+            )
+            # The same slugs exist in both editions; URLs differ by year
+            _mock_video_responses([u.replace("/2025/", f"/{year}/") for u in _XML_VIDEO_URLS])
+            _mock_vtt_responses([u.replace("/2025/", f"/{year}/") for u in _XML_VTT_URLS])
+
+        with patch(
+            "sys.argv",
+            [
+                "prog",
+                "--year",
+                "2024-2025",
+                "--jellyfin",
+                "--format",
+                "mp4",
+                "-o",
+                str(output_dir),
+                "--delay",
+                "0",
+            ],
+        ):
+            main()
+
+        for year in ("2024", "2025"):
+            show_dir = output_dir / f"Fosdem ({year})"
+            assert (show_dir / "tvshow.nfo").exists()
+            assert (
+                show_dir
+                / "Containers"
+                / f"FOSDEM {year} S01E02 Container Security Essentials"
+                / f"FOSDEM {year} S01E02 Container Security Essentials.mp4"
+            ).exists()
+
 
 class TestJellyfinWorkflow:
     """Jellyfin layout integration tests."""
@@ -410,3 +452,28 @@ class TestErrorHandlingWorkflow:
         ):
             main()
         assert exc_info.value.code != 0
+
+
+class TestResumeRunWorkflow:
+    """Resuming a journalled run."""
+
+    @responses.activate
+    def test_resume_fetches_only_unfinished_talks(self, tmp_path: Path) -> None:
+        ics_file = tmp_path / "schedule.ics"
+        ics_file.write_text(SAMPLE_ICS_CONTENT)
+        output_dir = tmp_path / "output"
+        common = ["--format", "mp4", "-o", str(output_dir), "--delay", "0", "--no-vtt", "--retries", "0"]
+
+        responses.add(responses.GET, _ICS_VIDEO_URLS[0], body=b"fakevideo", status=200)
+        responses.add(responses.GET, _ICS_VIDEO_URLS[1], body=b"", status=500)
+        with patch("sys.argv", ["prog", "--ics", str(ics_file), *common]):
+            main()
+        assert not (output_dir / "2025" / "fosdem-2025-containers-runtime.mp4").exists()
+
+        responses.replace(responses.GET, _ICS_VIDEO_URLS[1], body=b"fakevideo", status=200)
+        calls_before = len(responses.calls)
+        with patch("sys.argv", ["prog", "--resume-run", *common]):
+            main()
+
+        assert [call.request.url for call in responses.calls[calls_before:]] == [_ICS_VIDEO_URLS[1]]
+        assert (output_dir / "2025" / "fosdem-2025-containers-runtime.mp4").exists()
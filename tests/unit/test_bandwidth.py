@@ -0,0 +1,84 @@
+"""Unit tests for fosdem_video.bandwidth."""
+
+from __future__ import annotations
+
+from datetime import time
+from unittest.mock import patch
+
+import pytest
+
+from fosdem_video.bandwidth import BandwidthSchedule, RateLimiter, parse_rate
+
+
+class TestParseRate:
+    """Tests for parse_rate."""
+
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ("1024", 1024.0),
+            ("512K", 512 * 1024.0),
+            ("1.5M", 1.5 * 1024**2),
+            ("2mib/s", 2 * 1024.0**2),
+            ("unlimited", None),
+        ],
+    )
+    def test_valid(self, text: str, expected: float | None) -> None:
+        assert parse_rate(text) == expected
+
+    @pytest.mark.parametrize("text", ["", "0", "fast", "1T", "-1M"])
+    def test_invalid(self, text: str) -> None:
+        with pytest.raises(ValueError, match="invalid rate"):
+            parse_rate(text)
+
+
+class TestBandwidthSchedule:
+    """Tests for BandwidthSchedule."""
+
+    def test_night_window_and_default(self) -> None:
+        schedule = BandwidthSchedule.parse("01:00-06:00=unlimited, 1M")
+        assert schedule.rate_at(time(3, 0)) is None
+        assert schedule.rate_at(time(6, 0)) == 1024**2
+        assert schedule.rate_at(time(0, 59)) == 1024**2
+
+    def test_window_wrapping_midnight(self) -> None:
+        schedule = BandwidthSchedule.parse("22:00-06:00=4M,08:00-18:00=256K")
+        assert schedule.rate_at(time(23, 30)) == 4 * 1024**2
+        assert schedule.rate_at(time(5, 59)) == 4 * 1024**2
+        assert schedule.rate_at(time(12, 0)) == 256 * 1024
+        assert schedule.rate_at(time(7, 0)) is None
+
+    @pytest.mark.parametrize("spec", ["25:00-06:00=1M", "01:00-06:00=", "01:00-06:00=0"])
+    def test_invalid(self, spec: str) -> None:
+        with pytest.raises(ValueError, match="invalid"):
+            BandwidthSchedule.parse(spec)
+
+
+class TestRateLimiter:
+    """Tests for RateLimiter."""
+
+    def test_paces_back_to_back_chunks(self) -> None:
+        limiter = RateLimiter(BandwidthSchedule(default=1024**2))
+        with (
+            patch("fosdem_video.bandwidth.time.monotonic", return_value=100.0),
+            patch("fosdem_video.bandwidth.time.sleep") as sleep,
+        ):
+            assert limiter.consume(256 * 1024) == 0.0
+            assert limiter.consume(256 * 1024) == 0.25
+            assert limiter.consume(512 * 1024) == 0.75
+        assert [call.args[0] for call in sleep.call_args_list] == [0.25, 0.75]
+
+    def test_slow_link_is_not_slowed_further(self) -> None:
+        limiter = RateLimiter(BandwidthSchedule(default=1024**2))
+        with (
+            patch("fosdem_video.bandwidth.time.monotonic", side_effect=[100.0, 101.0]),
+            patch("fosdem_video.bandwidth.time.sleep") as sleep,
+        ):
+            limiter.consume(256 * 1024)
+            assert limiter.consume(256 * 1024) == 0.0
+        sleep.assert_not_called()
+
+    def test_unlimited(self) -> None:
+        with patch("fosdem_video.bandwidth.time.sleep") as sleep:
+            assert RateLimiter(BandwidthSchedule()).consume(10**9) == 0.0
+        sleep.assert_not_called()
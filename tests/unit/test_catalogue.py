@@ -0,0 +1,145 @@
+"""Unit tests for fosdem_video.catalogue."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import responses
+
+from fosdem_video.catalogue import (
+    default_cache_dir,
+    load_catalogue,
+    load_catalogues,
+    merge_catalogues,
+    snapshot_path,
+)
+from fosdem_video.download import lookup_episode
+from tests.conftest import SAMPLE_SCHEDULE_XML
+
+_SCHEDULE_URL = "https://fosdem.org/2025/schedule/xml"
+_SCHEDULE_URL_2024 = "https://fosdem.org/2024/schedule/xml"
+# Same slugs as 2025 on purpose: slugs are only unique within an edition.
+_SCHEDULE_XML_2024 = SAMPLE_SCHEDULE_XML.replace("<track>Main Track</track>", "<track>Zig</track>")
+
+
+class TestLoadCatalogue:
+    """Tests for load_catalogue."""
+
+    @responses.activate
+    def test_without_cache_dir_parses_and_indexes(self) -> None:
+        responses.add(responses.GET, _SCHEDULE_URL, body=SAMPLE_SCHEDULE_XML, status=200)
+        catalogue = load_catalogue(2025, "mp4")
+        assert len(catalogue.talks) == 3
+        assert catalogue.episode_index["fosdem-2025-containers-security"] == (1, 2)
+        assert catalogue.episode_index["fosdem-2025-welcome"] == (2, 1)
+
+    @responses.activate
+    def test_first_run_writes_snapshot(self, tmp_path: Path) -> None:
+        responses.add(responses.GET, _SCHEDULE_URL, body=SAMPLE_SCHEDULE_XML, status=200)
+        load_catalogue(2025, "mp4", cache_dir=tmp_path)
+        assert snapshot_path(tmp_path, 2025, "mp4").is_file()
+
+    @responses.activate
+    def test_not_modified_uses_snapshot(self, tmp_path: Path) -> None:
+        responses.add(
+            responses.GET,
+            _SCHEDULE_URL,
+            body=SAMPLE_SCHEDULE_XML,
+            status=200,
+            headers={"ETag": '"v1"'},
+        )
+        first = load_catalogue(2025, "mp4", cache_dir=tmp_path)
+
+        responses.replace(responses.GET, _SCHEDULE_URL, body=b"", status=304)
+        with patch("fosdem_video.catalogue.parse_schedule_content") as parse:
+            second = load_catalogue(2025, "mp4", cache_dir=tmp_path)
+
+        parse.assert_not_called()
+        assert responses.calls[1].request.headers["If-None-Match"] == '"v1"'
+        assert second == first
+
+    @responses.activate
+    def test_identical_body_skips_parsing(self, tmp_path: Path) -> None:
+        responses.add(responses.GET, _SCHEDULE_URL, body=SAMPLE_SCHEDULE_XML, status=200)
+        first = load_catalogue(2025, "mp4", cache_dir=tmp_path)
+
+        with patch("fosdem_video.catalogue.parse_schedule_content") as parse:
+            second = load_catalogue(2025, "mp4", cache_dir=tmp_path)
+
+        parse.assert_not_called()
+        assert second == first
+
+    @responses.activate
+    def test_changed_schedule_rebuilds_snapshot(self, tmp_path: Path) -> None:
+        responses.add(responses.GET, _SCHEDULE_URL, body=SAMPLE_SCHEDULE_XML, status=200)
+        load_catalogue(2025, "mp4", cache_dir=tmp_path)
+
+        changed = SAMPLE_SCHEDULE_XML.replace("Welcome to FOSDEM 2025", "Hello FOSDEM")
+        responses.replace(responses.GET, _SCHEDULE_URL, body=changed, status=200)
+        catalogue = load_catalogue(2025, "mp4", cache_dir=tmp_path)
+
+        titles = {t.title for t in catalogue.talks}
+        assert "Hello FOSDEM" in titles
+
+    @responses.activate
+    def test_corrupt_snapshot_is_ignored(self, tmp_path: Path) -> None:
+        snapshot_path(tmp_path, 2025, "mp4").write_bytes(b"not a pickle")
+        responses.add(responses.GET, _SCHEDULE_URL, body=SAMPLE_SCHEDULE_XML, status=200)
+        catalogue = load_catalogue(2025, "mp4", cache_dir=tmp_path)
+        assert len(catalogue.talks) == 3
+
+    @responses.activate
+    def test_http_error_raises(self, tmp_path: Path) -> None:
+        responses.add(responses.GET, _SCHEDULE_URL, body=b"", status=404)
+        with pytest.raises(RuntimeError, match="HTTP 404"):
+            load_catalogue(2025, "mp4", cache_dir=tmp_path)
+
+
+class TestMultiYear:
+    """Tests for load_catalogues and merge_catalogues."""
+
+    @responses.activate
+    def test_loads_each_year(self) -> None:
+        responses.add(responses.GET, _SCHEDULE_URL, body=SAMPLE_SCHEDULE_XML, status=200)
+        responses.add(responses.GET, _SCHEDULE_URL_2024, body=_SCHEDULE_XML_2024, status=200)
+        catalogues = load_catalogues([2025, 2024], "mp4")
+        assert list(catalogues) == [2024, 2025]
+        assert {t.year for t in catalogues[2024].talks} == {"2024"}
+
+    @responses.activate
+    def test_failed_year_is_skipped(self) -> None:
+        responses.add(responses.GET, _SCHEDULE_URL, body=SAMPLE_SCHEDULE_XML, status=200)
+        responses.add(responses.GET, _SCHEDULE_URL_2024, body=b"", status=404)
+        assert list(load_catalogues([2024, 2025], "mp4")) == [2025]
+
+    @responses.activate
+    def test_all_years_failing_raises(self) -> None:
+        responses.add(responses.GET, _SCHEDULE_URL_2024, body=b"", status=404)
+        with pytest.raises(RuntimeError):
+            load_catalogues([2024], "mp4")
+
+    @responses.activate
+    def test_merge_keeps_per_year_episode_numbers(self) -> None:
+        responses.add(responses.GET, _SCHEDULE_URL, body=SAMPLE_SCHEDULE_XML, status=200)
+        responses.add(responses.GET, _SCHEDULE_URL_2024, body=_SCHEDULE_XML_2024, status=200)
+        catalogues = load_catalogues([2024, 2025], "mp4")
+        merged = merge_catalogues(list(catalogues.values()))
+
+        assert len(merged.talks) == 6
+        welcome = [t for t in merged.talks if t.id == "fosdem-2025-welcome"]
+        # "Main Track" sorts after "Containers"; "Zig" does too
+        assert [lookup_episode(merged.episode_index, t) for t in welcome] == [(2, 1), (2, 1)]
+        security_2024 = next(
+            t for t in merged.talks if t.year == "2024" and t.id == "fosdem-2025-containers-security"
+        )
+        assert lookup_episode(merged.episode_index, security_2024) == (1, 2)
+
+
+class TestDefaultCacheDir:
+    """Tests for default_cache_dir."""
+
+    def test_honours_xdg_cache_home(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        assert default_cache_dir() == tmp_path / "fosdem-video"
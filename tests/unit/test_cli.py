@@ -2,12 +2,40 @@
 
 from __future__ import annotations
 
+import subprocess
+import sys
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-from fosdem_video.cli import parse_arguments
+from fosdem_video.cli import _place_talks, _refresh_library, _resume_run, parse_arguments
+from fosdem_video.download import get_output_path
+from fosdem_video.journal import RunJournal, journal_path
+from tests.conftest import make_talk
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Modules that ``import fosdem_video.cli`` must not load: each costs
+# startup time (requests/icalendar alone ~100 ms) and is only needed by the
+# code paths that use it.  Checked by name rather than by wall-clock time,
+# which varies too much between machines and runs.
+_DEFERRED_MODULES = (
+    "requests",
+    "urllib3",
+    "icalendar",
+    "ctypes",
+    "fosdem_video.bandwidth",
+    "fosdem_video.diskio",
+    "fosdem_video.journal",
+    "fosdem_video.lease",
+    "fosdem_video.ledger",
+    "fosdem_video.pipeline",
+    "fosdem_video.shard",
+    "fosdem_video.sources",
+    "fosdem_video.staging",
+    "fosdem_video.volumes",
+)
 
 
 class TestParseArguments:
@@ -67,6 +95,49 @@ class TestParseArguments:
         assert args.year == 2025
         assert args.ics is None
 
+    def test_year_range_and_list(self) -> None:
+        with patch("sys.argv", ["prog", "--year", "2019,2021-2023,2022"]):
+            args = parse_arguments()
+        assert args.years == [2019, 2021, 2022, 2023]
+        assert args.year is None
+
+    def test_single_year_sets_years(self) -> None:
+        with patch("sys.argv", ["prog", "--year", "2025"]):
+            args = parse_arguments()
+        assert args.years == [2025]
+
+    @pytest.mark.parametrize("value", ["abc", "2026-2015", "2025-", "25"])
+    def test_invalid_year_spec(self, value: str) -> None:
+        with (
+            patch("sys.argv", ["prog", "--year", value]),
+            pytest.raises(SystemExit),
+        ):
+            parse_arguments()
+
+    def test_track_with_year_range_accepted(self) -> None:
+        with patch("sys.argv", ["prog", "--year", "2024-2025", "--track", "Go"]):
+            args = parse_arguments()
+        assert args.track == "Go"
+
+    def test_shard_parsed(self) -> None:
+        with patch("sys.argv", ["prog", "--year", "2025", "--shard", "2/3"]):
+            args = parse_arguments()
+        assert args.shard == (2, 3)
+
+    def test_invalid_shard(self) -> None:
+        with (
+            patch("sys.argv", ["prog", "--year", "2025", "--shard", "4/3"]),
+            pytest.raises(SystemExit),
+        ):
+            parse_arguments()
+
+    def test_shard_by_size_requires_shard(self) -> None:
+        with (
+            patch("sys.argv", ["prog", "--year", "2025", "--shard-by-size"]),
+            pytest.raises(SystemExit),
+        ):
+            parse_arguments()
+
     def test_track_with_year_accepted(self) -> None:
         with patch("sys.argv", ["prog", "--year", "2025", "--track", "Go"]):
             args = parse_arguments()
@@ -118,3 +189,181 @@ class TestParseArguments:
             pytest.raises(SystemExit),
         ):
             parse_arguments()
+
+    def test_max_runtime_and_bandwidth_schedule(self) -> None:
+        argv = [
+            "prog",
+            "--year",
+            "2025",
+            "--max-runtime",
+            "6h",
+            "--bandwidth-schedule",
+            "01:00-06:00=unlimited,1M",
+        ]
+        with patch("sys.argv", argv):
+            args = parse_arguments()
+        assert args.max_runtime == 6 * 3600
+        assert args.bandwidth_schedule.default == 1024**2
+
+    @pytest.mark.parametrize(
+        "option", [["--max-runtime", "soon"], ["--bandwidth-schedule", "01:00-06:00=fast"]]
+    )
+    def test_invalid_runtime_or_schedule(self, option: list[str]) -> None:
+        with (
+            patch("sys.argv", ["prog", "--year", "2025", *option]),
+            pytest.raises(SystemExit),
+        ):
+            parse_arguments()
+
+    def test_stage_workers_must_be_positive(self) -> None:
+        with (
+            patch("sys.argv", ["prog", "--year", "2025", "--subtitle-workers", "0"]),
+            pytest.raises(SystemExit),
+        ):
+            parse_arguments()
+
+    def test_volumes_are_collected_with_the_output(self, tmp_path: Path) -> None:
+        with patch(
+            "sys.argv", ["prog", "--year", "2025", "-o", str(tmp_path / "a"), "--volume", str(tmp_path)]
+        ):
+            args = parse_arguments()
+        assert args.roots == [tmp_path / "a", tmp_path]
+        assert args.placement == "season"
+
+    @pytest.mark.parametrize("volume", ["missing", "."])
+    def test_invalid_volume(self, tmp_path: Path, volume: str) -> None:
+        with (
+            patch(
+                "sys.argv",
+                ["prog", "--year", "2025", "-o", str(tmp_path), "--volume", str(tmp_path / volume)],
+            ),
+            pytest.raises(SystemExit),
+        ):
+            parse_arguments()
+
+    def test_resume_run_needs_a_journal(self, tmp_path: Path) -> None:
+        with (
+            patch("sys.argv", ["prog", "--resume-run", "--output", str(tmp_path)]),
+            pytest.raises(SystemExit),
+        ):
+            parse_arguments()
+
+
+class TestPlaceTalks:
+    """Tests for choosing each talk's volume."""
+
+    def test_sizes_probed_for_sharding_are_reused(self, tmp_path: Path) -> None:
+        (tmp_path / "a").mkdir()
+        argv = ["prog", "--year", "2025", "-o", str(tmp_path), "--volume", str(tmp_path / "a")]
+        with patch("sys.argv", argv):
+            args = parse_arguments()
+        talk = make_talk()
+
+        with patch("fosdem_video.shard.probe_sizes") as probe:
+            roots, sizes = _place_talks(
+                args,
+                [talk],
+                "mp4",
+                jellyfin=False,
+                episode_index={},
+                sizes={talk.url: 5},
+            )
+
+        probe.assert_not_called()
+        assert roots[talk.url] in {tmp_path, tmp_path / "a"}
+        assert sizes == {talk.url: 5}
+
+    def test_resume_reuses_the_journalled_placement(self, tmp_path: Path) -> None:
+        main, extra = tmp_path / "main", tmp_path / "extra"
+        main.mkdir()
+        extra.mkdir()
+        talk = make_talk()
+        with RunJournal(journal_path(main)) as journal:
+            journal.write_plan(
+                [talk],
+                fmt="mp4",
+                jellyfin=False,
+                episode_index={},
+                roots={talk.url: extra},
+                sizes={talk.url: 5},
+            )
+            journal.record(talk, "failed")
+        argv = ["prog", "--resume-run", "-o", str(main), "--volume", str(extra), "--check-space"]
+        with patch("sys.argv", argv):
+            args = parse_arguments()
+
+        with (
+            patch("fosdem_video.shard.probe_sizes") as probe,
+            patch("fosdem_video.cli.plan_volumes") as plan,
+            patch("fosdem_video.cli.download_fosdem_videos", return_value=[True]) as download,
+        ):
+            _resume_run(args)
+
+        probe.assert_not_called()
+        plan.assert_not_called()
+        assert download.call_args.kwargs["roots"] == {talk.url: extra}
+
+
+class TestRefreshLibrary:
+    """Tests for --regenerate-nfo and --backfill-subtitles."""
+
+    def test_nfos_regenerated_only_on_the_volume_holding_the_video(self, tmp_path: Path) -> None:
+        main, extra = tmp_path / "main", tmp_path / "extra"
+        main.mkdir()
+        extra.mkdir()
+        argv = [
+            "prog",
+            "--year",
+            "2025",
+            "-o",
+            str(main),
+            "--volume",
+            str(extra),
+            "--jellyfin",
+            "--regenerate-nfo",
+        ]
+        with patch("sys.argv", argv):
+            args = parse_arguments()
+        talk = make_talk()
+        episode_index = {"2025/fosdem-2025-welcome": (1, 1)}
+        video = get_output_path(extra, talk, "mp4", jellyfin=True, episode_index=episode_index)
+        video.parent.mkdir(parents=True)
+        video.write_bytes(b"video")
+
+        _refresh_library(args, [talk], "mp4", episode_index)
+
+        assert video.with_suffix(".nfo").exists()
+        assert list(main.iterdir()) == []
+
+    def test_dry_run_backfill_fetches_nothing(self, tmp_path: Path) -> None:
+        argv = ["prog", "--year", "2025", "-o", str(tmp_path), "--backfill-subtitles", "--dry-run"]
+        with patch("sys.argv", argv):
+            args = parse_arguments()
+
+        with patch("fosdem_video.cli.backfill_subtitles", return_value=0) as backfill:
+            _refresh_library(args, [make_talk()], "mp4", {})
+
+        assert backfill.call_args.kwargs["dry_run"] is True
+
+
+def _run_python(*args: str) -> subprocess.CompletedProcess[str]:
+    """Run a fresh interpreter from the repository root."""
+    return subprocess.run(  # noqa: S603
+        [sys.executable, *args],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=_REPO_ROOT,
+    )
+
+
+class TestStartupImports:
+    """Regression checks for CLI cold-start cost."""
+
+    def test_heavy_dependencies_not_loaded_on_import(self) -> None:
+        result = _run_python(
+            "-c",
+            "import sys, fosdem_video.cli; print(' '.join(sorted(sys.modules)))",
+        )
+        loaded = set(result.stdout.split())
+        assert [name for name in _DEFERRED_MODULES if name in loaded] == []
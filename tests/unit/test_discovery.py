@@ -85,7 +85,7 @@ class TestParseScheduleXml:
         assert welcome.room == "Janson (K.1.105)"
         assert welcome.language == "en"
         assert welcome.event_type == "keynote"
-        assert welcome.persons == ["Speaker One"]
+        assert welcome.persons == ("Speaker One",)
         assert welcome.url.endswith(".mp4")
 
     @responses.activate
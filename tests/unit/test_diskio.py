@@ -0,0 +1,42 @@
+"""Unit tests for fosdem_video.diskio."""
+
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING
+
+import pytest
+
+from fosdem_video.diskio import preallocate, release_written
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestDiskHints:
+    """Tests for preallocate and release_written."""
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="fallocate is Linux-only")
+    def test_preallocate_keeps_the_visible_size(self, tmp_path: Path) -> None:
+        part = tmp_path / "talk.mp4.part"
+        with part.open("wb") as f:
+            f.write(b"x" * 10)
+            f.flush()
+            reserved = preallocate(f.fileno(), 10, 8 * 1024**2)
+
+        assert part.stat().st_size == 10
+        if reserved:  # not every filesystem supports it (e.g. tmpfs on old kernels)
+            assert part.stat().st_blocks * 512 >= 8 * 1024**2
+
+    def test_release_written_keeps_the_data(self, tmp_path: Path) -> None:
+        path = tmp_path / "talk.mp4"
+        with path.open("wb") as f:
+            f.write(b"x" * 4096)
+            f.flush()
+            release_written(f.fileno(), 0, 4096)
+
+        assert path.read_bytes() == b"x" * 4096
+
+    def test_nothing_to_reserve(self, tmp_path: Path) -> None:
+        with (tmp_path / "empty").open("wb") as f:
+            assert preallocate(f.fileno(), 0, 0) is False
@@ -2,19 +2,40 @@
 
 from __future__ import annotations
 
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
+import pytest
+import requests
 import responses
 
 from fosdem_video.download import (
+    RunInterruptedError,
+    StalledTransferError,
+    TransferWatchdog,
+    VideoNotFoundError,
+    _build_episode_index,
+    _graceful_stop,
+    backfill_subtitles,
     create_dirs,
+    download_fosdem_videos,
+    download_from_sources,
     download_video,
     download_vtt,
     get_output_path,
     is_downloaded,
+    lookup_episode,
+    regenerate_nfos,
 )
+from fosdem_video.journal import RunJournal, journal_path, load_run
+from fosdem_video.lease import LeaseQueue
+from fosdem_video.ledger import FailureLedger, ledger_path, subtitle_cache_path
 from fosdem_video.models import Talk
+from fosdem_video.sources import SourcePool
 from tests.conftest import make_talk
 
 
@@ -175,3 +196,685 @@ class TestCreateDirs:
         assert show_dir.is_dir()
         # tvshow.nfo should be written
         assert (show_dir / "tvshow.nfo").exists()
+
+    @patch("fosdem_video.download.copy_show_images")
+    @patch("fosdem_video.download.copy_season_images")
+    def test_jellyfin_metadata_written_once_per_show_and_season(
+        self, mock_season: MagicMock, mock_show: MagicMock, tmp_path: Path
+    ) -> None:
+        talks = [
+            make_talk(talk_id=f"go-{i}", track="Go", title=f"Go {i}", start=f"1{i}:00") for i in range(4)
+        ] + [make_talk(talk_id="rust-1", track="Rust", title="Rust 1")]
+        episode_index = _build_episode_index(talks)
+        create_dirs(
+            tmp_path,
+            talks,
+            jellyfin=True,
+            episode_index=episode_index,
+            metadata_workers=4,
+        )
+        assert mock_show.call_count == 1
+        assert mock_season.call_count == 2
+        assert (tmp_path / "Fosdem (2025)" / "Go" / "season.nfo").exists()
+        assert (tmp_path / "Fosdem (2025)" / "Rust" / "season.nfo").exists()
+        for talk in talks:
+            path = get_output_path(tmp_path, talk, "mp4", jellyfin=True, episode_index=episode_index)
+            assert path.parent.is_dir()
+
+
+class TestRegenerateNfos:
+    """Tests for regenerate_nfos."""
+
+    @patch("fosdem_video.download.copy_show_images")
+    @patch("fosdem_video.download.copy_season_images")
+    def test_writes_episode_nfos_only_for_existing_videos(
+        self, mock_season: MagicMock, mock_show: MagicMock, tmp_path: Path
+    ) -> None:
+        talks = [
+            make_talk(talk_id=f"go-{i}", track="Go", title=f"Go {i}", start=f"1{i}:00") for i in range(3)
+        ]
+        episode_index = _build_episode_index(talks)
+        present = get_output_path(tmp_path, talks[1], "mp4", jellyfin=True, episode_index=episode_index)
+        present.parent.mkdir(parents=True)
+        present.write_bytes(b"video")
+
+        count = regenerate_nfos(talks, tmp_path, "mp4", episode_index=episode_index)
+
+        assert count == 1
+        assert present.with_suffix(".nfo").exists()
+        assert (tmp_path / "Fosdem (2025)" / "tvshow.nfo").exists()
+        assert mock_show.call_count == 1
+        assert mock_season.call_count == 1
+
+
+class TestEpisodeIndex:
+    """Tests for _build_episode_index and lookup_episode."""
+
+    def test_single_year_keyed_by_slug(self) -> None:
+        talks = [
+            make_talk(talk_id="b", track="Rust", title="B"),
+            make_talk(talk_id="a", track="Go", title="A"),
+        ]
+        assert _build_episode_index(talks) == {"a": (1, 1), "b": (2, 1)}
+
+    def test_multi_year_numbered_independently(self) -> None:
+        talks = [
+            make_talk(talk_id="welcome", year="2024", track="Main", title="W"),
+            make_talk(talk_id="welcome", year="2025", track="Zig", title="W"),
+            make_talk(talk_id="go", year="2025", track="Go", title="G"),
+        ]
+        index = _build_episode_index(talks)
+        assert lookup_episode(index, talks[0]) == (1, 1)
+        assert lookup_episode(index, talks[1]) == (2, 1)
+        assert lookup_episode(index, talks[2]) == (1, 1)
+
+    def test_lookup_missing(self) -> None:
+        talk = make_talk()
+        assert lookup_episode(None, talk) is None
+        assert lookup_episode({"other": (1, 1)}, talk) is None
+
+
+class TestDownloadFosdemVideosWithLeases:
+    """Tests for lease-coordinated download_fosdem_videos."""
+
+    @responses.activate
+    def test_skips_talks_claimed_elsewhere(self, tmp_path: Path) -> None:
+        mine = Talk(url="https://video.fosdem.org/2025/r/mine.mp4", year="2025", id="mine", location="r")
+        theirs = Talk(
+            url="https://video.fosdem.org/2025/r/theirs.mp4", year="2025", id="theirs", location="r"
+        )
+        responses.add(responses.GET, mine.url, body=b"video", status=200)
+        create_dirs(tmp_path, [mine, theirs])
+
+        leases_dir = tmp_path / ".leases"
+        with LeaseQueue(leases_dir, owner="other") as other, LeaseQueue(leases_dir, owner="me") as me:
+            other.claim(theirs)
+            results = download_fosdem_videos([mine, theirs], tmp_path, "mp4", delay=0, no_vtt=True, leases=me)
+            # Only the other process's lease is still held
+            assert [p.name for p in leases_dir.iterdir()] == ["2025-theirs.lease"]
+
+        assert results == [True, False]
+        assert (tmp_path / "2025" / "mine.mp4").exists()
+        assert not (tmp_path / "2025" / "theirs.mp4").exists()
+
+    @responses.activate
+    def test_lease_is_held_until_the_talk_is_published(self, tmp_path: Path) -> None:
+        talk = Talk(url="https://video.fosdem.org/2025/r/held.mp4", year="2025", id="held", location="r")
+        responses.add(responses.GET, talk.url, body=b"video", status=200)
+        create_dirs(tmp_path, [talk])
+        leases_dir = tmp_path / ".leases"
+        held: list[bool] = []
+
+        def publish(*_args: object) -> None:
+            held.append((leases_dir / "2025-held.lease").exists())
+            msg = "disk gone"
+            raise OSError(msg)
+
+        ledger = FailureLedger(ledger_path(tmp_path))
+        with patch("fosdem_video.staging.publish", side_effect=publish), LeaseQueue(leases_dir) as leases:
+            results = download_fosdem_videos(
+                [talk], tmp_path, "mp4", delay=0, no_vtt=True, leases=leases, ledger=ledger
+            )
+            assert list(leases_dir.iterdir()) == []
+
+        assert held == [True]
+        assert results == [False]
+        assert "2025/held" in ledger.entries
+
+
+class TestDownloadFosdemVideosWithSources:
+    """Tests for source routing and failover in download_fosdem_videos."""
+
+    @responses.activate
+    def test_mirror_hit_skips_upstream(self, tmp_path: Path) -> None:
+        talk = Talk(url="https://video.fosdem.org/2025/r/hit.mp4", year="2025", id="hit", location="r")
+        responses.add(responses.GET, "http://cache.lan:8080/2025/r/hit.mp4", body=b"lan", status=200)
+        responses.add(responses.GET, "http://cache.lan:8080/2025/r/hit.vtt", body=b"WEBVTT", status=200)
+        create_dirs(tmp_path, [talk])
+
+        results = download_fosdem_videos(
+            [talk], tmp_path, "mp4", delay=0, sources=SourcePool(["http://cache.lan:8080"])
+        )
+
+        assert results == [True]
+        assert (tmp_path / "2025" / "hit.mp4").read_bytes() == b"lan"
+        assert (tmp_path / "2025" / "hit.vtt").read_bytes() == b"WEBVTT"
+        assert {c.request.url for c in responses.calls} == {
+            "http://cache.lan:8080/2025/r/hit.mp4",
+            "http://cache.lan:8080/2025/r/hit.vtt",
+        }
+
+    @responses.activate
+    def test_mirror_miss_falls_through_to_upstream(self, tmp_path: Path) -> None:
+        talk = Talk(url="https://video.fosdem.org/2025/r/miss.mp4", year="2025", id="miss", location="r")
+        responses.add(responses.GET, "http://cache.lan:8080/2025/r/miss.mp4", status=404)
+        responses.add(responses.GET, talk.url, body=b"upstream", status=200)
+        create_dirs(tmp_path, [talk])
+
+        results = download_fosdem_videos(
+            [talk], tmp_path, "mp4", delay=0, no_vtt=True, sources=SourcePool(["http://cache.lan:8080/"])
+        )
+
+        assert results == [True]
+        assert (tmp_path / "2025" / "miss.mp4").read_bytes() == b"upstream"
+
+    @responses.activate
+    def test_failing_source_is_failed_over_and_benched(self, tmp_path: Path) -> None:
+        talks = [
+            Talk(url=f"https://video.fosdem.org/2025/r/{slug}.mp4", year="2025", id=slug, location="r")
+            for slug in ("one", "two")
+        ]
+        responses.add(responses.GET, "http://broken/2025/r/one.mp4", status=403)
+        for talk in talks:
+            responses.add(responses.GET, talk.url, body=b"upstream", status=200)
+        create_dirs(tmp_path, talks)
+
+        pool = SourcePool(["http://broken"])
+        results = download_fosdem_videos(talks, tmp_path, "mp4", 1, delay=0, no_vtt=True, sources=pool)
+
+        assert results == [True, True]
+        # The broken mirror is tried once, then avoided for the second talk
+        assert [c.request.url for c in responses.calls] == [
+            "http://broken/2025/r/one.mp4",
+            talks[0].url,
+            talks[1].url,
+        ]
+        assert pool.sources[0].failures == 1
+        assert pool.sources[1].throughput is not None
+
+    @responses.activate
+    @patch("fosdem_video.sources._HEDGE_MIN_DELAY", 0.01)
+    def test_stalled_first_byte_is_hedged(self, tmp_path: Path) -> None:
+        url = "https://video.fosdem.org/2025/r/slow.mp4"
+        release = threading.Event()
+
+        def stalled(_request: object) -> tuple[int, dict[str, str], bytes]:
+            release.wait(5)
+            return 200, {}, b"stalled"
+
+        responses.add_callback(responses.GET, "http://stalled/2025/r/slow.mp4", callback=stalled)
+        responses.add(responses.GET, url, body=b"upstream", status=200)
+        pool = SourcePool(["http://stalled"])
+        for _ in range(20):
+            pool.record_ttfb(0.01)
+
+        path = tmp_path / "slow.mp4"
+        assert download_from_sources(url, path, pool) is True
+        release.set()
+
+        assert path.read_bytes() == b"upstream"
+        assert pool.hedging.fired == 1
+        assert pool.hedging.won == 1
+        deadline = time.monotonic() + 5
+        while not pool.hedging.saved and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert pool.hedging.saved > 0
+
+    @responses.activate
+    @patch("fosdem_video.sources._HEDGE_MIN_DELAY", 0.01)
+    def test_losing_response_is_closed_on_the_shared_pool(self, tmp_path: Path) -> None:
+        url = "https://video.fosdem.org/2025/r/slow.mp4"
+        release = threading.Event()
+
+        def stalled(_request: object) -> tuple[int, dict[str, str], bytes]:
+            release.wait(5)
+            return 200, {}, b"stalled"
+
+        responses.add_callback(responses.GET, "http://stalled/2025/r/slow.mp4", callback=stalled)
+        responses.add(responses.GET, url, body=b"upstream", status=200)
+        pool = SourcePool(["http://stalled"])
+        for _ in range(20):
+            pool.record_ttfb(0.01)
+        closed: list[str] = []
+        close = requests.Response.close
+
+        def record_close(response: requests.Response) -> None:
+            closed.append(response.url)
+            close(response)
+
+        with (
+            ThreadPoolExecutor(max_workers=2) as request_pool,
+            patch.object(requests.Response, "close", autospec=True, side_effect=record_close),
+        ):
+            assert download_from_sources(url, tmp_path / "slow.mp4", pool, request_pool=request_pool) is True
+            release.set()
+            deadline = time.monotonic() + 5
+            while "http://stalled/2025/r/slow.mp4" not in closed and time.monotonic() < deadline:
+                time.sleep(0.01)
+            # The pool outlives the download, for the next one
+            assert request_pool.submit(lambda: True).result() is True
+
+        assert "http://stalled/2025/r/slow.mp4" in closed
+
+
+class TestPostDownloadStages:
+    """Tests for the subtitle and metadata stages around a video download."""
+
+    @responses.activate
+    def test_subtitles_and_nfo_leave_the_download_slot(self, tmp_path: Path) -> None:
+        talk = Talk(
+            url="https://video.fosdem.org/2025/r/staged.mp4",
+            year="2025",
+            id="staged",
+            location="r",
+            title="Staged",
+        )
+        responses.add(responses.GET, talk.url, body=b"video", status=200)
+        responses.add(responses.GET, talk.url.replace(".mp4", ".vtt"), body=b"WEBVTT", status=200)
+        episode_index = {"2025/staged": (1, 1)}
+        create_dirs(tmp_path, [talk], jellyfin=True, episode_index=episode_index)
+        threads: list[str] = []
+
+        def vtt(*args: object, **kwargs: object) -> bool:
+            threads.append(threading.current_thread().name)
+            return download_vtt(*args, **kwargs)  # type: ignore[arg-type]
+
+        with (
+            patch("fosdem_video.download.download_vtt", side_effect=vtt),
+            RunJournal(journal_path(tmp_path)) as journal,
+        ):
+            journal.write_plan([talk], fmt="mp4", jellyfin=True, episode_index=episode_index)
+            results = download_fosdem_videos(
+                [talk], tmp_path, "mp4", delay=0, jellyfin=True, episode_index=episode_index, journal=journal
+            )
+
+        video = get_output_path(tmp_path, talk, "mp4", jellyfin=True, episode_index=episode_index)
+        assert results == [True]
+        assert [name.startswith("subtitle-") for name in threads] == [True]
+        assert video.with_suffix(".vtt").read_bytes() == b"WEBVTT"
+        assert video.with_suffix(".nfo").exists()
+        assert not [p for p in video.parent.iterdir() if p.name.startswith(".")]
+        assert load_run(journal_path(tmp_path)).states == {"2025/staged": "done"}
+
+    @responses.activate
+    def test_subtitles_are_fetched_during_the_video_transfer(self, tmp_path: Path) -> None:
+        talk = Talk(
+            url="https://video.fosdem.org/2025/r/overlap.mp4", year="2025", id="overlap", location="r"
+        )
+        fetched = threading.Event()
+        overlapped: list[bool] = []
+
+        def video(_request: object) -> tuple[int, dict[str, str], bytes]:
+            overlapped.append(fetched.wait(5))
+            return 200, {}, b"video"
+
+        def vtt(*args: object, **kwargs: object) -> bool:
+            result = download_vtt(*args, **kwargs)  # type: ignore[arg-type]
+            fetched.set()
+            return result
+
+        responses.add_callback(responses.GET, talk.url, callback=video)
+        responses.add(responses.GET, talk.url.replace(".mp4", ".vtt"), body=b"WEBVTT", status=200)
+        create_dirs(tmp_path, [talk])
+
+        with patch("fosdem_video.download.download_vtt", side_effect=vtt):
+            results = download_fosdem_videos([talk], tmp_path, "mp4", delay=0)
+
+        assert results == [True]
+        assert overlapped == [True]
+        assert (tmp_path / "2025" / "overlap.vtt").read_bytes() == b"WEBVTT"
+
+    @responses.activate
+    def test_subtitles_of_a_missing_video_are_dropped(self, tmp_path: Path) -> None:
+        talk = Talk(url="https://video.fosdem.org/2025/r/gone.mp4", year="2025", id="gone", location="r")
+        responses.add(responses.GET, talk.url, status=404)
+        responses.add(responses.GET, talk.url.replace(".mp4", ".vtt"), body=b"WEBVTT", status=200)
+        create_dirs(tmp_path, [talk])
+
+        results = download_fosdem_videos([talk], tmp_path, "mp4", delay=0)
+
+        assert results == [False]
+        assert list((tmp_path / "2025").iterdir()) == []
+
+
+class TestStagingDir:
+    """Tests for downloading through a staging directory."""
+
+    @responses.activate
+    def test_files_are_moved_into_the_library(self, tmp_path: Path) -> None:
+        talk = Talk(url="https://video.fosdem.org/2025/r/staged.mp4", year="2025", id="staged", location="r")
+        responses.add(responses.GET, talk.url, body=b"video", status=200)
+        responses.add(responses.GET, talk.url.replace(".mp4", ".vtt"), body=b"WEBVTT", status=200)
+        library, scratch = tmp_path / "library", tmp_path / "scratch"
+        create_dirs(library, [talk])
+
+        results = download_fosdem_videos([talk], library, "mp4", delay=0, staging_dir=scratch)
+
+        assert results == [True]
+        assert (library / "2025" / "staged.mp4").read_bytes() == b"video"
+        assert (library / "2025" / "staged.vtt").read_bytes() == b"WEBVTT"
+        assert list((scratch / "2025").iterdir()) == []
+
+    @responses.activate
+    def test_unpublished_video_is_not_fetched_again(self, tmp_path: Path) -> None:
+        talk = Talk(url="https://video.fosdem.org/2025/r/left.mp4", year="2025", id="left", location="r")
+        library, scratch = tmp_path / "library", tmp_path / "scratch"
+        create_dirs(library, [talk])
+        (scratch / "2025").mkdir(parents=True)
+        (scratch / "2025" / ".pending.left.mp4").write_bytes(b"video")
+
+        results = download_fosdem_videos([talk], library, "mp4", delay=0, no_vtt=True, staging_dir=scratch)
+
+        assert results == [True]
+        assert len(responses.calls) == 0
+        assert (library / "2025" / "left.mp4").read_bytes() == b"video"
+
+
+class TestBackfillSubtitles:
+    """Tests for backfill_subtitles."""
+
+    @responses.activate
+    def test_fetches_only_missing_subtitles_and_caches_404s(self, tmp_path: Path) -> None:
+        late, missing, complete, absent = (
+            Talk(url=f"https://video.fosdem.org/2025/r/{slug}.mp4", year="2025", id=slug, location="r")
+            for slug in ("late", "missing", "complete", "absent")
+        )
+        talks = [late, missing, complete, absent]
+        create_dirs(tmp_path, talks)
+        for talk in (late, missing, complete):
+            (tmp_path / "2025" / f"{talk.id}.mp4").write_bytes(b"video")
+        (tmp_path / "2025" / "complete.vtt").write_text("WEBVTT")
+        responses.add(responses.GET, "https://video.fosdem.org/2025/r/late.vtt", body=b"WEBVTT", status=200)
+        responses.add(responses.GET, "https://video.fosdem.org/2025/r/missing.vtt", status=404)
+        cache = FailureLedger(subtitle_cache_path(tmp_path))
+
+        assert backfill_subtitles(talks, tmp_path, "mp4", cache=cache) == 1
+        assert (tmp_path / "2025" / "late.vtt").read_bytes() == b"WEBVTT"
+        assert len(responses.calls) == 2
+
+        cache = FailureLedger(subtitle_cache_path(tmp_path))
+        assert list(cache.entries) == ["2025/missing"]
+        assert backfill_subtitles(talks, tmp_path, "mp4", cache=cache) == 0
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_dry_run_only_lists_what_is_due(self, tmp_path: Path) -> None:
+        talk = Talk(url="https://video.fosdem.org/2025/r/late.mp4", year="2025", id="late", location="r")
+        create_dirs(tmp_path, [talk])
+        (tmp_path / "2025" / "late.mp4").write_bytes(b"video")
+        responses.add(responses.GET, "https://video.fosdem.org/2025/r/late.vtt", status=404)
+        cache = FailureLedger(subtitle_cache_path(tmp_path))
+
+        assert backfill_subtitles([talk], tmp_path, "mp4", cache=cache, dry_run=True) == 0
+
+        assert len(responses.calls) == 0
+        assert cache.entries == {}
+        assert [p.name for p in (tmp_path / "2025").iterdir()] == ["late.mp4"]
+        assert not subtitle_cache_path(tmp_path).exists()
+
+    @responses.activate
+    def test_errors_are_not_cached_as_missing(self, tmp_path: Path) -> None:
+        talk = Talk(url="https://video.fosdem.org/2025/r/flaky.mp4", year="2025", id="flaky", location="r")
+        create_dirs(tmp_path, [talk])
+        (tmp_path / "2025" / "flaky.mp4").write_bytes(b"video")
+        responses.add(responses.GET, "https://video.fosdem.org/2025/r/flaky.vtt", status=503)
+        cache = FailureLedger(subtitle_cache_path(tmp_path))
+
+        assert backfill_subtitles([talk], tmp_path, "mp4", cache=cache) == 0
+        assert cache.entries == {}
+
+
+class TestVolumes:
+    """Tests for downloading into several library roots."""
+
+    @responses.activate
+    def test_talks_go_to_their_planned_volume(self, tmp_path: Path) -> None:
+        talks = [
+            Talk(url=f"https://video.fosdem.org/2025/r/{slug}.mp4", year="2025", id=slug, location="r")
+            for slug in ("first", "second")
+        ]
+        for talk in talks:
+            responses.add(responses.GET, talk.url, body=talk.id.encode(), status=200)
+        main, extra = tmp_path / "main", tmp_path / "extra"
+        create_dirs(main, talks[:1])
+        create_dirs(extra, talks[1:])
+
+        results = download_fosdem_videos(
+            talks, main, "mp4", delay=0, no_vtt=True, roots={talks[1].url: extra}
+        )
+
+        assert results == [True, True]
+        assert (main / "2025" / "first.mp4").read_bytes() == b"first"
+        assert (extra / "2025" / "second.mp4").read_bytes() == b"second"
+        assert not (main / "2025" / "second.mp4").exists()
+
+    @responses.activate
+    def test_talk_finished_on_another_volume_is_not_fetched(self, tmp_path: Path) -> None:
+        talk = Talk(url="https://video.fosdem.org/2025/r/done.mp4", year="2025", id="done", location="r")
+        main, extra = tmp_path / "main", tmp_path / "extra"
+        create_dirs(main, [talk])
+        create_dirs(extra, [talk])
+        (extra / "2025" / "done.mp4").write_bytes(b"video")
+
+        with LeaseQueue(tmp_path / ".leases") as leases:
+            results = download_fosdem_videos(
+                [talk], main, "mp4", delay=0, no_vtt=True, leases=leases, volumes=[main, extra]
+            )
+
+        assert results == [True]
+        assert len(responses.calls) == 0
+        assert not (main / "2025" / "done.mp4").exists()
+
+    @responses.activate
+    def test_video_larger_than_the_free_space_is_not_started(self, tmp_path: Path) -> None:
+        url = "https://video.fosdem.org/2025/r/big.mp4"
+        for source_url in ("http://cache.lan:8080/2025/r/big.mp4", url):
+            responses.add(
+                responses.GET, source_url, body=b"video", status=200, headers={"Content-Length": "5"}
+            )
+        output = tmp_path / "big.mp4"
+        pool = SourcePool(["http://cache.lan:8080"])
+
+        with patch("fosdem_video.volumes.free_space", return_value=4):
+            assert download_from_sources(url, output, pool) is False
+
+        assert len(responses.calls) == 1
+        assert list(tmp_path.iterdir()) == []
+        assert all(source.failures == 0 for source in pool.sources)
+
+
+class TestTransferWatchdog:
+    """Tests for TransferWatchdog."""
+
+    @patch("fosdem_video.download.time.monotonic")
+    def test_grace_period_then_sliding_window(self, clock: MagicMock) -> None:
+        clock.return_value = 0.0
+        watchdog = TransferWatchdog(min_rate=100, window=10)
+
+        clock.return_value = 5.0
+        watchdog.update(0)  # nothing yet, but still within the first window
+        clock.return_value = 10.0
+        watchdog.update(2000)  # 200 B/s over 10s
+        clock.return_value = 20.0
+        with pytest.raises(StalledTransferError, match="last 10s"):
+            watchdog.update(2500)  # 50 B/s over the last 10s
+
+    @patch("fosdem_video.download.time.monotonic")
+    def test_fast_transfer_never_stalls(self, clock: MagicMock) -> None:
+        clock.return_value = 0.0
+        watchdog = TransferWatchdog(min_rate=100, window=10)
+        for second in range(1, 60):
+            clock.return_value = float(second)
+            watchdog.update(second * 1000)
+
+    @patch("fosdem_video.download.time.monotonic")
+    def test_throttled_time_is_excluded(self, clock: MagicMock) -> None:
+        clock.return_value = 0.0
+        watchdog = TransferWatchdog(min_rate=100, window=10)
+        clock.return_value = 10.0
+        watchdog.update(2000)
+        clock.return_value = 30.0
+        watchdog.exclude(19.0)  # held back by the bandwidth limit
+        watchdog.update(2500)  # 500 B over 1 unthrottled second
+
+
+class TestStalledTransfers:
+    """Tests for stall handling, resume and requeueing."""
+
+    BODY = bytes(range(256)) * 1200  # a little over one 256 KiB chunk
+
+    @responses.activate
+    def test_stall_keeps_partial_and_requeued_attempt_resumes(self, tmp_path: Path) -> None:
+        talk = Talk(url="https://video.fosdem.org/2025/r/slow.mp4", year="2025", id="slow", location="r")
+        chunk = 256 * 1024
+        responses.add(responses.GET, talk.url, body=self.BODY, status=200)
+        responses.add(
+            responses.GET,
+            talk.url,
+            body=self.BODY[chunk:],
+            status=206,
+            headers={"Content-Range": f"bytes {chunk}-{len(self.BODY) - 1}/{len(self.BODY)}"},
+        )
+        create_dirs(tmp_path, [talk])
+
+        with patch.object(TransferWatchdog, "update", side_effect=[StalledTransferError("slow"), None, None]):
+            results = download_fosdem_videos([talk], tmp_path, "mp4", delay=0, no_vtt=True, requeue_delay=0)
+
+        assert results == [True]
+        assert (tmp_path / "2025" / "slow.mp4").read_bytes() == self.BODY
+        assert not (tmp_path / "2025" / "slow.mp4.part").exists()
+        assert "Range" not in responses.calls[0].request.headers
+        assert responses.calls[1].request.headers["Range"] == f"bytes={chunk}-"
+
+    @responses.activate
+    def test_gives_up_after_max_requeues(self, tmp_path: Path) -> None:
+        talk = Talk(url="https://video.fosdem.org/2025/r/slow.mp4", year="2025", id="slow", location="r")
+        responses.add(responses.GET, talk.url, body=self.BODY, status=200)
+        create_dirs(tmp_path, [talk])
+
+        with patch.object(TransferWatchdog, "update", side_effect=StalledTransferError("slow")):
+            results = download_fosdem_videos(
+                [talk], tmp_path, "mp4", delay=0, no_vtt=True, max_requeues=1, requeue_delay=0
+            )
+
+        assert results == [False]
+        assert len(responses.calls) == 2
+        assert not (tmp_path / "2025" / "slow.mp4").exists()
+        assert (tmp_path / "2025" / "slow.mp4.part").exists()
+
+
+class TestEndOfRunRetries:
+    """Tests for end-of-run retry rounds and the failure ledger."""
+
+    @responses.activate
+    def test_retry_round_recovers_transient_failure(self, tmp_path: Path) -> None:
+        talk = Talk(url="https://video.fosdem.org/2025/r/flaky.mp4", year="2025", id="flaky", location="r")
+        responses.add(responses.GET, talk.url, status=500)
+        responses.add(responses.GET, talk.url, body=b"video", status=200)
+        create_dirs(tmp_path, [talk])
+        ledger = FailureLedger(ledger_path(tmp_path))
+
+        with patch("fosdem_video.sources.FAILURE_COOLDOWN", 0):
+            results = download_fosdem_videos(
+                [talk], tmp_path, "mp4", delay=0, no_vtt=True, retries=1, retry_delay=0, ledger=ledger
+            )
+
+        assert results == [True]
+        assert ledger.entries == {}
+
+    @responses.activate
+    def test_missing_video_is_not_retried_but_recorded(self, tmp_path: Path) -> None:
+        talk = Talk(url="https://video.fosdem.org/2025/r/gone.mp4", year="2025", id="gone", location="r")
+        responses.add(responses.GET, talk.url, status=404)
+        create_dirs(tmp_path, [talk])
+        ledger = FailureLedger(ledger_path(tmp_path))
+
+        results = download_fosdem_videos(
+            [talk], tmp_path, "mp4", delay=0, no_vtt=True, retries=2, retry_delay=0, ledger=ledger
+        )
+
+        assert results == [False]
+        assert len(responses.calls) == 1
+        assert FailureLedger(ledger_path(tmp_path)).entries["2025/gone"]["failures"] == 1
+
+    @responses.activate
+    def test_all_sources_missing_raises(self, tmp_path: Path) -> None:
+        url = "https://video.fosdem.org/2025/r/gone.mp4"
+        responses.add(responses.GET, "http://mirror/2025/r/gone.mp4", status=404)
+        responses.add(responses.GET, url, status=404)
+
+        with pytest.raises(VideoNotFoundError):
+            download_from_sources(url, tmp_path / "gone.mp4", SourcePool(["http://mirror"]))
+
+
+class TestGracefulStop:
+    """Tests for stopping a run on SIGINT/SIGTERM."""
+
+    BODY = bytes(range(256)) * 1200  # a little over one 256 KiB chunk
+
+    def test_signal_sets_stop_and_restores_handlers(self) -> None:
+        before = signal.getsignal(signal.SIGTERM)
+        seen: list[bool] = []
+
+        def run() -> None:
+            with _graceful_stop() as stop:
+                signal.raise_signal(signal.SIGTERM)
+                seen.append(stop.is_set())
+
+        with pytest.raises(RunInterruptedError) as excinfo:
+            run()
+        assert seen == [True]
+        assert excinfo.value.signum == signal.SIGTERM
+        assert signal.getsignal(signal.SIGTERM) is before
+
+    @responses.activate
+    def test_stop_keeps_partial_and_leaves_queue(self, tmp_path: Path) -> None:
+        first, second = (
+            Talk(url=f"https://video.fosdem.org/2025/r/{slug}.mp4", year="2025", id=slug, location="r")
+            for slug in ("first", "second")
+        )
+        for talk in (first, second):
+            responses.add(responses.GET, talk.url, body=self.BODY, status=200)
+        create_dirs(tmp_path, [first, second])
+        ledger = FailureLedger(ledger_path(tmp_path))
+
+        raised: list[int] = []
+
+        def interrupt(_total: int) -> None:
+            if not raised:
+                raised.append(signal.SIGINT)
+                signal.raise_signal(signal.SIGINT)
+                # The handler runs in the main thread at its next poll
+                time.sleep(0.5)
+
+        with (
+            patch.object(TransferWatchdog, "update", side_effect=interrupt),
+            patch("fosdem_video.download._STOP_POLL_INTERVAL", 0.01),
+            RunJournal(journal_path(tmp_path)) as journal,
+        ):
+            journal.write_plan([first, second], fmt="mp4", jellyfin=False, episode_index={})
+            with pytest.raises(RunInterruptedError):
+                download_fosdem_videos(
+                    [first, second],
+                    tmp_path,
+                    "mp4",
+                    num_workers=1,
+                    delay=0,
+                    no_vtt=True,
+                    retries=1,
+                    retry_delay=0,
+                    ledger=ledger,
+                    journal=journal,
+                )
+
+        assert len(responses.calls) == 1
+        assert (tmp_path / "2025" / "first.mp4.part").stat().st_size == 256 * 1024
+        assert not (tmp_path / "2025" / "first.mp4").exists()
+        assert ledger.entries == {}
+        assert load_run(journal_path(tmp_path)).pending() == [first, second]
+
+    @responses.activate
+    def test_max_runtime_stops_run(self, tmp_path: Path) -> None:
+        talk = Talk(url="https://video.fosdem.org/2025/r/long.mp4", year="2025", id="long", location="r")
+        responses.add(responses.GET, talk.url, body=self.BODY, status=200)
+        create_dirs(tmp_path, [talk])
+
+        with (
+            patch.object(TransferWatchdog, "update", side_effect=lambda _total: time.sleep(0.3)),
+            pytest.raises(RunInterruptedError) as excinfo,
+        ):
+            download_fosdem_videos([talk], tmp_path, "mp4", delay=0, no_vtt=True, max_runtime=0.05)
+
+        assert excinfo.value.signum is None
+        assert (tmp_path / "2025" / "long.mp4.part").exists()
+        assert not (tmp_path / "2025" / "long.mp4").exists()
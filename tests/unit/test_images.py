@@ -2,9 +2,19 @@
 
 from __future__ import annotations
 
+import errno
+import os
 from pathlib import Path
+from unittest.mock import patch
 
-from fosdem_video.images import copy_season_images, copy_show_images, resolve_assets
+from fosdem_video.images import (
+    _copy_image,
+    _place_image,
+    copy_season_images,
+    copy_show_images,
+    invalidate_asset_index,
+    resolve_assets,
+)
 
 
 def _create_asset(assets_dir: Path, name: str) -> Path:
@@ -66,6 +76,50 @@ class TestResolveAssets:
         assert result[1].name == "fosdem-backdrop-1.jpg"
         assert result[2].name == "fosdem-backdrop-2.jpg"
 
+    def test_numbered_ordering_across_extensions(self, tmp_path: Path) -> None:
+        assets = tmp_path / "assets"
+        assets.mkdir()
+        _create_asset(assets, "fosdem-backdrop-2.jpg")
+        _create_asset(assets, "fosdem-backdrop.png")
+        _create_asset(assets, "fosdem-backdrop-1.png")
+        _create_asset(assets, "fosdem-backdrop-x.jpg")
+        _create_asset(assets, "fosdem-backdrop.gif")
+
+        result = resolve_assets(assets, "2026", "backdrop")
+        assert [p.name for p in result] == [
+            "fosdem-backdrop.png",
+            "fosdem-backdrop-1.png",
+            "fosdem-backdrop-2.jpg",
+        ]
+
+
+class TestAssetIndex:
+    """Tests for the in-memory asset index."""
+
+    def test_directory_scanned_once(self, tmp_path: Path) -> None:
+        assets = tmp_path / "assets"
+        assets.mkdir()
+        _create_asset(assets, "track-go-poster.jpg")
+
+        with patch("fosdem_video.images.os.scandir", wraps=os.scandir) as scan:
+            for image_type in ("primary", "logo", "backdrop", "banner", "poster"):
+                resolve_assets(assets, "2026", image_type, track_slug="go")
+                resolve_assets(assets, "2026", image_type)
+        assert scan.call_count == 1
+
+    def test_invalidate_picks_up_new_files(self, tmp_path: Path) -> None:
+        assets = tmp_path / "assets"
+        assets.mkdir()
+        assert resolve_assets(assets, "2026", "primary") == []
+
+        _create_asset(assets, "fosdem-primary.jpg")
+        assert resolve_assets(assets, "2026", "primary") == []
+
+        invalidate_asset_index(assets)
+        assert [p.name for p in resolve_assets(assets, "2026", "primary")] == [
+            "fosdem-primary.jpg",
+        ]
+
 
 class TestCopyShowImages:
     """Tests for copy_show_images."""
@@ -107,3 +161,49 @@ class TestCopySeasonImages:
         season_dir.mkdir()
         # Should not raise
         copy_season_images(tmp_path / "nonexistent", season_dir, "2025", "Go")
+
+
+class TestCopyImage:
+    """Tests for _copy_image placement and up-to-date skipping."""
+
+    def test_skips_identical_destination(self, tmp_path: Path) -> None:
+        src = _create_asset(tmp_path, "src.jpg")
+        dest = tmp_path / "out" / "poster.jpg"
+        assert _copy_image(src, dest) is True
+
+        with patch("fosdem_video.images._place_image") as place:
+            assert _copy_image(src, dest) is True
+        place.assert_not_called()
+
+    def test_replaces_stale_destination(self, tmp_path: Path) -> None:
+        src = _create_asset(tmp_path, "src.jpg")
+        dest = tmp_path / "poster.jpg"
+        dest.write_bytes(b"old")
+
+        assert _copy_image(src, dest) is True
+        assert dest.read_bytes() == b"fake-image-data"
+        assert dest.stat().st_mtime_ns == src.stat().st_mtime_ns
+        assert list(tmp_path.glob(".*.tmp")) == []
+
+    def test_falls_back_to_hardlink(self, tmp_path: Path) -> None:
+        src = _create_asset(tmp_path, "src.jpg")
+        dest = tmp_path / "poster.jpg"
+
+        with patch("fosdem_video.images.fcntl.ioctl", side_effect=OSError(errno.EOPNOTSUPP, "no reflink")):
+            assert _place_image(src, dest) == "hardlink"
+        assert dest.stat().st_ino == src.stat().st_ino
+
+    def test_falls_back_to_copy(self, tmp_path: Path) -> None:
+        src = _create_asset(tmp_path, "src.jpg")
+        dest = tmp_path / "poster.jpg"
+
+        with (
+            patch("fosdem_video.images.fcntl.ioctl", side_effect=OSError(errno.EOPNOTSUPP, "no reflink")),
+            patch("fosdem_video.images.os.link", side_effect=OSError(errno.EXDEV, "cross-device")),
+        ):
+            assert _place_image(src, dest) == "copy"
+        assert dest.read_bytes() == b"fake-image-data"
+        assert dest.stat().st_ino != src.stat().st_ino
+
+    def test_failure_returns_false(self, tmp_path: Path) -> None:
+        assert _copy_image(tmp_path / "missing.jpg", tmp_path / "poster.jpg") is False
@@ -0,0 +1,118 @@
+"""Unit tests for fosdem_video.journal."""
+
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+import pytest
+
+from fosdem_video.journal import RunJournal, find_journal, journal_path, load_run, prune_journals
+from tests.conftest import make_talk
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestRunJournal:
+    """Tests for RunJournal and load_run."""
+
+    def test_round_trip_and_pending(self, tmp_path: Path) -> None:
+        done, failed, missing, untouched = (
+            make_talk(talk_id=slug) for slug in ("done", "failed", "missing", "untouched")
+        )
+        talks = [done, failed, missing, untouched]
+        with RunJournal(journal_path(tmp_path)) as journal:
+            journal.write_plan(
+                talks,
+                fmt="mp4",
+                jellyfin=True,
+                episode_index={"2025/done": (1, 2)},
+                roots={done.url: tmp_path / "extra"},
+                sizes={done.url: 5, failed.url: 7},
+            )
+            journal.write_sources([{"base": "http://lan", "latency": 0.01, "throughput": 1e8}])
+            for talk in talks[:3]:
+                journal.record(talk, "started")
+            journal.record(done, "done")
+            journal.record(failed, "failed")
+            journal.record(missing, "missing")
+
+        plan = load_run(journal_path(tmp_path))
+
+        assert plan.talks == talks
+        assert plan.fmt == "mp4"
+        assert plan.jellyfin is True
+        assert plan.episode_index == {"2025/done": (1, 2)}
+        assert plan.roots == {done.url: tmp_path / "extra"}
+        assert plan.sizes == {done.url: 5, failed.url: 7}
+        assert plan.sources[0]["base"] == "http://lan"
+        assert plan.finished is True
+        assert plan.pending() == [failed, untouched]
+
+    def test_stopped_run_and_torn_last_line(self, tmp_path: Path) -> None:
+        path = journal_path(tmp_path)
+        talk = make_talk()
+        journal = RunJournal(path).__enter__()
+        journal.write_plan([talk], fmt="mp4", jellyfin=False, episode_index={})
+        journal.__exit__(KeyboardInterrupt, KeyboardInterrupt(), None)
+        with path.open("a") as f:
+            f.write('{"event":"talk","talk":"2025/fos')
+
+        plan = load_run(path)
+
+        assert plan.finished is False
+        assert plan.pending() == [talk]
+
+    def test_resume_appends(self, tmp_path: Path) -> None:
+        path = journal_path(tmp_path)
+        talk = make_talk()
+        with RunJournal(path) as journal:
+            journal.write_plan([talk], fmt="mp4", jellyfin=False, episode_index={})
+        with RunJournal(path, resume=True) as journal:
+            journal.record(talk, "done")
+
+        assert load_run(path).pending() == []
+
+    def test_missing_or_planless_journal(self, tmp_path: Path) -> None:
+        path = journal_path(tmp_path)
+        with pytest.raises(ValueError, match="no run journal"):
+            load_run(path)
+        path.parent.mkdir()
+        path.write_text('{"event":"finished"}\n')
+        with pytest.raises(ValueError, match="no usable plan"):
+            load_run(path)
+
+
+class TestFindJournal:
+    """Tests for find_journal and prune_journals."""
+
+    def _run(self, path: Path, *, finished: bool, mtime: float) -> Path:
+        journal = RunJournal(path).__enter__()
+        journal.write_plan([make_talk()], fmt="mp4", jellyfin=False, episode_index={})
+        journal.__exit__(
+            *((None, None, None) if finished else (KeyboardInterrupt, KeyboardInterrupt(), None))
+        )
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_each_process_has_its_own_journal(self, tmp_path: Path) -> None:
+        path = journal_path(tmp_path)
+        assert path.parent == tmp_path / ".runs"
+        assert path.stem.endswith(f"-{os.getpid()}")
+
+    def test_latest_unfinished_run_of_this_host(self, tmp_path: Path) -> None:
+        runs = journal_path(tmp_path).parent
+        host = journal_path(tmp_path).stem.rpartition("-")[0]
+        stopped = self._run(runs / f"{host}-1.jsonl", finished=False, mtime=100)
+        self._run(runs / f"{host}-2.jsonl", finished=True, mtime=200)
+        self._run(runs / "other-host-3.jsonl", finished=False, mtime=300)
+
+        assert find_journal(tmp_path) == stopped
+        prune_journals(tmp_path)
+        assert {path.name for path in runs.iterdir()} == {f"{host}-1.jsonl", "other-host-3.jsonl"}
+
+    def test_no_run_of_this_host(self, tmp_path: Path) -> None:
+        assert find_journal(tmp_path) is None
+        self._run(tmp_path / ".runs" / "other-host-3.jsonl", finished=False, mtime=300)
+        assert find_journal(tmp_path) is None
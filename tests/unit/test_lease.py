@@ -0,0 +1,77 @@
+"""Unit tests for fosdem_video.lease."""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+from fosdem_video.lease import LeaseQueue
+from tests.conftest import make_talk
+
+
+def _age(path: Path, seconds: float) -> None:
+    """Backdate *path*'s mtime by *seconds*."""
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+class TestLeaseQueue:
+    """Tests for LeaseQueue."""
+
+    def test_claim_is_exclusive(self, tmp_path: Path) -> None:
+        talk = make_talk()
+        with LeaseQueue(tmp_path, owner="a") as a, LeaseQueue(tmp_path, owner="b") as b:
+            assert a.claim(talk) is True
+            assert b.claim(talk) is False
+            assert a.claim(talk) is False
+
+    def test_release_frees_the_talk(self, tmp_path: Path) -> None:
+        talk = make_talk()
+        with LeaseQueue(tmp_path, owner="a") as a, LeaseQueue(tmp_path, owner="b") as b:
+            a.claim(talk)
+            a.release(talk)
+            assert b.claim(talk) is True
+
+    def test_release_by_non_holder_is_noop(self, tmp_path: Path) -> None:
+        talk = make_talk()
+        with LeaseQueue(tmp_path, owner="a") as a, LeaseQueue(tmp_path, owner="b") as b:
+            a.claim(talk)
+            b.release(talk)
+            assert list(tmp_path.glob("*.lease"))
+
+    def test_expired_lease_is_reclaimed(self, tmp_path: Path) -> None:
+        talk = make_talk()
+        crashed = LeaseQueue(tmp_path, ttl=60, owner="crashed")
+        assert crashed.claim(talk) is True
+        _age(next(tmp_path.glob("*.lease")), 120)
+
+        with LeaseQueue(tmp_path, ttl=60, owner="b") as b:
+            assert b.claim(talk) is True
+        assert list(tmp_path.iterdir()) == []
+
+    def test_heartbeat_keeps_lease_alive(self, tmp_path: Path) -> None:
+        talk = make_talk()
+        with LeaseQueue(tmp_path, ttl=60, owner="a") as a, LeaseQueue(tmp_path, ttl=60, owner="b") as b:
+            a.claim(talk)
+            lease = next(tmp_path.glob("*.lease"))
+            _age(lease, 120)
+            a.heartbeat()
+            assert b.claim(talk) is False
+
+    def test_lost_lease_dropped_on_heartbeat(self, tmp_path: Path) -> None:
+        talk = make_talk()
+        with LeaseQueue(tmp_path, ttl=60, owner="a") as a, LeaseQueue(tmp_path, ttl=60, owner="b") as b:
+            a.claim(talk)
+            _age(next(tmp_path.glob("*.lease")), 120)
+            assert b.claim(talk) is True
+            a.heartbeat()
+            a.release(talk)
+            # b still holds it: a must not remove b's lease
+            assert len(list(tmp_path.glob("*.lease"))) == 1
+
+    def test_exit_releases_held_leases(self, tmp_path: Path) -> None:
+        with LeaseQueue(tmp_path) as queue:
+            queue.claim(make_talk(talk_id="a"))
+            queue.claim(make_talk(talk_id="b"))
+        assert list(tmp_path.glob("*.lease")) == []
@@ -0,0 +1,71 @@
+"""Unit tests for fosdem_video.ledger."""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import TYPE_CHECKING
+
+from fosdem_video.ledger import FailureLedger, ledger_path
+from tests.conftest import make_talk
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestFailureLedger:
+    """Tests for FailureLedger."""
+
+    def test_missing_file_starts_empty(self, tmp_path: Path) -> None:
+        ledger = FailureLedger(ledger_path(tmp_path))
+        talks = [make_talk(talk_id="a"), make_talk(talk_id="b")]
+        assert ledger.schedule(talks) == talks
+
+    def test_corrupt_file_starts_empty(self, tmp_path: Path) -> None:
+        path = ledger_path(tmp_path)
+        path.write_text("{not json")
+        assert FailureLedger(path).entries == {}
+
+    def test_failures_first_and_cooling_skipped(self, tmp_path: Path) -> None:
+        fresh, old, recent = (make_talk(talk_id=slug) for slug in ("fresh", "old", "recent"))
+        ledger_path(tmp_path).write_text(
+            json.dumps(
+                {
+                    "2025/old": {"url": old.url, "failures": 1, "last_failure": time.time() - 7200},
+                    "2025/recent": {"url": recent.url, "failures": 1, "last_failure": time.time()},
+                },
+            ),
+        )
+        ledger = FailureLedger(ledger_path(tmp_path), cooldown=3600)
+        assert ledger.schedule([fresh, old, recent]) == [old, fresh]
+
+    def test_cooldown_doubles_per_failure(self, tmp_path: Path) -> None:
+        talk = make_talk()
+        ledger = FailureLedger(ledger_path(tmp_path), cooldown=100)
+        ledger.record(talk, success=False)
+        first = ledger.retry_at(talk) - ledger.entries["2025/fosdem-2025-welcome"]["last_failure"]
+        ledger.record(talk, success=False)
+        second = ledger.retry_at(talk) - ledger.entries["2025/fosdem-2025-welcome"]["last_failure"]
+        assert (first, second) == (100, 200)
+
+    def test_save_merges_with_other_writers(self, tmp_path: Path) -> None:
+        path = ledger_path(tmp_path)
+        mine, theirs, fixed = (make_talk(talk_id=slug) for slug in ("mine", "theirs", "fixed"))
+        ledger = FailureLedger(path)
+        ledger.record(fixed, success=False)
+        ledger.save()
+
+        other = FailureLedger(path)
+        ledger.record(mine, success=False)
+        ledger.record(fixed, success=True)
+        other.record(theirs, success=False)
+        other.save()
+        ledger.save()
+
+        assert set(json.loads(path.read_text())) == {"2025/mine", "2025/theirs"}
+
+    def test_record_results_honours_exclude(self, tmp_path: Path) -> None:
+        done, failed, skipped = (make_talk(talk_id=slug) for slug in ("done", "failed", "skipped"))
+        ledger = FailureLedger(ledger_path(tmp_path))
+        ledger.record_results([done, failed, skipped], [True, False, False], exclude={id(skipped)})
+        assert set(ledger.entries) == {"2025/failed"}
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import sys
+from unittest.mock import patch
+
 import pytest
 
 from fosdem_video.models import (
@@ -11,6 +14,7 @@ from fosdem_video.models import (
     normalise_location,
     sanitise_path_component,
     slugify,
+    strip_html,
 )
 
 
@@ -170,7 +174,7 @@ class TestTalkDataclass:
         talk = Talk(url="u", year="2025", id="t", location="r")
         assert talk.url == "u"
         assert talk.title == ""
-        assert talk.persons == []
+        assert talk.persons == ()
 
     def test_frozen_immutability(self) -> None:
         talk = Talk(url="u", year="2025", id="t", location="r")
@@ -195,3 +199,61 @@ class TestTalkDataclass:
         assert talk.abstract == ""
         assert talk.description == ""
         assert talk.feedback_url == ""
+
+    def test_persons_interned(self) -> None:
+        # Built at runtime so the two values start out as distinct objects
+        name = "alice".capitalize()
+        talk = Talk(url="u", year="2025", id="t", location="r", persons=(name, "Bob"))
+        assert talk.persons == ("Alice", "Bob")
+        assert talk.persons[0] is sys.intern("Alice")
+
+    def test_hashable(self) -> None:
+        t1 = Talk(url="u", year="2025", id="t", location="r", persons=("Alice",))
+        t2 = Talk(url="u", year="2025", id="t", location="r", persons=("Alice",))
+        assert len({t1, t2}) == 1
+
+    def test_slotted(self) -> None:
+        talk = Talk(url="u", year="2025", id="t", location="r")
+        assert not hasattr(talk, "__dict__")
+
+    def test_repeated_strings_interned(self) -> None:
+        # Built at runtime so the two values start out as distinct objects
+        track = "containers".capitalize()
+        room = "ub2.252a (lameere)".upper()
+        t1 = Talk(url="u1", year="2025", id="a", location="r", track="Containers", room=room)
+        t2 = Talk(url="u2", year="2025", id="b", location="r", track=track, room=room.upper())
+        assert t1.track is t2.track
+        assert t1.room is t2.room
+
+
+class TestPlainText:
+    """Tests for the plain-text views of the abstract and description."""
+
+    def test_strip_html(self) -> None:
+        assert strip_html("<p>Fish &amp; <b>chips</b></p> ") == "Fish & chips"
+
+    def test_raw_html_kept_and_rendered_on_read(self) -> None:
+        talk = Talk(
+            url="u",
+            year="2025",
+            id="t",
+            location="r",
+            abstract_html="<p>A &amp; B</p>",
+            description_html="<i>x</i>",
+        )
+        assert talk.abstract_html == "<p>A &amp; B</p>"
+        assert talk.abstract == "A & B"
+        assert talk.description == "x"
+
+    def test_html_not_stripped_until_read(self) -> None:
+        with patch("fosdem_video.models.strip_html", wraps=strip_html) as strip:
+            talk = Talk(url="u", year="2025", id="t", location="r", description_html="<i>x</i>")
+            strip.assert_not_called()
+            assert talk.description == "x"
+        strip.assert_called_once()
+
+    def test_rendered_once_per_text(self) -> None:
+        strip_html.cache_clear()
+        talk = Talk(url="u", year="2025", id="t", location="r", abstract_html="<b>once</b>")
+        assert talk.abstract == talk.abstract == "once"
+        assert strip_html.cache_info().misses == 1
@@ -112,10 +112,16 @@ class TestGenerateEpisodeNfo:
         root = generate_episode_nfo(talk)
         assert root.findtext("trailer") == "https://fosdem.org/2025/event/my-talk/"
 
+    def test_plot_skips_markup_without_text(self) -> None:
+        talk = make_talk(abstract="<p> </p>", description="Hello")
+        plot = generate_episode_nfo(talk).findtext("plot")
+        assert plot is not None
+        assert plot.startswith("Hello\n\n---")
+
     def test_plot_includes_abstract_and_metadata(self) -> None:
         talk = make_talk(
-            abstract="Talk abstract.",
-            description="Talk description.",
+            abstract="<p>Talk abstract.</p>",
+            description="Talk &amp; description.",
             talk_id="my-slug",
             language="en",
             event_type="devroom",
@@ -124,7 +130,8 @@ class TestGenerateEpisodeNfo:
         plot = root.findtext("plot")
         assert plot is not None
         assert "Talk abstract." in plot
-        assert "Talk description." in plot
+        assert "Talk & description." in plot
+        assert "<p>" not in plot
         assert "Slug: my-slug" in plot
         assert "Language: en" in plot
 
@@ -141,6 +148,15 @@ class TestWriteTvshowNfo:
         assert '<?xml version="1.0"' in content
         assert "<tvshow>" in content
 
+    def test_overwrite_leaves_no_temporary_files(self, tmp_path: Path) -> None:
+        (tmp_path / "tvshow.nfo").write_text("stale")
+        assert write_tvshow_nfo(tmp_path, "2025") is True
+        assert "<tvshow>" in (tmp_path / "tvshow.nfo").read_text()
+        assert [p.name for p in tmp_path.iterdir()] == ["tvshow.nfo"]
+
+    def test_missing_directory_returns_false(self, tmp_path: Path) -> None:
+        assert write_tvshow_nfo(tmp_path / "missing", "2025") is False
+
 
 class TestWriteSeasonNfo:
     """Tests for write_season_nfo."""
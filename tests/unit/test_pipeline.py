@@ -0,0 +1,59 @@
+"""Unit tests for fosdem_video.pipeline."""
+
+from __future__ import annotations
+
+import threading
+
+from fosdem_video.pipeline import Stage
+
+
+class TestStage:
+    """Tests for Stage."""
+
+    def test_items_flow_through_chained_stages(self) -> None:
+        done: list[int] = []
+        seen: list[str] = []
+
+        def record(_item: int) -> None:
+            seen.append(threading.current_thread().name)
+
+        with (
+            Stage("second", record, workers=1, then=done.append) as second,
+            Stage("first", record, workers=2, then=second.put) as first,
+        ):
+            for item in range(5):
+                first.put(item)
+
+        assert sorted(done) == list(range(5))
+        assert first.stats.processed == second.stats.processed == 5
+        assert {name.rsplit("-", 1)[0] for name in seen} == {"first", "second"}
+
+    def test_failure_is_counted_and_passed_on(self) -> None:
+        done: list[int] = []
+
+        def fail(item: int) -> None:
+            raise RuntimeError(item)
+
+        with Stage("flaky", fail, workers=1, then=done.append) as stage:
+            stage.put(1)
+
+        assert done == [1]
+        assert stage.stats.failed == 1
+
+    def test_full_queue_applies_backpressure(self) -> None:
+        release = threading.Event()
+        with Stage("slow", lambda _item: release.wait(), workers=1, capacity=1) as stage:
+            stage.put(1)  # taken by the worker, which then blocks
+            while stage.depth:
+                release.wait(0.01)
+            stage.put(2)  # fills the queue
+            producer = threading.Thread(target=stage.put, args=(3,))
+            producer.start()
+            producer.join(0.1)
+            assert producer.is_alive()
+            assert stage.depth == 1
+            release.set()
+            producer.join()
+
+        assert stage.stats.processed == 3
+        assert stage.stats.peak_depth == 1
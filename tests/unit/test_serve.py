@@ -0,0 +1,206 @@
+"""Unit tests for fosdem_video.serve."""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from fosdem_video.download import get_output_path
+from fosdem_video.nfo import write_episode_nfo
+from fosdem_video.serve import (
+    Library,
+    LibraryServer,
+    _nfo_slug,
+    parse_range,
+    parse_serve_address,
+    scan_library,
+)
+from tests.conftest import make_talk
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+BODY = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def flat_library(tmp_path: Path) -> Path:
+    """Create a flat-layout library with one video and its subtitle."""
+    (tmp_path / "2025").mkdir()
+    (tmp_path / "2025" / "my-talk.av1.webm").write_bytes(BODY)
+    (tmp_path / "2025" / "my-talk.vtt").write_text("WEBVTT\n")
+    return tmp_path
+
+
+@pytest.fixture
+def base_url(flat_library: Path) -> Iterator[str]:
+    """Serve *flat_library* on an ephemeral port and yield its base URL."""
+    server = LibraryServer(("127.0.0.1", 0), Library(flat_library))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class TestParseServeAddress:
+    """Tests for parse_serve_address."""
+
+    def test_port_only(self) -> None:
+        assert parse_serve_address("8080") == ("127.0.0.1", 8080)
+
+    def test_host_and_port(self) -> None:
+        assert parse_serve_address("0.0.0.0:9000") == ("0.0.0.0", 9000)  # noqa: S104
+
+    @pytest.mark.parametrize("value", ["", "host:", "host:http", "99999"])
+    def test_invalid(self, value: str) -> None:
+        with pytest.raises(ValueError, match="invalid address"):
+            parse_serve_address(value)
+
+
+class TestParseRange:
+    """Tests for parse_range."""
+
+    @pytest.mark.parametrize(
+        ("header", "expected"),
+        [
+            ("bytes=0-99", (0, 99)),
+            ("bytes=100-", (100, 999)),
+            ("bytes=-100", (900, 999)),
+            ("bytes=900-5000", (900, 999)),
+            ("bytes=1000-", None),
+            ("bytes=-0", None),
+        ],
+    )
+    def test_ranges(self, header: str, expected: tuple[int, int] | None) -> None:
+        assert parse_range(header, 1000) == expected
+
+    @pytest.mark.parametrize("header", ["bytes=-", "items=0-1", "bytes=0-1,5-6"])
+    def test_unsupported(self, header: str) -> None:
+        with pytest.raises(ValueError, match="unsupported"):
+            parse_range(header, 1000)
+
+
+class TestScanLibrary:
+    """Tests for scan_library."""
+
+    def test_flat_layout(self, flat_library: Path) -> None:
+        (flat_library / ".leases").mkdir()
+        (flat_library / ".leases" / "2025-x.mp4").write_text("")
+        index = scan_library(flat_library)
+        assert set(index) == {("2025", "my-talk", "av1.webm"), ("2025", "my-talk", "vtt")}
+
+    def test_jellyfin_layout_uses_nfo_slug(self, tmp_path: Path) -> None:
+        talk = make_talk(talk_id="real-slug", title="Pretty Title", track="Go")
+        video = get_output_path(tmp_path, talk, "mp4", jellyfin=True, episode_index={"real-slug": (1, 2)})
+        video.parent.mkdir(parents=True)
+        video.write_bytes(b"x")
+        write_episode_nfo(talk, video, season_number=1, episode_number=2)
+
+        assert scan_library(tmp_path) == {("2025", "real-slug", "mp4"): video}
+
+    def test_jellyfin_layout_without_index(self, tmp_path: Path) -> None:
+        talk = make_talk(talk_id="bare-slug", track="Go")
+        video = get_output_path(tmp_path, talk, "mp4", jellyfin=True)
+        video.parent.mkdir(parents=True)
+        video.write_bytes(b"x")
+
+        assert scan_library(tmp_path) == {("2025", "bare-slug", "mp4"): video}
+
+    def test_nfos_are_parsed_again_only_when_modified(self, tmp_path: Path) -> None:
+        talk = make_talk(talk_id="real-slug", track="Go")
+        video = get_output_path(tmp_path, talk, "mp4", jellyfin=True, episode_index={"real-slug": (1, 2)})
+        video.parent.mkdir(parents=True)
+        video.write_bytes(b"x")
+        video.with_suffix(".vtt").write_text("WEBVTT")
+        write_episode_nfo(talk, video, season_number=1, episode_number=2)
+        nfo = video.with_suffix(".nfo")
+        cache: dict[Path, tuple[int, str | None]] = {}
+
+        with patch("fosdem_video.serve._nfo_slug", wraps=_nfo_slug) as parse:
+            scan_library(tmp_path, cache)
+            scan_library(tmp_path, cache)
+            assert parse.call_count == 1
+            os.utime(nfo, ns=(0, 0))
+            index = scan_library(tmp_path, cache)
+            assert parse.call_count == 2
+
+        assert set(index) == {("2025", "real-slug", "mp4"), ("2025", "real-slug", "vtt")}
+        nfo.unlink()
+        scan_library(tmp_path, cache)
+        assert cache == {}
+
+
+class TestLibrary:
+    """Tests for Library lookups."""
+
+    def test_miss_rescans(self, flat_library: Path) -> None:
+        library = Library(flat_library, rescan_interval=0)
+        assert library.lookup("2025", "late", "mp4") is None
+        (flat_library / "2025" / "late.mp4").write_bytes(b"x")
+        assert library.lookup("2025", "late", "mp4") == flat_library / "2025" / "late.mp4"
+
+    def test_serves_every_volume(self, tmp_path: Path) -> None:
+        first, second = tmp_path / "first", tmp_path / "second"
+        for root, slugs in ((first, ("both",)), (second, ("both", "extra"))):
+            (root / "2025").mkdir(parents=True)
+            for slug in slugs:
+                (root / "2025" / f"{slug}.mp4").write_bytes(b"x")
+
+        library = Library(first, second)
+
+        assert library.lookup("2025", "extra", "mp4") == second / "2025" / "extra.mp4"
+        assert library.lookup("2025", "both", "mp4") == first / "2025" / "both.mp4"
+
+
+class TestLibraryServer:
+    """End-to-end tests against a running LibraryServer."""
+
+    def test_full_get(self, base_url: str) -> None:
+        response = requests.get(f"{base_url}/2025/ua2220/my-talk.av1.webm", timeout=5)
+        assert response.status_code == 200
+        assert response.content == BODY
+        assert response.headers["Content-Type"] == "video/webm"
+        assert response.headers["Accept-Ranges"] == "bytes"
+
+    def test_range_get(self, base_url: str) -> None:
+        response = requests.get(
+            f"{base_url}/2025/ua2220/my-talk.av1.webm", headers={"Range": "bytes=10-19"}, timeout=5
+        )
+        assert response.status_code == 206
+        assert response.content == BODY[10:20]
+        assert response.headers["Content-Range"] == f"bytes 10-19/{len(BODY)}"
+
+    def test_unsatisfiable_range(self, base_url: str) -> None:
+        response = requests.get(
+            f"{base_url}/2025/ua2220/my-talk.av1.webm", headers={"Range": "bytes=5000-"}, timeout=5
+        )
+        assert response.status_code == 416
+        assert response.headers["Content-Range"] == f"bytes */{len(BODY)}"
+
+    def test_head(self, base_url: str) -> None:
+        response = requests.head(f"{base_url}/2025/ua2220/my-talk.vtt", timeout=5)
+        assert response.status_code == 200
+        assert response.headers["Content-Length"] == "7"
+        assert response.headers["Content-Type"] == "text/vtt"
+
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "/2025/ua2220/other.mp4",
+            "/2024/ua2220/my-talk.av1.webm",
+            "/2025/ua2220/my-talk.mp4",
+            "/../etc/passwd",
+        ],
+    )
+    def test_not_found(self, base_url: str, path: str) -> None:
+        response = requests.get(f"{base_url}{path}", timeout=5)
+        assert response.status_code == 404
@@ -0,0 +1,101 @@
+"""Unit tests for fosdem_video.shard."""
+
+from __future__ import annotations
+
+import pytest
+import requests
+import responses
+
+from fosdem_video.shard import assign_shards, parse_shard, probe_sizes, shard_talks
+from tests.conftest import make_talk
+
+
+def _talks(count: int, year: str = "2025") -> list:
+    return [
+        make_talk(talk_id=f"talk-{i}", year=year, url=f"https://video.fosdem.org/{year}/r/talk-{i}.mp4")
+        for i in range(count)
+    ]
+
+
+class TestParseShard:
+    """Tests for parse_shard."""
+
+    def test_valid(self) -> None:
+        assert parse_shard("2/3") == (2, 3)
+        assert parse_shard(" 1 / 1 ") == (1, 1)
+
+    @pytest.mark.parametrize("value", ["0/3", "4/3", "1", "a/b", "1/0"])
+    def test_invalid(self, value: str) -> None:
+        with pytest.raises(ValueError, match="invalid shard"):
+            parse_shard(value)
+
+
+class TestShardTalks:
+    """Tests for shard_talks and assign_shards."""
+
+    def test_shards_partition_the_talks(self) -> None:
+        talks = _talks(50)
+        shards = [shard_talks(talks, k, 3) for k in (1, 2, 3)]
+        ids = [t.id for shard in shards for t in shard]
+        assert sorted(ids) == sorted(t.id for t in talks)
+        assert all(shards)
+
+    def test_assignment_independent_of_order(self) -> None:
+        talks = _talks(20)
+        forward = {t.id for t in shard_talks(talks, 1, 4)}
+        backward = {t.id for t in shard_talks(list(reversed(talks)), 1, 4)}
+        assert forward == backward
+
+    def test_same_slug_in_different_years_hashed_separately(self) -> None:
+        talks = _talks(40, "2024") + _talks(40, "2025")
+        shards = assign_shards(talks, 2)
+        assert shards[:40] != shards[40:]
+
+    def test_single_shard_keeps_everything(self) -> None:
+        talks = _talks(5)
+        assert shard_talks(talks, 1, 1) == talks
+
+    def test_size_weighted_balances_bytes(self) -> None:
+        talks = _talks(60)
+        sizes = {t.url: (i * 37 % 10 + 1) * 100 for i, t in enumerate(talks)}
+        shards = assign_shards(talks, 3, sizes)
+        loads = [0, 0, 0]
+        for talk, shard in zip(talks, shards, strict=True):
+            loads[shard] += sizes[talk.url]
+        assert [shards.count(k) for k in range(3)] == [20, 20, 20]
+        assert max(loads) - min(loads) <= 2 * max(sizes.values())
+
+    def test_differing_sizes_only_move_one_bucket(self) -> None:
+        talks = _talks(60)
+        sizes = {t.url: (i * 37 % 10 + 1) * 100 for i, t in enumerate(talks)}
+        probed_elsewhere = {url: size for url, size in sizes.items() if url != talks[7].url}
+        moved = [
+            a != b
+            for a, b in zip(
+                assign_shards(talks, 3, sizes), assign_shards(talks, 3, probed_elsewhere), strict=True
+            )
+        ]
+        assert sum(moved) <= 3
+
+    def test_unknown_sizes_fall_back_to_hash(self) -> None:
+        talks = _talks(10)
+        assert assign_shards(talks, 3, {"other": 5}) == assign_shards(talks, 3)
+
+
+class TestProbeSizes:
+    """Tests for probe_sizes."""
+
+    @responses.activate
+    def test_collects_content_length(self) -> None:
+        talks = _talks(2)
+        responses.add(responses.HEAD, talks[0].url, headers={"Content-Length": "1234"}, status=200)
+        responses.add(responses.HEAD, talks[1].url, status=404)
+        with requests.Session() as session:
+            assert probe_sizes(talks, session) == {talks[0].url: 1234}
+
+    @responses.activate
+    def test_invalid_content_length_is_unknown(self) -> None:
+        talks = _talks(1)
+        responses.add(responses.HEAD, talks[0].url, headers={"Content-Length": "lots"}, status=200)
+        with requests.Session() as session:
+            assert probe_sizes(talks, session) == {}
@@ -0,0 +1,142 @@
+"""Unit tests for fosdem_video.sources."""
+
+from __future__ import annotations
+
+import requests
+import responses
+
+from fosdem_video.sources import PROBE_BYTES, UPSTREAM_BASE, SourcePool, rewrite_base
+
+URL = "https://video.fosdem.org/2025/ua2220/my-talk.av1.webm"
+PATH = "/2025/ua2220/my-talk.av1.webm"
+
+
+def _bases(pool: SourcePool, url: str = URL) -> list[str]:
+    return [source.base for source, _ in pool.routes(url)]
+
+
+class TestRewriteBase:
+    """Tests for rewrite_base."""
+
+    def test_keeps_path(self) -> None:
+        assert rewrite_base(URL, "http://cache.lan:8080") == f"http://cache.lan:8080{PATH}"
+
+    def test_base_with_prefix_and_slash(self) -> None:
+        assert rewrite_base(URL, "http://mirror/fosdem/") == f"http://mirror/fosdem{PATH}"
+
+
+class TestSourcePoolRouting:
+    """Tests for SourcePool.routes and outcome recording."""
+
+    def test_upstream_only_by_default(self) -> None:
+        assert SourcePool().routes(URL)[0][1] == URL
+
+    def test_configured_order_until_measured(self) -> None:
+        pool = SourcePool(["http://a", "http://b/", "http://a"])
+        assert _bases(pool) == ["http://a", "http://b", UPSTREAM_BASE]
+        assert pool.routes(URL)[0][1] == f"http://a{PATH}"
+
+    def test_upstream_can_be_listed_first(self) -> None:
+        pool = SourcePool([UPSTREAM_BASE, "http://a"])
+        assert _bases(pool) == [UPSTREAM_BASE, "http://a"]
+
+    def test_faster_source_ranked_first(self) -> None:
+        pool = SourcePool(["http://slow", "http://fast"])
+        slow, fast, upstream = pool.sources
+        pool.record_success(slow, 10_000_000, 10.0)
+        pool.record_success(fast, 10_000_000, 1.0)
+        pool.record_success(upstream, 10_000_000, 5.0)
+        assert _bases(pool) == ["http://fast", UPSTREAM_BASE, "http://slow"]
+
+    def test_failed_source_moves_to_the_back(self) -> None:
+        pool = SourcePool(["http://a", "http://b"])
+        pool.record_failure(pool.sources[0])
+        assert _bases(pool) == ["http://b", UPSTREAM_BASE, "http://a"]
+
+    def test_success_clears_cooldown(self) -> None:
+        pool = SourcePool(["http://a"])
+        source = pool.sources[0]
+        pool.record_failure(source)
+        pool.record_success(source, 1, 1.0)
+        assert _bases(pool)[0] == "http://a"
+
+    def test_cooldown_escalates(self) -> None:
+        pool = SourcePool(["http://a"])
+        source = pool.sources[0]
+        pool.record_failure(source)
+        first = source.down_until
+        pool.record_failure(source)
+        assert source.down_until > first
+        assert source.failures == 2
+
+
+class TestSourcePoolProbe:
+    """Tests for SourcePool.probe."""
+
+    @responses.activate
+    def test_probe_measures_and_marks_failures(self) -> None:
+        responses.add(responses.GET, f"http://lan{PATH}", body=b"x" * PROBE_BYTES, status=206)
+        responses.add(responses.GET, f"http://dead{PATH}", body=requests.ConnectionError("down"))
+        responses.add(responses.GET, URL, status=404)
+
+        pool = SourcePool(["http://dead", "http://lan"], session=requests.Session(), probe_url=URL)
+        pool.probe()
+
+        dead, lan, upstream = pool.sources
+        assert lan.throughput is not None
+        assert lan.latency is not None
+        assert dead.failures == 1
+        assert upstream.latency is not None
+        assert upstream.throughput is None
+        assert _bases(pool)[-1] == "http://dead"
+        assert responses.calls[0].request.headers["Range"] == f"bytes=0-{PROBE_BYTES - 1}"
+
+    @responses.activate
+    def test_restored_measurements_skip_first_probe(self) -> None:
+        measured = SourcePool(["http://slow", "http://fast"])
+        slow, fast, upstream = measured.sources
+        for source, seconds in ((slow, 10.0), (fast, 1.0), (upstream, 5.0)):
+            source.latency = 0.01
+            measured.record_success(source, 10_000_000, seconds)
+
+        pool = SourcePool(
+            ["http://slow", "http://fast"], session=requests.Session(), probe_url=URL, probe_interval=0
+        )
+        pool.restore(measured.measurements())
+        with pool:
+            pass
+        assert len(responses.calls) == 0
+        assert _bases(pool) == ["http://fast", UPSTREAM_BASE, "http://slow"]
+
+    @responses.activate
+    def test_context_manager_skips_probe_for_single_source(self) -> None:
+        with SourcePool(session=requests.Session(), probe_url=URL, probe_interval=0):
+            pass
+        assert len(responses.calls) == 0
+
+
+class TestHedgeDelay:
+    """Tests for SourcePool.hedge_delay."""
+
+    def test_needs_enough_samples(self) -> None:
+        pool = SourcePool(["http://a"])
+        for _ in range(5):
+            pool.record_ttfb(2.0)
+        assert pool.hedge_delay() is None
+
+    def test_uses_percentile_with_floor(self) -> None:
+        pool = SourcePool(["http://a"], hedge_percentile=90)
+        for i in range(1, 101):
+            pool.record_ttfb(i / 10)
+        assert pool.hedge_delay() == 9.0
+
+        fast = SourcePool(["http://a"])
+        for _ in range(50):
+            fast.record_ttfb(0.01)
+        assert fast.hedge_delay() == 0.5
+
+    def test_disabled(self) -> None:
+        pool = SourcePool(["http://a"], hedge_percentile=0)
+        for _ in range(50):
+            pool.record_ttfb(1.0)
+        assert pool.hedge_delay() is None
@@ -0,0 +1,90 @@
+"""Unit tests for fosdem_video.staging."""
+
+from __future__ import annotations
+
+import errno
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from fosdem_video.staging import move_into_library, pending_path, publish, staging_path
+
+
+class TestStagingPath:
+    """Tests for staging_path."""
+
+    def test_mirrors_the_library_layout(self, tmp_path: Path) -> None:
+        target = tmp_path / "library" / "2025" / "talk.mp4"
+        staged = staging_path(target, tmp_path / "library", tmp_path / "scratch")
+        assert staged == tmp_path / "scratch" / "2025" / "talk.mp4"
+        assert staged.parent.is_dir()
+
+    def test_without_staging(self, tmp_path: Path) -> None:
+        target = tmp_path / "2025" / "talk.mp4"
+        assert staging_path(target, tmp_path, None) is target
+
+
+class TestMoveIntoLibrary:
+    """Tests for move_into_library and publish."""
+
+    def test_copies_across_filesystems(self, tmp_path: Path) -> None:
+        staged = tmp_path / "staged.mp4"
+        staged.write_bytes(b"video")
+        target = tmp_path / "library.mp4"
+        real_replace = Path.replace
+
+        def replace(self: Path, other: Path) -> Path:
+            if self == staged:
+                raise OSError(errno.EXDEV, "Invalid cross-device link")
+            return real_replace(self, other)
+
+        with patch.object(Path, "replace", replace):
+            move_into_library(staged, target)
+
+        assert target.read_bytes() == b"video"
+        assert not staged.exists()
+        assert [p.name for p in tmp_path.iterdir()] == ["library.mp4"]
+
+    def test_other_errors_are_raised(self, tmp_path: Path) -> None:
+        staged = tmp_path / "staged.mp4"
+        with pytest.raises(FileNotFoundError):
+            move_into_library(staged, tmp_path / "library.mp4")
+
+    def test_publish_moves_subtitles_with_the_video(self, tmp_path: Path) -> None:
+        pending = pending_path(tmp_path / "scratch" / "talk.mp4")
+        pending.parent.mkdir()
+        pending.write_bytes(b"video")
+        pending.with_suffix(".vtt").write_text("WEBVTT")
+        target = tmp_path / "talk.mp4"
+
+        publish(pending, target)
+
+        assert target.read_bytes() == b"video"
+        assert target.with_suffix(".vtt").read_text() == "WEBVTT"
+        assert list(pending.parent.iterdir()) == []
+
+    @pytest.mark.parametrize(
+        ("order", "expected"),
+        [
+            ("video-last", ["talk.vtt", "talk.nfo", "talk.mp4"]),
+            ("nfo-last", ["talk.mp4", "talk.vtt", "talk.nfo"]),
+        ],
+    )
+    def test_publish_order_and_one_directory_sync(
+        self, tmp_path: Path, order: str, expected: list[str]
+    ) -> None:
+        target = tmp_path / "talk.mp4"
+        pending = pending_path(target)
+        for suffix in (".mp4", ".vtt", ".nfo"):
+            pending.with_suffix(suffix).write_text(suffix)
+
+        with (
+            patch("fosdem_video.staging.move_into_library", wraps=move_into_library) as move,
+            patch("fosdem_video.staging._sync_dir") as sync_dir,
+        ):
+            publish(pending, target, order)
+
+        assert [call.args[1].name for call in move.call_args_list] == expected
+        sync_dir.assert_called_once_with(tmp_path)
+        assert sorted(p.name for p in tmp_path.iterdir()) == sorted(expected)
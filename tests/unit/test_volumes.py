@@ -0,0 +1,82 @@
+"""Unit tests for fosdem_video.volumes."""
+
+from __future__ import annotations
+
+import errno
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from fosdem_video.volumes import InsufficientSpaceError, PlannedFile, ensure_room, free_space, plan_placement
+
+
+def _file(key: str, season: str, size: int = 0) -> PlannedFile:
+    return PlannedFile(key, Path(season) / f"{key}.mp4", Path(season), size)
+
+
+class TestPlanPlacement:
+    """Tests for plan_placement."""
+
+    @pytest.fixture
+    def roots(self, tmp_path: Path) -> list[Path]:
+        roots = [tmp_path / "a", tmp_path / "b"]
+        for root in roots:
+            root.mkdir()
+        return roots
+
+    def _plan(self, files: list[PlannedFile], roots: list[Path], free: list[int], **kwargs: str) -> list[str]:
+        space = dict(zip(roots, free, strict=True))
+        with patch("fosdem_video.volumes.free_space", side_effect=space.__getitem__):
+            placement = plan_placement(files, roots, headroom=0, **kwargs)
+        return [placement[file.key].name for file in files]
+
+    def test_seasons_stay_whole_largest_first(self, roots: list[Path]) -> None:
+        files = [_file("t1", "Go", 6), _file("t2", "Go", 6), _file("t3", "Rust", 5)]
+        assert self._plan(files, roots, [15, 14]) == ["a", "a", "b"]
+
+    def test_existing_season_keeps_its_volume(self, roots: list[Path]) -> None:
+        (roots[1] / "Go").mkdir()
+        files = [_file("t1", "Go", 6), _file("t2", "Go", 6)]
+        assert self._plan(files, roots, [100, 20]) == ["b", "b"]
+
+    def test_started_talk_keeps_its_volume(self, roots: list[Path]) -> None:
+        (roots[1] / "Go").mkdir()
+        (roots[1] / "Go" / "t1.mp4.part").write_bytes(b"half")
+        files = [_file("t1", "Go", 6)]
+        assert self._plan(files, roots, [100, 0], policy="free-space") == ["b"]
+
+    def test_free_space_policy_spreads_talks(self, roots: list[Path]) -> None:
+        files = [_file("t1", "Go", 5), _file("t2", "Go", 5)]
+        assert self._plan(files, roots, [8, 7], policy="free-space") == ["a", "b"]
+
+    def test_season_too_large_for_one_volume_is_split(self, roots: list[Path]) -> None:
+        files = [_file("t1", "Go", 5), _file("t2", "Go", 5)]
+        assert sorted(self._plan(files, roots, [8, 7])) == ["a", "b"]
+
+    def test_unknown_sizes_count_as_the_average(self, roots: list[Path]) -> None:
+        files = [_file("t1", "Go", 10), _file("t2", "Rust"), _file("t3", "Rust")]
+        with pytest.raises(InsufficientSpaceError):
+            self._plan(files, roots, [10, 19])
+
+    def test_plan_that_does_not_fit_fails_fast(self, roots: list[Path]) -> None:
+        files = [_file("t1", "Go", 5), _file("t2", "Rust", 5), _file("t3", "Vim", 5)]
+        with pytest.raises(InsufficientSpaceError, match="do not fit") as excinfo:
+            self._plan(files, roots, [6, 6])
+        assert excinfo.value.errno == errno.ENOSPC
+
+
+class TestEnsureRoom:
+    """Tests for ensure_room and free_space."""
+
+    def test_too_large_for_the_disk(self, tmp_path: Path) -> None:
+        with (
+            patch("fosdem_video.volumes.free_space", return_value=10),
+            pytest.raises(InsufficientSpaceError, match=r"talk\.mp4 needs"),
+        ):
+            ensure_room(tmp_path / "talk.mp4", 11)
+        with patch("fosdem_video.volumes.free_space", return_value=10):
+            ensure_room(tmp_path / "talk.mp4", 10)
+
+    def test_missing_root_is_measured_at_its_parent(self, tmp_path: Path) -> None:
+        assert free_space(tmp_path / "not" / "yet") == free_space(tmp_path)
@@ -0,0 +1,124 @@
+"""Unit tests for fosdem_video.writer."""
+
+from __future__ import annotations
+
+import io
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from fosdem_video.writer import MetadataWriter, WriteBehind, WritePolicy, WriteStats
+
+
+class TestMakeDirs:
+    """Tests for MetadataWriter.make_dirs."""
+
+    def test_creates_nested_leaves(self, tmp_path: Path) -> None:
+        leaves = [tmp_path / "show" / "season" / f"ep{i}" for i in range(5)]
+        with MetadataWriter(max_workers=3) as writer:
+            writer.make_dirs(leaves)
+        assert all(leaf.is_dir() for leaf in leaves)
+
+    def test_duplicate_and_existing_folders(self, tmp_path: Path) -> None:
+        existing = tmp_path / "a"
+        existing.mkdir()
+        with MetadataWriter() as writer:
+            writer.make_dirs([existing, existing, existing / "b", existing / "b"])
+        assert (existing / "b").is_dir()
+
+    def test_empty_input(self, tmp_path: Path) -> None:
+        with MetadataWriter() as writer:
+            writer.make_dirs([])
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestSubmit:
+    """Tests for MetadataWriter.submit and wait."""
+
+    def test_wait_returns_results_in_submission_order(self) -> None:
+        with MetadataWriter(max_workers=4) as writer:
+            for i in range(10):
+                writer.submit(pow, i, 2)
+            assert writer.wait() == [i * i for i in range(10)]
+
+    def test_exit_waits_for_pending_writes(self, tmp_path: Path) -> None:
+        target = tmp_path / "out.nfo"
+        with MetadataWriter() as writer:
+            writer.submit(target.write_text, "<tvshow/>")
+        assert target.read_text() == "<tvshow/>"
+
+    def test_failure_is_reraised(self, tmp_path: Path) -> None:
+        writer = MetadataWriter()
+        with pytest.raises(FileNotFoundError), writer:
+            writer.submit((tmp_path / "missing" / "x.nfo").write_text, "x")
+
+
+class TestWriteBehind:
+    """Tests for WriteBehind."""
+
+    def test_writes_chunks_in_order_through_reused_buffers(self) -> None:
+        source = io.BytesIO(bytes(range(256)) * 100)
+        out = io.BytesIO()
+        views: set[int] = set()
+
+        def read_into(view: memoryview) -> int:
+            views.add(id(view.obj))
+            return source.readinto(view)
+
+        with WriteBehind(out, chunk_size=1000, buffers=3) as writer:
+            while writer.fill(read_into):
+                pass
+
+        assert out.getvalue() == source.getvalue()
+        assert len(views) <= 3
+
+    def test_slow_disk_makes_reads_wait(self) -> None:
+        release = threading.Event()
+
+        class SlowFile(io.BytesIO):
+            def write(self, data: object) -> int:
+                release.wait()
+                return super().write(data)  # type: ignore[arg-type]
+
+        stats = WriteStats()
+        source = io.BytesIO(b"x" * 100)
+        timer = threading.Timer(0.05, release.set)
+        timer.start()
+        with WriteBehind(SlowFile(), chunk_size=10, buffers=2, stats=stats) as writer:
+            while writer.fill(source.readinto):
+                pass
+        timer.join()
+
+        assert stats.read_waits >= 1
+        assert stats.read_wait > 0
+
+    def test_write_error_is_raised(self) -> None:
+        class FullDisk(io.BytesIO):
+            def write(self, data: object) -> int:
+                raise OSError(28, "No space left on device")
+
+        source = io.BytesIO(b"x" * 100)
+
+        def copy() -> None:
+            with WriteBehind(FullDisk(), chunk_size=10) as writer:
+                while writer.fill(source.readinto):
+                    pass
+
+        with pytest.raises(OSError, match="No space"):
+            copy()
+
+    def test_drop_cache_releases_written_regions(self, tmp_path: Path) -> None:
+        source = io.BytesIO(b"x" * 250)
+        policy = WritePolicy(drop_cache=True, drop_cache_every=100)
+        with (
+            patch("fosdem_video.diskio.release_written") as release,
+            (tmp_path / "video.part").open("wb") as f,
+        ):
+            f.write(b"old")
+            with WriteBehind(f, chunk_size=50, policy=policy) as writer:
+                while writer.fill(source.readinto):
+                    pass
+
+        assert [call.args[1:] for call in release.call_args_list] == [(3, 100), (103, 100), (203, 50)]